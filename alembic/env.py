@@ -0,0 +1,57 @@
+"""
+Alembic environment, running migrations over the app's asyncpg engine settings.
+
+Tables are created by ``init_db`` (``Base.metadata.create_all``) on startup;
+revisions here change existing deployments (new columns, indexes) and are
+written to be no-ops where ``create_all`` already built the current schema.
+
+    alembic upgrade head
+"""
+
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.database import Base, get_asyncpg_url
+from app.models import user, email_otp  # noqa: F401  (register tables)
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout (alembic upgrade head --sql)"""
+    context.configure(
+        url=get_asyncpg_url(settings.database_url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    engine = create_async_engine(get_asyncpg_url(settings.database_url), poolclass=NullPool)
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
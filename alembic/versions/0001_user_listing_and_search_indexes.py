@@ -0,0 +1,58 @@
+"""User listing and search indexes
+
+Adds, to a users table created before they were declared on the model:
+
+- keyset pagination indexes for GET /api/users: (created_at, id), (last_name, id)
+- the generated search_vector tsvector column and its GIN index
+- C-collation "starts with" indexes for typeahead on "first last",
+  "last first" and email
+
+Adding a stored generated column rewrites the table under an exclusive lock
+(seconds per million rows); the indexes are then built CONCURRENTLY, without
+blocking writes. Every statement is IF NOT EXISTS, so databases created by
+create_all from the current models pass through unchanged.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce(first_name, '') || ' ' || coalesce(last_name, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, regexp_replace(coalesce(email, ''), '[@._+-]+', ' ', 'g')), 'B')"
+)
+
+INDEXES = {
+    "ix_users_created_at_id": "(created_at, id)",
+    "ix_users_last_name_id": "(last_name, id)",
+    "ix_users_search_vector": "USING gin (search_vector)",
+    "ix_users_name_prefix": "((lower(first_name || ' ' || last_name) COLLATE \"C\"))",
+    "ix_users_reversed_name_prefix": "((lower(last_name || ' ' || first_name) COLLATE \"C\"))",
+    "ix_users_email_prefix": "((lower(email) COLLATE \"C\"))",
+}
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE users ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED"
+    )
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON users {definition}")
+        op.execute("ANALYZE users")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in reversed(list(INDEXES)):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from app.api.deps import get_current_superuser
+from app.models.user import User
+from app.core.profiler import ProfilerBusyError, profile_coordinator
+from app.config import settings
+from datetime import datetime, timezone
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.post("/profile")
+async def profile_workers(
+    duration: float = Query(10.0, gt=0, description="Sampling window in seconds"),
+    interval_ms: float = Query(10.0, ge=1, le=1000, description="Sampling interval in milliseconds"),
+    all_workers: bool = Query(False, description="Profile every worker of this server, not just the one handling the request"),
+    output: str = Query("collapsed", pattern="^(collapsed|json)$", description="collapsed (flamegraph-ready file) or json"),
+    trace_memory: bool = Query(False, description="Include a tracemalloc snapshot diff (json output only)"),
+    current_user: User = Depends(get_current_superuser)
+):
+    """
+    Sample the event loop of this worker (or all workers) for a bounded window (superuser only).
+    The collapsed output feeds flamegraph.pl or speedscope directly.
+    """
+    if not settings.profiler_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiler is disabled")
+    if duration > settings.profiler_max_duration:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Duration may not exceed {settings.profiler_max_duration} seconds"
+        )
+    if trace_memory and output != "json":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="trace_memory requires json output")
+
+    logger.info(f"Profiling {'all workers' if all_workers else 'worker'} for {duration}s, requested by {current_user.email}")
+
+    interval = interval_ms / 1000
+    try:
+        if all_workers:
+            results = await profile_coordinator.profile_all(duration, interval, trace_memory)
+        else:
+            results = [await profile_coordinator.profile_self(duration, interval, trace_memory)]
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    if output == "collapsed":
+        # Multiple workers: one root frame per worker so their flames stay apart
+        lines = []
+        for result in results:
+            for line in result["collapsed"].splitlines():
+                lines.append(f"worker-{result['pid']};{line}" if len(results) > 1 else line)
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        return PlainTextResponse(
+            "\n".join(lines) + "\n",
+            headers={"Content-Disposition": f'attachment; filename="profile-{timestamp}.collapsed"'}
+        )
+
+    return {
+        "success": True,
+        "duration": duration,
+        "interval_ms": interval_ms,
+        "workers": results
+    }
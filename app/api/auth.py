@@ -14,13 +14,16 @@ from app.schemas.auth import (
     ChangePasswordRequest,
     RefreshTokenRequest,
     SignupInitResponse,
-    SignupVerifyResponse
+    SignupVerifyResponse,
+    UserResponse
 )
 from app.models.user import User
 from app.core.auth import auth
 from app.core.otp import otp_manager
+from app.core.responses import ModelResponse
 from app.core.aws import EmailService
-from app.api.deps import get_current_user, get_current_verified_user
+from app.api.deps import get_current_user, get_current_verified_user, current_user_conditional, user_etag
+from app.core.etags import ConditionalGet
 from app.config import settings
 import logging
 
@@ -146,21 +149,22 @@ async def signup_verify(
         
         logger.info(f"User signup completed and logged in: {request.email}")
         
-        # Prepare token response
+        # Prepare token response (user serialized once, straight from the ORM object)
+        user_response = UserResponse.model_validate(user)
         tokens = TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token,
             token_type="bearer",
             expires_in=settings.access_token_expire_minutes * 60,
-            user=user.to_dict()
+            user=user_response
         )
         
-        return SignupVerifyResponse(
+        return ModelResponse(SignupVerifyResponse(
             message="Signup completed successfully. You are now logged in.",
             success=True,
-            user=user.to_dict(),
+            user=user_response,
             tokens=tokens
-        )
+        ))
         
     except HTTPException:
         raise
@@ -211,14 +215,14 @@ async def login_user(
             refresh_token=refresh_token,
             token_type="bearer",
             expires_in=settings.access_token_expire_minutes * 60,
-            user=user.to_dict()
+            user=UserResponse.model_validate(user)
         )
         
-        return LoginResponse(
+        return ModelResponse(LoginResponse(
             message="Login successful",
             success=True,
             tokens=tokens
-        )
+        ))
         
     except HTTPException:
         raise
@@ -294,13 +298,13 @@ async def refresh_token(
         
         logger.info(f"Token refreshed for user: {user.email}")
         
-        return TokenResponse(
+        return ModelResponse(TokenResponse(
             access_token=new_access_token,
             refresh_token=request.refresh_token,  # Keep same refresh token
             token_type="bearer",
             expires_in=settings.access_token_expire_minutes * 60,
-            user=user.to_dict()
-        )
+            user=UserResponse.model_validate(user)
+        ))
         
     except HTTPException:
         raise
@@ -400,11 +404,11 @@ async def reset_password(
         
         logger.info(f"Password reset successful for: {request.email}")
         
-        return AuthResponse(
+        return ModelResponse(AuthResponse(
             message="Password reset successful",
             success=True,
-            user=user.to_dict()
-        )
+            user=UserResponse.model_validate(user)
+        ))
         
     except HTTPException:
         raise
@@ -440,11 +444,11 @@ async def change_password(
         
         logger.info(f"Password changed for user: {current_user.email}")
         
-        return AuthResponse(
+        return ModelResponse(AuthResponse(
             message="Password changed successfully",
             success=True,
-            user=current_user.to_dict()
-        )
+            user=UserResponse.model_validate(current_user)
+        ))
         
     except HTTPException:
         raise
@@ -459,13 +463,15 @@ async def change_password(
 
 @router.get("/me", response_model=AuthResponse)
 async def get_current_user_info(
+    conditional: ConditionalGet = Depends(current_user_conditional),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get current authenticated user information
+    Get current authenticated user information.
+    Supports If-None-Match: an unchanged user gets a 304 without a database lookup.
     """
-    return AuthResponse(
+    return await conditional.respond(user_etag(current_user), lambda: ModelResponse(AuthResponse(
         message="User information retrieved successfully",
         success=True,
-        user=current_user.to_dict()
-    )
\ No newline at end of file
+        user=UserResponse.model_validate(current_user)
+    )))
\ No newline at end of file
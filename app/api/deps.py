@@ -6,6 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.database import get_db
 from app.core.auth import auth
+from app.core.etags import conditional_get, invalidate_on_change, make_etag
+from app.config import settings
 from app.models.user import User
 from app.redis_client import get_redis, UpstashRedisClient
 import logging
@@ -61,6 +63,35 @@ async def get_current_user(
     return current_user
 
 
+async def current_user_etag_key(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Optional[str]:
+    """
+    ETag cache key of the token's user, from the JWT alone (no database).
+    Returns None for missing or invalid tokens, which then take the normal path.
+    """
+    if not credentials:
+        return None
+    try:
+        payload = auth.verify_token(credentials.credentials)
+    except HTTPException:
+        return None
+    user_uuid = payload.get("sub")
+    return f"user:{user_uuid}" if user_uuid else None
+
+
+def user_etag(user: User) -> str:
+    """ETag of a user's representation; changes whenever the row is updated"""
+    return make_etag(settings.version, user.uuid, user.updated_at.isoformat())
+
+
+# Conditional GET for the current user's own resources: declare before
+# get_current_user so a matching If-None-Match is answered without the lookup
+current_user_conditional = conditional_get(current_user_etag_key)
+
+invalidate_on_change(User, lambda user: f"user:{user.uuid}")
+
+
 async def get_current_verified_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -215,43 +246,16 @@ async def check_rate_limit(
 
 # Health check dependencies
 async def check_system_health() -> dict:
-    """Check overall system health"""
-    from app.database import DatabaseManager
-    from app.redis_client import check_redis_health
-    from app.core.aws import check_aws_health
-    
-    health_status = {
-        "status": "healthy",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "services": {}
-    }
+    """Check overall system health (served from the health monitor cache)"""
+    from app.core.health import health_monitor
     
     try:
-        # Check database
-        db_health = await DatabaseManager.health_check()
-        health_status["services"].update(db_health)
-        
-        # Check Redis
-        redis_health = await check_redis_health()
-        health_status["services"].update(redis_health)
-        
-        # Check AWS services
-        aws_health = await check_aws_health()
-        health_status["services"].update(aws_health)
-        
-        # Determine overall status
-        unhealthy_services = [
-            service for service_name, service in health_status["services"].items()
-            for service in (service if isinstance(service, list) else [service])
-            if isinstance(service, dict) and service.get("status") != "healthy"
-        ]
-        
-        if unhealthy_services:
-            health_status["status"] = "degraded"
-            
+        return await health_monitor.system_health()
     except Exception as e:
         logger.error(f"Health check error: {e}")
-        health_status["status"] = "unhealthy"
-        health_status["error"] = str(e)
-    
-    return health_status
\ No newline at end of file
+        return {
+            "status": "unhealthy",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "services": {},
+            "error": str(e)
+        }
@@ -1,45 +1,140 @@
-from fastapi import APIRouter, Depends
-from app.schemas.email import PresignedUrlRequest, PresignedUrlResponse
+from fastapi import APIRouter, Depends, Request
+from app.schemas.email import (
+    PresignedUrlRequest,
+    PresignedUrlResponse,
+    PresignedUrlBatchRequest,
+    PresignedUrlBatchItem,
+    PresignedUrlBatchBody,
+    PresignedUrlBatchResponse,
+    PresignedPostRequest,
+    PresignedPostBody,
+    PresignedPostResponse,
+    ContentAddressedUploadRequest,
+    ContentAddressedUploadBody,
+    ContentAddressedUploadResponse,
+    DeliveryUrlsRequest,
+    DeliveryUrlsBody,
+    DeliveryUrlsResponse,
+    MultipartCreateRequest,
+    MultipartCreateBody,
+    MultipartCreateResponse,
+    MultipartPresignPartsRequest,
+    MultipartPartUrl,
+    MultipartPresignPartsBody,
+    MultipartPresignPartsResponse,
+    MultipartCompleteRequest,
+    MultipartCompleteBody,
+    MultipartCompleteResponse,
+    MultipartAbortRequest,
+    MultipartAbortResponse,
+    ImageVariantsRequest,
+    ImageVariant,
+    ImageVariantsManifest,
+    ImageVariantsResponse
+)
+from app.core.presign import get_s3_presigner
 from app.core.aws import get_s3_client
+from app.core.cdn import get_delivery_url_service
+from app.core.images import (
+    IMAGE_VARIANTS_QUEUE,
+    ImageVariantPipeline,
+    LocalObjectStore,
+    ObjectStore,
+    S3ObjectStore,
+    is_source_image
+)
+from app.redis_client import redis_client
+from app.core.multipart import MultipartUploadManager, MultipartUploadError
+from app.core.dedup import DedupUploadManager, DedupUploadError
+from app.core.responses import StaticResponse
+from app.api.deps import get_current_superuser, get_current_user
+from app.models.user import User
 from app.config import settings
 from botocore.exceptions import ClientError
+from typing import Optional
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/cms-image-upload", tags=["cms-image-upload"])
 
+# Bucket receiving CMS uploads
+UPLOAD_BUCKET_NAME = "my-cms-image-upload"
+
+# Allowed file types and their corresponding MIME types
+ALLOWED_FILE_TYPES = {
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "pdf": "application/pdf",
+    "doc": "application/msword",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+
+# Every upload is stored under its uploader's prefix (users/<uuid>/...), which is
+# what read access is checked against. Dot segments are refused in keys, since
+# URL normalization would resolve them outside the prefix.
+
+def owned_key_prefix(user: User) -> str:
+    """Key prefix whose objects belong to ``user``"""
+    return f"{settings.s3_user_key_prefix}{user.uuid}/"
+
+
+def owns_object(user: User, object_key: str) -> bool:
+    """Whether ``object_key`` lies under the caller's own prefix"""
+    if any(segment in (".", "..") for segment in object_key.split("/")):
+        return False
+    return object_key.startswith(owned_key_prefix(user))
+
+
+def owned_object_key(user: User, file_name: str) -> Optional[str]:
+    """Key an upload of ``file_name`` by ``user`` is stored under (None if the name is not a valid key)"""
+    object_key = f"{owned_key_prefix(user)}{file_name.lstrip('/')}"
+    return object_key if owns_object(user, object_key) else None
+
+
+def can_read_object(user: User, object_key: str) -> bool:
+    """Whether ``user`` may read ``object_key``: superusers any object, everyone else only their own"""
+    if any(segment in (".", "..") for segment in object_key.split("/")):
+        return False
+    return user.is_superuser or owns_object(user, object_key)
+
+
+# Multipart upload orchestration for large files
+multipart_manager = MultipartUploadManager(UPLOAD_BUCKET_NAME)
+
+# Content-addressed uploads keyed by SHA-256
+dedup_manager = DedupUploadManager(UPLOAD_BUCKET_NAME)
+
 
 @router.post("/generate-presigned-url", response_model=PresignedUrlResponse)
 async def generate_presigned_url_endpoint(
-    request: PresignedUrlRequest
+    request: PresignedUrlRequest,
+    current_user: User = Depends(get_current_user)
 ):
     """
-    Generate a pre-signed S3 URL for uploading a file.
+    Generate a pre-signed S3 URL for uploading a file under the caller's own prefix.
     This is your exact existing code integrated into the FastAPI structure.
     """
     try:
-        # Initialize the S3 client - exactly as in your code
-        s3 = get_s3_client()
+        # Local SigV4 signer - no boto3 request construction per call
+        presigner = get_s3_presigner()
 
         # Bucket name and object key - exactly as in your code
-        bucket_name = "my-cms-image-upload"  # Updated bucket name
+        bucket_name = UPLOAD_BUCKET_NAME
 
         files = request.file_name
 
-        print(files)
-
-        object_key = files
-
-        # Allowed file types and their corresponding MIME types - exactly as in your code
-        ALLOWED_FILE_TYPES = {
-            "jpg": "image/jpeg",
-            "jpeg": "image/jpeg",
-            "png": "image/png",
-            "pdf": "application/pdf",
-            "doc": "application/msword",
-            "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        }
+        object_key = owned_object_key(current_user, files)
+        if object_key is None:
+            return PresignedUrlResponse(
+                status_code=400,
+                message="Invalid file name",
+                body=None
+            )
 
         # Determine file extension from the filename - exactly as in your code
         file_extension = files.split(".")[-1].lower()
@@ -52,16 +147,13 @@ async def generate_presigned_url_endpoint(
                 body=None
             )
 
-        # Generate a pre-signed URL for the S3 object with PutObject permission - exactly as in your code
-        url = s3.generate_presigned_url(
-            ClientMethod="put_object",
-            Params={
-                "Bucket": bucket_name, 
-                "Key": object_key,
-                "ContentType": ALLOWED_FILE_TYPES[file_extension]
-            },
-            ExpiresIn=3600,
-            HttpMethod="PUT",
+        # Generate a pre-signed URL for the S3 object with PutObject permission
+        url = presigner.generate_presigned_url(
+            bucket_name,
+            object_key,
+            method="PUT",
+            expires_in=settings.s3_presigned_url_expiry,
+            content_type=ALLOWED_FILE_TYPES[file_extension]
         )
 
         logger.info(f"Generated presigned URL for {files}")
@@ -69,28 +161,557 @@ async def generate_presigned_url_endpoint(
         return PresignedUrlResponse(
             status_code=200,
             message="Pre-signed URL retrieved successfully",
-            body={"presigned_url": url}
+            body={"presigned_url": url, "object_key": object_key}
+        )
+
+    except KeyError as e:
+        logger.error("KeyError: %s", e)
+        return PresignedUrlResponse(
+            status_code=400,
+            message="Missing required key",
+            body=None
+        )
+
+    except Exception as e:
+        logger.error("Error: %s", e)
+        return PresignedUrlResponse(
+            status_code=500,
+            message="Internal server error",
+            body=None
+        )
+
+
+@router.post("/generate-presigned-urls", response_model=PresignedUrlBatchResponse)
+async def generate_presigned_urls_batch_endpoint(
+    request: PresignedUrlBatchRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Generate pre-signed S3 upload URLs for a batch of files (under the caller's own prefix) in one round trip.
+    Files with unsupported types are reported per entry instead of failing the batch.
+    """
+    try:
+        if len(request.file_names) > settings.s3_presign_batch_max_files:
+            return PresignedUrlBatchResponse(
+                status_code=400,
+                message=f"Too many files; at most {settings.s3_presign_batch_max_files} per request",
+                body=None
+            )
+
+        presigner = get_s3_presigner()
+
+        accepted = []
+        items = []
+        for file_name in request.file_names:
+            file_extension = file_name.split(".")[-1].lower()
+            content_type = ALLOWED_FILE_TYPES.get(file_extension)
+            if content_type is None:
+                items.append(PresignedUrlBatchItem(
+                    file_name=file_name,
+                    error=f"File type '{file_extension}' not allowed"
+                ))
+                continue
+            object_key = owned_object_key(current_user, file_name)
+            if object_key is None:
+                items.append(PresignedUrlBatchItem(file_name=file_name, error="Invalid file name"))
+                continue
+            item = PresignedUrlBatchItem(file_name=file_name, object_key=object_key, content_type=content_type)
+            accepted.append(item)
+            items.append(item)
+
+        urls = presigner.generate_presigned_urls(
+            UPLOAD_BUCKET_NAME,
+            [(item.object_key, item.content_type) for item in accepted],
+            method="PUT",
+            expires_in=settings.s3_presigned_url_expiry
+        )
+        for item, url in zip(accepted, urls):
+            item.presigned_url = url
+
+        logger.info(f"Generated {len(accepted)} presigned URLs ({len(items) - len(accepted)} rejected)")
+
+        return PresignedUrlBatchResponse(
+            status_code=200,
+            message="Pre-signed URLs retrieved successfully",
+            body=PresignedUrlBatchBody(
+                files=items,
+                expires_in=settings.s3_presigned_url_expiry
+            )
+        )
+
+    except Exception as e:
+        logger.error("Error: %s", e)
+        return PresignedUrlBatchResponse(
+            status_code=500,
+            message="Internal server error",
+            body=None
+        )
+
+
+@router.post("/generate-presigned-post", response_model=PresignedPostResponse)
+async def generate_presigned_post_endpoint(
+    request: PresignedPostRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Generate a presigned POST policy for uploading a file under the caller's own prefix.
+    S3 enforces the size limit, key prefix and Content-Type, so invalid uploads
+    are rejected at the edge instead of being stored.
+    """
+    try:
+        file_extension = request.file_name.split(".")[-1].lower()
+
+        if file_extension not in ALLOWED_FILE_TYPES:
+            return PresignedPostResponse(
+                status_code=400,
+                message=f"File type '{file_extension}' not allowed",
+                body=None
+            )
+
+        key_prefix = f"{owned_key_prefix(current_user)}{settings.s3_post_key_prefix}"
+        object_key = f"{key_prefix}{request.file_name.lstrip('/')}"
+        if not owns_object(current_user, object_key):
+            return PresignedPostResponse(status_code=400, message="Invalid file name", body=None)
+
+        presigner = get_s3_presigner()
+        max_file_size = settings.s3_max_upload_size_mb * 1024 * 1024
+
+        post = presigner.generate_presigned_post(
+            UPLOAD_BUCKET_NAME,
+            object_key,
+            key_prefix=key_prefix,
+            content_type=ALLOWED_FILE_TYPES[file_extension],
+            max_content_length=max_file_size,
+            expires_in=settings.s3_presigned_url_expiry
         )
 
+        logger.info(f"Generated presigned POST policy for {object_key}")
+
+        return PresignedPostResponse(
+            status_code=200,
+            message="Pre-signed POST policy retrieved successfully",
+            body=PresignedPostBody(
+                url=post["url"],
+                fields=post["fields"],
+                object_key=object_key,
+                max_file_size=max_file_size,
+                expires_in=settings.s3_presigned_url_expiry
+            )
+        )
+
+    except Exception as e:
+        logger.error("Error: %s", e)
+        return PresignedPostResponse(
+            status_code=500,
+            message="Internal server error",
+            body=None
+        )
+
+
+@router.post("/content-addressed-url", response_model=ContentAddressedUploadResponse)
+async def generate_content_addressed_url(
+    request: ContentAddressedUploadRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Resolve an upload by content hash, within the caller's own prefix.
+    If the caller already stored the same content its URL is returned and the upload
+    can be skipped; otherwise a pre-signed URL under a hash-derived key is issued. S3
+    verifies the uploaded bytes against the declared SHA-256 and size.
+    """
+    try:
+        file_extension = request.file_name.split(".")[-1].lower()
+        if file_extension not in ALLOWED_FILE_TYPES:
+            return ContentAddressedUploadResponse(
+                status_code=400,
+                message=f"File type '{file_extension}' not allowed",
+                body=None
+            )
+
+        upload = await dedup_manager.prepare_upload(
+            extension=file_extension,
+            content_type=ALLOWED_FILE_TYPES[file_extension],
+            sha256=request.sha256,
+            size=request.size,
+            key_prefix=owned_key_prefix(current_user)
+        )
+
+        return ContentAddressedUploadResponse(
+            status_code=200,
+            message="File already uploaded" if upload["exists"] else "Pre-signed URL retrieved successfully",
+            body=ContentAddressedUploadBody(
+                url=get_delivery_url_service(UPLOAD_BUCKET_NAME).url_for(upload["object_key"]),
+                expires_in=None if upload["exists"] else settings.s3_presigned_url_expiry,
+                **upload
+            )
+        )
+
+    except DedupUploadError as e:
+        return ContentAddressedUploadResponse(status_code=400, message=str(e), body=None)
+
     except ClientError as e:
         logger.error("ClientError: %s", e)
-        return PresignedUrlResponse(
+        return ContentAddressedUploadResponse(
             status_code=500,
-            message="Error generating presigned URL",
+            message="Error checking for existing object",
             body=None
         )
 
-    except KeyError as e:
-        logger.error("KeyError: %s", e)
-        return PresignedUrlResponse(
+    except Exception as e:
+        logger.error("Error: %s", e)
+        return ContentAddressedUploadResponse(
+            status_code=500,
+            message="Internal server error",
+            body=None
+        )
+
+
+@router.post("/delivery-urls", response_model=DeliveryUrlsResponse)
+async def get_delivery_urls(
+    request: DeliveryUrlsRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get read URLs for stored objects in one round trip (e.g. for listing pages).
+    URLs are served through CloudFront when configured and signed for private objects.
+    Only keys under the caller's own prefix are signed; the rest are returned in deniedKeys.
+    """
+    try:
+        if len(request.object_keys) > settings.s3_presign_batch_max_files:
+            return DeliveryUrlsResponse(
+                status_code=400,
+                message=f"Too many objects; at most {settings.s3_presign_batch_max_files} per request",
+                body=None
+            )
+
+        allowed, denied = [], []
+        for object_key in request.object_keys:
+            (allowed if can_read_object(current_user, object_key) else denied).append(object_key)
+        if denied:
+            logger.warning(f"Denied delivery URLs for {len(denied)} keys to user {current_user.uuid}")
+
+        delivery = get_delivery_url_service(UPLOAD_BUCKET_NAME)
+
+        return DeliveryUrlsResponse(
+            status_code=200 if allowed else 403,
+            message="Delivery URLs retrieved successfully" if allowed else "Not allowed to read these objects",
+            body=DeliveryUrlsBody(
+                urls=delivery.urls_for(allowed),
+                denied_keys=denied,
+                expires_in=delivery.expires_in if delivery.signed else None
+            )
+        )
+
+    except Exception as e:
+        logger.error("Error: %s", e)
+        return DeliveryUrlsResponse(
+            status_code=500,
+            message="Internal server error",
+            body=None
+        )
+
+
+@router.post("/multipart/create", response_model=MultipartCreateResponse)
+async def create_multipart_upload(
+    request: MultipartCreateRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Start an S3 multipart upload for a large file under the caller's own prefix.
+    The response tells the client how many parts to upload and how big each one is.
+    """
+    try:
+        file_extension = request.file_name.split(".")[-1].lower()
+        if file_extension not in ALLOWED_FILE_TYPES:
+            return MultipartCreateResponse(
+                status_code=400,
+                message=f"File type '{file_extension}' not allowed",
+                body=None
+            )
+
+        object_key = owned_object_key(current_user, request.file_name)
+        if object_key is None:
+            return MultipartCreateResponse(status_code=400, message="Invalid file name", body=None)
+
+        upload = await multipart_manager.create_upload(
+            object_key=object_key,
+            content_type=ALLOWED_FILE_TYPES[file_extension],
+            file_size=request.file_size,
+            part_size=request.part_size
+        )
+
+        return MultipartCreateResponse(
+            status_code=200,
+            message="Multipart upload created successfully",
+            body=MultipartCreateBody(**upload)
+        )
+
+    except MultipartUploadError as e:
+        return MultipartCreateResponse(status_code=400, message=str(e), body=None)
+
+    except ClientError as e:
+        logger.error("ClientError: %s", e)
+        return MultipartCreateResponse(
+            status_code=500,
+            message="Error creating multipart upload",
+            body=None
+        )
+
+    except Exception as e:
+        logger.error("Error: %s", e)
+        return MultipartCreateResponse(
+            status_code=500,
+            message="Internal server error",
+            body=None
+        )
+
+
+@router.post("/multipart/presign-parts", response_model=MultipartPresignPartsResponse)
+async def presign_multipart_parts(
+    request: MultipartPresignPartsRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Generate pre-signed URLs for uploading parts of a multipart upload.
+    Parts can be uploaded in parallel; each PUT returns an ETag needed to complete the upload.
+    """
+    try:
+        if not owns_object(current_user, request.object_key):
+            return MultipartPresignPartsResponse(status_code=403, message="Not allowed to write this object", body=None)
+
+        parts = await multipart_manager.presign_parts(
+            upload_id=request.upload_id,
+            object_key=request.object_key,
+            part_numbers=request.part_numbers
+        )
+
+        return MultipartPresignPartsResponse(
+            status_code=200,
+            message="Part URLs retrieved successfully",
+            body=MultipartPresignPartsBody(
+                upload_id=request.upload_id,
+                parts=[MultipartPartUrl(**part) for part in parts],
+                expires_in=settings.s3_presigned_url_expiry
+            )
+        )
+
+    except MultipartUploadError as e:
+        return MultipartPresignPartsResponse(status_code=400, message=str(e), body=None)
+
+    except Exception as e:
+        logger.error("Error: %s", e)
+        return MultipartPresignPartsResponse(
+            status_code=500,
+            message="Internal server error",
+            body=None
+        )
+
+
+@router.post("/multipart/complete", response_model=MultipartCompleteResponse)
+async def complete_multipart_upload(
+    request: MultipartCompleteRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Complete a multipart upload once every part has been uploaded
+    """
+    try:
+        if not owns_object(current_user, request.object_key):
+            return MultipartCompleteResponse(status_code=403, message="Not allowed to write this object", body=None)
+
+        result = await multipart_manager.complete_upload(
+            upload_id=request.upload_id,
+            object_key=request.object_key,
+            parts=[part.model_dump(by_alias=False) for part in request.parts]
+        )
+
+        return MultipartCompleteResponse(
+            status_code=200,
+            message="Multipart upload completed successfully",
+            body=MultipartCompleteBody(**result)
+        )
+
+    except MultipartUploadError as e:
+        return MultipartCompleteResponse(status_code=400, message=str(e), body=None)
+
+    except ClientError as e:
+        logger.error("ClientError: %s", e)
+        return MultipartCompleteResponse(
             status_code=400,
-            message="Missing required key",
+            message="Error completing multipart upload",
             body=None
         )
 
     except Exception as e:
         logger.error("Error: %s", e)
-        return PresignedUrlResponse(
+        return MultipartCompleteResponse(
+            status_code=500,
+            message="Internal server error",
+            body=None
+        )
+
+
+@router.post("/multipart/abort", response_model=MultipartAbortResponse)
+async def abort_multipart_upload(
+    request: MultipartAbortRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Abort a multipart upload and discard any uploaded parts
+    """
+    try:
+        if not owns_object(current_user, request.object_key):
+            return MultipartAbortResponse(status_code=403, message="Not allowed to write this object")
+
+        await multipart_manager.abort_upload(
+            upload_id=request.upload_id,
+            object_key=request.object_key
+        )
+
+        return MultipartAbortResponse(
+            status_code=200,
+            message="Multipart upload aborted successfully"
+        )
+
+    except MultipartUploadError as e:
+        return MultipartAbortResponse(status_code=400, message=str(e))
+
+    except ClientError as e:
+        logger.error("ClientError: %s", e)
+        return MultipartAbortResponse(
+            status_code=500,
+            message="Error aborting multipart upload"
+        )
+
+    except Exception as e:
+        logger.error("Error: %s", e)
+        return MultipartAbortResponse(
+            status_code=500,
+            message="Internal server error"
+        )
+
+
+@router.post("/multipart/cleanup")
+async def cleanup_stale_multipart_uploads(
+    max_age_hours: int = settings.s3_multipart_stale_after_hours,
+    current_user: User = Depends(get_current_superuser)
+):
+    """
+    Abort incomplete multipart uploads older than max_age_hours (superuser only)
+    """
+    aborted = await multipart_manager.cleanup_stale_uploads(max_age_hours)
+    return {
+        "success": True,
+        "aborted_uploads": aborted,
+        "max_age_hours": max_age_hours
+    }
+
+
+def get_variants_store() -> ObjectStore:
+    """Object store holding image variants (a local directory in development)"""
+    if settings.image_variants_local_root:
+        return LocalObjectStore(settings.image_variants_local_root)
+    return S3ObjectStore(UPLOAD_BUCKET_NAME, client=get_s3_client())
+
+
+@router.post("/variants", response_model=ImageVariantsResponse)
+async def queue_image_variants(
+    request: ImageVariantsRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Notify the API that an image upload under the caller's own prefix has completed.
+    Queues the image for the local variant worker; in deployed environments the
+    S3-triggered Lambda generates variants without this call.
+    """
+    try:
+        if not can_read_object(current_user, request.object_key):
+            return ImageVariantsResponse(
+                status_code=403,
+                message="Not allowed to read this object",
+                body=None
+            )
+
+        if not is_source_image(request.object_key):
+            return ImageVariantsResponse(
+                status_code=400,
+                message="Only JPG and PNG uploads have variants",
+                body=None
+            )
+
+        if not await asyncio.to_thread(get_variants_store().exists, request.object_key):
+            return ImageVariantsResponse(
+                status_code=404,
+                message="Object not found",
+                body=None
+            )
+
+        await redis_client.lpush(IMAGE_VARIANTS_QUEUE, request.object_key)
+
+        return ImageVariantsResponse(
+            status_code=202,
+            message="Image queued for variant generation",
+            body=None
+        )
+
+    except Exception as e:
+        logger.error("Error: %s", e)
+        return ImageVariantsResponse(
+            status_code=500,
+            message="Internal server error",
+            body=None
+        )
+
+
+@router.get("/variants", response_model=ImageVariantsResponse)
+async def get_image_variants(
+    object_key: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the variants manifest for an uploaded image under the caller's own prefix
+    """
+    try:
+        if not can_read_object(current_user, object_key):
+            return ImageVariantsResponse(
+                status_code=403,
+                message="Not allowed to read this object",
+                body=None
+            )
+
+        pipeline = ImageVariantPipeline(get_variants_store())
+        manifest = await asyncio.to_thread(pipeline.get_manifest, object_key)
+
+        if manifest is None:
+            return ImageVariantsResponse(
+                status_code=404,
+                message="Variants not generated yet",
+                body=None
+            )
+
+        urls = get_delivery_url_service(UPLOAD_BUCKET_NAME).urls_for(
+            variant["key"] for variant in manifest["variants"]
+        )
+
+        return ImageVariantsResponse(
+            status_code=200,
+            message="Variants retrieved successfully",
+            body=ImageVariantsManifest(
+                source_key=manifest["source_key"],
+                generated_at=manifest["generated_at"],
+                variants=[
+                    ImageVariant(
+                        url=urls[variant["key"]],
+                        **variant
+                    )
+                    for variant in manifest["variants"]
+                ]
+            )
+        )
+
+    except Exception as e:
+        logger.error("Error: %s", e)
+        return ImageVariantsResponse(
             status_code=500,
             message="Internal server error",
             body=None
@@ -106,14 +727,15 @@ async def upload_health_check():
         from app.core.aws import check_aws_health
         aws_health = await check_aws_health()
         
-        s3_status = aws_health.get("aws", {}).get("s3", {}).get("status", "unknown")
+        s3_status = aws_health.get("s3", {}).get("status", "unknown")
         
         return {
             "status": "healthy" if s3_status == "healthy" else "unhealthy",
             "s3_status": s3_status,
-            "bucket_name": "my-cms-image-upload",
-            "supported_file_types": ["jpg", "jpeg", "png", "pdf", "doc", "docx"],
-            "max_file_size": "10MB",
+            "bucket_name": UPLOAD_BUCKET_NAME,
+            "supported_file_types": list(ALLOWED_FILE_TYPES),
+            "max_file_size": f"{settings.s3_max_upload_size_mb}MB",
+            "multipart_max_file_size": f"{settings.s3_multipart_max_file_size_mb}MB",
             "url_expiry": "1 hour"
         }
     except Exception as e:
@@ -124,24 +746,27 @@ async def upload_health_check():
         }
 
 
+SUPPORTED_TYPES_RESPONSE = StaticResponse({
+    "supported_types": {
+        "images": ["jpg", "jpeg", "png"],
+        "documents": ["pdf", "doc", "docx"]
+    },
+    "mime_types": {
+        "jpg": "image/jpeg",
+        "jpeg": "image/jpeg", 
+        "png": "image/png",
+        "pdf": "application/pdf",
+        "doc": "application/msword",
+        "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    },
+    "max_file_size": "10MB",
+    "url_expiry_seconds": 3600
+}, max_age=settings.static_response_max_age, minimum_size=settings.compression_minimum_size)
+
+
 @router.get("/supported-types")
-async def get_supported_file_types():
+async def get_supported_file_types(request: Request):
     """
     Get list of supported file types for upload
     """
-    return {
-        "supported_types": {
-            "images": ["jpg", "jpeg", "png"],
-            "documents": ["pdf", "doc", "docx"]
-        },
-        "mime_types": {
-            "jpg": "image/jpeg",
-            "jpeg": "image/jpeg", 
-            "png": "image/png",
-            "pdf": "application/pdf",
-            "doc": "application/msword",
-            "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        },
-        "max_file_size": "10MB",
-        "url_expiry_seconds": 3600
-    }
\ No newline at end of file
+    return SUPPORTED_TYPES_RESPONSE.respond(request)
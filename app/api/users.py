@@ -0,0 +1,132 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app.api.deps import get_current_superuser
+from app.models.user import User
+from app.schemas.auth import UserResponse
+from app.schemas.user import (
+    BulkUserActionRequest,
+    BulkUserActionResponse,
+    UserListQuery,
+    UserListResponse,
+    UserSearchResponse,
+)
+from app.core.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    estimate_count,
+    keyset_page,
+    split_page,
+)
+from app.core.responses import ModelResponse
+from app.core.bulk_actions import apply_bulk_action
+from app.core import search as user_search
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+# Whitelisted sort columns; each has an index ending in id (see User.__table_args__)
+SORT_COLUMNS = {
+    "created_at": User.created_at,
+    "email": User.email,
+    "last_name": User.last_name,
+}
+
+
+@router.get("", response_model=UserListResponse)
+async def list_users(
+    query: Annotated[UserListQuery, Query()],
+    current_user: User = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    List users with keyset pagination (superuser only).
+    Pass the response's nextCursor as cursor to fetch the following page.
+    """
+    column = SORT_COLUMNS[query.sort_by]
+    try:
+        after = decode_cursor(query.cursor, query.sort_by, query.sort_order, column.type.python_type) if query.cursor else None
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    filtered = select(User)
+    for column, value in (
+        (User.is_active, query.is_active),
+        (User.is_verified, query.is_verified),
+        (User.is_superuser, query.is_superuser),
+    ):
+        if value is not None:
+            filtered = filtered.where(column == value)
+
+    result = await db.execute(keyset_page(filtered, column, User.id, query.sort_order, after, query.limit))
+    users, has_next = split_page(result.scalars().all(), query.limit)
+
+    is_filtered = filtered.whereclause is not None
+    total, total_is_estimate = await estimate_count(db, User.__tablename__, filtered if is_filtered else None)
+
+    next_cursor = None
+    if has_next:
+        last = users[-1]
+        next_cursor = encode_cursor(query.sort_by, query.sort_order, getattr(last, query.sort_by), last.id)
+
+    return ModelResponse(UserListResponse(
+        users=[UserResponse.model_validate(user) for user in users],
+        total=total,
+        total_is_estimate=total_is_estimate,
+        limit=query.limit,
+        next_cursor=next_cursor,
+        has_next=has_next
+    ))
+
+
+@router.get("/search", response_model=UserSearchResponse)
+async def search_users(
+    q: str = Query(..., min_length=1, max_length=user_search.MAX_TERM_LENGTH, description="Name or email, or the start of one"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of results"),
+    current_user: User = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Search users by name or email (superuser only), best matches first.
+    Built for typeahead: every prefix of a name or email is an index lookup.
+    """
+    users = await user_search.search_users(db, q, limit)
+    return ModelResponse(UserSearchResponse(
+        users=[UserResponse.model_validate(user) for user in users],
+        query=q,
+        limit=limit
+    ))
+
+
+@router.post("/bulk", response_model=BulkUserActionResponse)
+async def bulk_user_action(
+    request: BulkUserActionRequest,
+    current_user: User = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Activate, deactivate, verify, unverify or delete many users at once (superuser only).
+    Unknown IDs, and your own ID for deactivate/unverify/delete, are returned in failedUsers.
+    """
+    result = await apply_bulk_action(db, request.action, request.user_ids, acting_user_id=current_user.id)
+
+    message = (
+        f"Bulk {request.action}: {len(result.affected)} changed, "
+        f"{len(result.unchanged)} unchanged, {len(result.failed)} failed"
+    )
+    if result.error:
+        message += " (stopped after a database error)"
+    logger.info(f"{message} by {current_user.email}")
+
+    return ModelResponse(BulkUserActionResponse(
+        message=message,
+        success=result.error is None,
+        affected_users=len(result.affected),
+        unchanged_users=len(result.unchanged),
+        failed_users=result.failed
+    ))
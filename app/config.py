@@ -1,6 +1,6 @@
 from pydantic import Field
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import List, Literal, Optional
 import os
 
 
@@ -19,6 +19,31 @@ class Settings(BaseSettings):
     environment: str = Field(default="development", env="ENVIRONMENT", description="Environment")
     debug: bool = Field(default=True, env="DEBUG", description="Debug mode")
     log_level: str = Field(default="INFO", env="LOG_LEVEL", description="Log level")
+    metrics_enabled: bool = Field(default=True, env="METRICS_ENABLED", description="Expose Prometheus metrics at /metrics")
+    metrics_multiproc_dir: str = Field(default="/tmp/turtil-metrics", env="METRICS_MULTIPROC_DIR", description="Directory for per-worker metric files under the production server")
+    metrics_allowed_networks: List[str] = Field(default=["127.0.0.1/32", "::1/128"], env="METRICS_ALLOWED_NETWORKS", description="Client networks allowed to scrape /metrics without a token")
+    metrics_token: Optional[str] = Field(default=None, env="METRICS_TOKEN", description="Bearer token that grants /metrics access from any client")
+    server_timing_header: bool = Field(default=True, env="SERVER_TIMING_HEADER", description="Emit Server-Timing response headers")
+    static_response_max_age: int = Field(default=300, env="STATIC_RESPONSE_MAX_AGE", description="Cache-Control max-age for constant responses (/, /info, supported-types)")
+    compression_enabled: bool = Field(default=True, env="COMPRESSION_ENABLED", description="gzip/brotli response compression")
+    compression_minimum_size: int = Field(default=1024, env="COMPRESSION_MINIMUM_SIZE", description="Bodies smaller than this many bytes are sent uncompressed")
+    compression_gzip_level: int = Field(default=6, env="COMPRESSION_GZIP_LEVEL", description="gzip level (1-9) for per-request compression")
+    compression_brotli_quality: int = Field(default=4, env="COMPRESSION_BROTLI_QUALITY", description="Brotli quality (0-11) for per-request compression")
+    
+    # Production Server Configuration
+    web_concurrency: Optional[int] = Field(default=None, env="WEB_CONCURRENCY", description="Number of worker processes (default: derived from CPU count)")
+    workers_per_core: float = Field(default=1.0, env="WORKERS_PER_CORE", description="Worker processes per available CPU")
+    max_workers: int = Field(default=8, env="MAX_WORKERS", description="Upper bound on derived worker count (0 = no limit)")
+    server_preload: bool = Field(default=True, env="SERVER_PRELOAD", description="Preload the app in the master and share it copy-on-write")
+    worker_max_requests: int = Field(default=10000, env="WORKER_MAX_REQUESTS", description="Recycle a worker after this many requests (0 disables)")
+    worker_max_requests_jitter: int = Field(default=1000, env="WORKER_MAX_REQUESTS_JITTER", description="Random jitter added to worker_max_requests")
+    worker_max_memory_mb: int = Field(default=512, env="WORKER_MAX_MEMORY_MB", description="Recycle a worker once its RSS exceeds this many MB (0 disables)")
+    worker_timeout: int = Field(default=60, env="WORKER_TIMEOUT", description="Seconds before an unresponsive worker is killed")
+    worker_graceful_timeout: int = Field(default=30, env="WORKER_GRACEFUL_TIMEOUT", description="Seconds workers get to finish requests on reload/shutdown")
+    server_keepalive: int = Field(default=5, env="SERVER_KEEPALIVE", description="HTTP keep-alive timeout in seconds")
+    
+    server_loop: Literal["asyncio", "uvloop"] = Field(default="uvloop", env="SERVER_LOOP", description="Event loop implementation: asyncio or uvloop")
+    server_http: Literal["h11", "httptools"] = Field(default="httptools", env="SERVER_HTTP", description="HTTP parser implementation: h11 or httptools")
     
     # CORS and Host Configuration
     cors_origins: List[str] = Field(
@@ -47,6 +72,58 @@ class Settings(BaseSettings):
     
     # S3 Configuration
     s3_bucket_name: str = Field(..., env="S3_BUCKET_NAME", description="S3 bucket name")
+    s3_presigned_url_expiry: int = Field(default=3600, env="S3_PRESIGNED_URL_EXPIRY", description="Presigned upload URL expiry in seconds")
+    s3_max_upload_size_mb: int = Field(default=10, env="S3_MAX_UPLOAD_SIZE_MB", description="Maximum size of single-request uploads in MB")
+    s3_post_key_prefix: str = Field(default="uploads/", env="S3_POST_KEY_PREFIX", description="Key prefix enforced on presigned POST uploads")
+    s3_presign_batch_max_files: int = Field(default=200, env="S3_PRESIGN_BATCH_MAX_FILES", description="Maximum files per batch presign request")
+    s3_content_key_prefix: str = Field(default="objects/", env="S3_CONTENT_KEY_PREFIX", description="Key prefix for content-addressed uploads")
+    s3_user_key_prefix: str = Field(default="users/", env="S3_USER_KEY_PREFIX", description="Key prefix under which each user owns <prefix><user uuid>/")
+    s3_content_index_ttl: int = Field(default=2592000, env="S3_CONTENT_INDEX_TTL", description="Redis TTL of content hash index entries in seconds")
+    s3_multipart_part_size_mb: int = Field(default=8, env="S3_MULTIPART_PART_SIZE_MB", description="Default multipart upload part size in MB (min 5)")
+    s3_multipart_max_file_size_mb: int = Field(default=5120, env="S3_MULTIPART_MAX_FILE_SIZE_MB", description="Maximum file size for multipart uploads in MB")
+    s3_multipart_stale_after_hours: int = Field(default=24, env="S3_MULTIPART_STALE_AFTER_HOURS", description="Age after which incomplete multipart uploads are aborted")
+    s3_multipart_cleanup_interval_minutes: int = Field(default=60, env="S3_MULTIPART_CLEANUP_INTERVAL_MINUTES", description="Interval between stale multipart cleanup runs (0 disables)")
+    
+    # CloudFront Delivery Configuration
+    cloudfront_media_domain: Optional[str] = Field(default=None, env="CLOUDFRONT_MEDIA_DOMAIN", description="CloudFront domain serving uploaded objects (unset serves raw S3 URLs)")
+    cloudfront_key_pair_id: Optional[str] = Field(default=None, env="CLOUDFRONT_KEY_PAIR_ID", description="CloudFront public key ID used for signed URLs")
+    cloudfront_private_key: Optional[str] = Field(default=None, env="CLOUDFRONT_PRIVATE_KEY", description="PEM private key for CloudFront signed URLs")
+    cloudfront_private_key_path: Optional[str] = Field(default=None, env="CLOUDFRONT_PRIVATE_KEY_PATH", description="Path to the PEM private key for CloudFront signed URLs")
+    cloudfront_url_expiry: int = Field(default=3600, env="CLOUDFRONT_URL_EXPIRY", description="Signed delivery URL expiry in seconds")
+    cloudfront_url_refresh_margin: int = Field(default=300, env="CLOUDFRONT_URL_REFRESH_MARGIN", description="Re-sign cached delivery URLs this many seconds before they expire")
+    
+    # Image Variant Configuration
+    image_variant_widths: List[int] = Field(default=[320, 640, 1280], env="IMAGE_VARIANT_WIDTHS", description="Widths of generated image variants")
+    image_variant_formats: List[str] = Field(default=["webp", "avif"], env="IMAGE_VARIANT_FORMATS", description="Formats of generated image variants")
+    image_variant_quality: int = Field(default=80, env="IMAGE_VARIANT_QUALITY", description="Encoder quality for image variants")
+    image_variants_local_root: Optional[str] = Field(default=None, env="IMAGE_VARIANTS_LOCAL_ROOT", description="Local directory used instead of S3 for image variants (development)")
+    
+    # Health Check Configuration
+    health_probe_timeout: float = Field(default=3.0, env="HEALTH_PROBE_TIMEOUT", description="Timeout of each dependency health probe in seconds")
+    health_cache_max_age: float = Field(default=30.0, env="HEALTH_CACHE_MAX_AGE", description="Age after which cached health results are refreshed on demand")
+    health_refresh_interval: float = Field(default=15.0, env="HEALTH_REFRESH_INTERVAL", description="Background health refresh interval in seconds (0 disables)")
+    
+    readiness_max_loop_lag_ms: float = Field(default=250.0, env="READINESS_MAX_LOOP_LAG_MS", description="Event-loop lag at which the worker reports not ready")
+    readiness_max_db_connect_ms: float = Field(default=1000.0, env="READINESS_MAX_DB_CONNECT_MS", description="Database connection acquisition time at which the worker reports not ready")
+    readiness_max_db_connections: int = Field(default=50, env="READINESS_MAX_DB_CONNECTIONS", description="Database connections in use at which the worker reports not ready")
+    readiness_max_in_flight: int = Field(default=200, env="READINESS_MAX_IN_FLIGHT", description="Requests in flight at which the worker reports not ready")
+    readiness_recover_ratio: float = Field(default=0.7, env="READINESS_RECOVER_RATIO", description="Fraction of a limit a signal must fall below before the worker is ready again")
+    loop_block_threshold_ms: float = Field(default=100.0, env="LOOP_BLOCK_THRESHOLD_MS", description="Event-loop stall duration reported with the blocking stack")
+    loop_heartbeat_interval_ms: float = Field(default=50.0, env="LOOP_HEARTBEAT_INTERVAL_MS", description="Event-loop heartbeat interval (stall monitor and readiness lag sampling)")
+    
+    # Profiler Configuration
+    profiler_enabled: bool = Field(default=True, env="PROFILER_ENABLED", description="Enable the superuser sampling profiler endpoint")
+    profiler_dir: str = Field(default="/tmp/turtil-profiles", env="PROFILER_DIR", description="Directory shared by workers for all-worker profile requests")
+    profiler_max_duration: float = Field(default=60.0, env="PROFILER_MAX_DURATION", description="Longest profile window in seconds")
+    profiler_tracemalloc_frames: int = Field(default=1, env="PROFILER_TRACEMALLOC_FRAMES", description="Frames stored per allocation while tracing memory")
+    
+    # Tracing Configuration (OpenTelemetry)
+    tracing_enabled: bool = Field(default=False, env="TRACING_ENABLED", description="Enable OpenTelemetry tracing")
+    tracing_exporter: str = Field(default="otlp", env="TRACING_EXPORTER", description="Span exporter: otlp, console or memory")
+    tracing_otlp_endpoint: str = Field(default="http://localhost:4318/v1/traces", env="TRACING_OTLP_ENDPOINT", description="OTLP/HTTP traces endpoint")
+    tracing_sample_ratio: float = Field(default=0.05, env="TRACING_SAMPLE_RATIO", description="Head sampling ratio for new traces")
+    tracing_tail_latency_ms: float = Field(default=1000.0, env="TRACING_TAIL_LATENCY_MS", description="Keep unsampled traces slower than this, or failing (0 disables tail sampling)")
+    tracing_tail_max_traces: int = Field(default=1000, env="TRACING_TAIL_MAX_TRACES", description="Unsampled traces buffered in memory awaiting a tail decision")
     
     # Upstash Redis Configuration
     upstash_redis_url: str = Field(..., env="UPSTASH_REDIS_URL", description="Upstash Redis URL")
@@ -91,7 +168,8 @@ def print_config():
     config_dict = settings.dict()
     sensitive_keys = {
         "secret_key", "jwt_secret_key", "database_url", "aws_access_key_id", 
-        "aws_secret_access_key", "upstash_redis_token", "otp_secret"
+        "aws_secret_access_key", "upstash_redis_token", "otp_secret",
+        "cloudfront_private_key"
     }
     
     safe_config = {
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.config import settings
+from app.core.timing import timed
 from app.models.user import User
 
 
@@ -19,6 +20,7 @@ class AuthManager:
     """Custom authentication manager"""
     
     @staticmethod
+    @timed("hash", "argon2.hash")
     def hash_password(password: str) -> str:
         """Hash a password using Argon2"""
         try:
@@ -30,6 +32,7 @@ class AuthManager:
             )
     
     @staticmethod
+    @timed("hash", "argon2.verify")
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its Argon2 hash"""
         try:
@@ -2,6 +2,7 @@ import boto3
 import logging
 from typing import Dict, Any, Optional
 from app.config import settings
+from app.core.timing import instrument_boto3_client
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +22,7 @@ class AWSManager:
                 aws_secret_access_key=settings.aws_secret_access_key,
                 region_name=settings.aws_ses_region
             )
+            instrument_boto3_client(self._ses_client)
         return self._ses_client
     
     def get_s3_client(self):
@@ -32,43 +34,47 @@ class AWSManager:
                 aws_secret_access_key=settings.aws_secret_access_key,
                 region_name=settings.aws_region
             )
+            instrument_boto3_client(self._s3_client)
         return self._s3_client
     
-    def health_check(self) -> Dict[str, Any]:
-        """Check health of AWS services"""
-        health_status = {}
-        
-        # Check SES
+    def check_ses(self) -> Dict[str, Any]:
+        """Check SES connectivity (blocking AWS API call)"""
         try:
             ses_client = self.get_ses_client()
             # Simple call to verify SES connectivity
             ses_client.get_send_quota()
-            health_status["ses"] = {
+            return {
                 "status": "healthy",
                 "region": settings.aws_ses_region
             }
         except Exception as e:
-            health_status["ses"] = {
+            return {
                 "status": "error",
                 "error": str(e)
             }
-        
-        # Check S3
+    
+    def check_s3(self) -> Dict[str, Any]:
+        """Check S3 connectivity (blocking AWS API call)"""
         try:
             s3_client = self.get_s3_client()
             # Simple call to verify S3 connectivity
             s3_client.list_buckets()
-            health_status["s3"] = {
+            return {
                 "status": "healthy",
                 "region": settings.aws_region
             }
         except Exception as e:
-            health_status["s3"] = {
+            return {
                 "status": "error",
                 "error": str(e)
             }
-        
-        return health_status
+    
+    def health_check(self) -> Dict[str, Any]:
+        """Check health of AWS services"""
+        return {
+            "ses": self.check_ses(),
+            "s3": self.check_s3()
+        }
 
 # Global AWS manager instance
 aws_manager = AWSManager()
@@ -272,5 +278,6 @@ class S3Service:
 
 # Health check function
 async def check_aws_health() -> Dict[str, Any]:
-    """Check AWS services health"""
-    return aws_manager.health_check()
\ No newline at end of file
+    """AWS services health, served from the health monitor cache"""
+    from app.core.health import health_monitor
+    return await health_monitor.get_results(["ses", "s3"])
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Set-based bulk user actions.
+
+Each chunk of ids is one statement, ``UPDATE users SET ... WHERE id = ANY($1)
+AND <not already in that state> RETURNING id, uuid`` (or ``DELETE ...
+RETURNING``), committed on its own so row locks are held for one chunk at a
+time. The id array is a single bind parameter, so every chunk reuses the same
+prepared statement. Rows already in the target state are not rewritten.
+
+Core statements bypass the ORM events that invalidate cached user data, so
+the user cache (ETag included) of every changed user is invalidated afterwards
+in one pipelined Redis round trip.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Integer, any_, delete, func, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.etags import invalidate_etags
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# action -> (values to set, condition selecting rows not yet in that state)
+UPDATE_ACTIONS: Dict[str, Tuple[dict, object]] = {
+    "activate": ({"is_active": True}, User.is_active.is_(False)),
+    "deactivate": ({"is_active": False}, User.is_active.is_(True)),
+    "verify": (
+        {"is_verified": True, "email_verified_at": func.coalesce(User.email_verified_at, func.now())},
+        User.is_verified.is_(False),
+    ),
+    "unverify": ({"is_verified": False, "email_verified_at": None}, User.is_verified.is_(True)),
+}
+
+# Actions an admin may not apply to their own account
+SELF_PROTECTED_ACTIONS = {"deactivate", "unverify", "delete"}
+
+
+class BulkActionResult:
+    """Outcome of a bulk action"""
+
+    def __init__(self):
+        self.affected: List[int] = []
+        self.unchanged: List[int] = []
+        self.failed: List[int] = []
+        self.affected_uuids: List[str] = []
+        self.error: Optional[str] = None
+
+
+def _ids_param(ids: List[int]):
+    return any_(literal(ids, ARRAY(Integer)))
+
+
+async def _apply_chunk(db: AsyncSession, action: str, chunk: List[int], result: BulkActionResult) -> None:
+    if action == "delete":
+        statement = delete(User).where(User.id == _ids_param(chunk))
+    else:
+        values, needs_change = UPDATE_ACTIONS[action]
+        statement = update(User).where(User.id == _ids_param(chunk), needs_change).values(**values)
+    statement = statement.returning(User.id, User.uuid).execution_options(synchronize_session=False)
+
+    rows = (await db.execute(statement)).all()
+    changed = {row.id for row in rows}
+
+    existing = changed
+    if len(changed) < len(chunk) and action != "delete":
+        # Some ids were not updated: already in the target state, or missing
+        existing = set((await db.execute(select(User.id).where(User.id == _ids_param(chunk)))).scalars())
+    await db.commit()
+
+    result.affected.extend(row.id for row in rows)
+    result.affected_uuids.extend(str(row.uuid) for row in rows)
+    for user_id in chunk:
+        if user_id not in changed:
+            (result.unchanged if user_id in existing else result.failed).append(user_id)
+
+
+async def apply_bulk_action(
+    db: AsyncSession,
+    action: str,
+    user_ids: Iterable[int],
+    acting_user_id: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> BulkActionResult:
+    """
+    Apply ``action`` to every id, ``chunk_size`` ids per statement and commit.
+    Unknown ids (and the acting admin's own id, for destructive actions) are
+    reported as failed. A failing chunk stops the run; its ids and all later
+    ones are reported as failed, earlier chunks stay applied.
+    """
+    result = BulkActionResult()
+    ids = list(dict.fromkeys(user_ids))
+    if acting_user_id is not None and action in SELF_PROTECTED_ACTIONS and acting_user_id in ids:
+        ids.remove(acting_user_id)
+        result.failed.append(acting_user_id)
+
+    try:
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            try:
+                await _apply_chunk(db, action, chunk, result)
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"Bulk {action} failed at chunk {start // chunk_size}: {e}")
+                result.error = str(e)
+                result.failed.extend(ids[start:])
+                break
+    finally:
+        await invalidate_etags(f"user:{user_uuid}" for user_uuid in result.affected_uuids)
+
+    return result
@@ -0,0 +1,232 @@
+import base64
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import quote
+
+from app.config import settings
+from app.core.aws import S3Service
+
+logger = logging.getLogger(__name__)
+
+
+def _cloudfront_b64(data: bytes) -> str:
+    """Base64 with CloudFront's URL-safe substitutions (+ -> -, = -> _, / -> ~)"""
+    return base64.b64encode(data).decode("ascii").translate(str.maketrans("+=/", "-_~"))
+
+
+class CloudFrontSigner:
+    """
+    RSA signer for CloudFront signed URLs.
+
+    The private key is parsed once and reused for every signature; CloudFront
+    requires RSA-SHA1 (PKCS#1 v1.5) signatures for trusted key groups.
+    """
+
+    def __init__(self, key_pair_id: str, private_key_pem: str):
+        from cryptography.hazmat.primitives import serialization
+
+        self.key_pair_id = key_pair_id
+        self._private_key = serialization.load_pem_private_key(
+            private_key_pem.replace("\\n", "\n").encode("utf-8"),
+            password=None
+        )
+
+    def _sign(self, message: bytes) -> bytes:
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+
+        return self._private_key.sign(message, padding.PKCS1v15(), hashes.SHA1())
+
+    @staticmethod
+    def _append_query(url: str, query: str) -> str:
+        return f"{url}{'&' if '?' in url else '?'}{query}"
+
+    def canned_url(self, url: str, expires: int) -> str:
+        """Sign a URL with a canned policy (single resource, expiry only)"""
+        policy = (
+            '{"Statement":[{"Resource":"%s","Condition":{"DateLessThan":{"AWS:EpochTime":%d}}}]}'
+            % (url, expires)
+        )
+        signature = _cloudfront_b64(self._sign(policy.encode("utf-8")))
+        return self._append_query(
+            url, f"Expires={expires}&Signature={signature}&Key-Pair-Id={self.key_pair_id}"
+        )
+
+    def build_custom_policy(
+        self,
+        resource: str,
+        expires: int,
+        not_before: Optional[int] = None,
+        ip_address: Optional[str] = None
+    ) -> str:
+        """Custom policy JSON; ``resource`` may contain ``*`` wildcards"""
+        condition: Dict[str, Dict[str, object]] = {"DateLessThan": {"AWS:EpochTime": expires}}
+        if not_before is not None:
+            condition["DateGreaterThan"] = {"AWS:EpochTime": not_before}
+        if ip_address:
+            condition["IpAddress"] = {"AWS:SourceIp": ip_address}
+        return json.dumps(
+            {"Statement": [{"Resource": resource, "Condition": condition}]},
+            separators=(",", ":")
+        )
+
+    def custom_url(
+        self,
+        url: str,
+        expires: int,
+        resource: Optional[str] = None,
+        not_before: Optional[int] = None,
+        ip_address: Optional[str] = None
+    ) -> str:
+        """
+        Sign a URL with a custom policy.
+
+        Args:
+            url: URL to sign
+            expires: Epoch seconds after which the URL stops working
+            resource: Policy resource (defaults to ``url``; use a wildcard such as
+                ``https://cdn.example.com/variants/photo.jpg/*`` to share one policy)
+            not_before: Epoch seconds before which the URL is not valid
+            ip_address: Source IP or CIDR the URL is restricted to
+        """
+        policy = self.build_custom_policy(resource or url, expires, not_before, ip_address).encode("utf-8")
+        return self._append_query(
+            url,
+            f"Policy={_cloudfront_b64(policy)}"
+            f"&Signature={_cloudfront_b64(self._sign(policy))}"
+            f"&Key-Pair-Id={self.key_pair_id}"
+        )
+
+
+class DeliveryUrlService:
+    """
+    Issues read URLs for uploaded objects.
+
+    With a CloudFront domain configured, objects are served through the CDN;
+    when a key pair is also configured the URLs are signed (canned policy) so
+    the bucket can stay private. Signed URLs are cached until they are within
+    ``refresh_margin`` seconds of expiring, so listing pages that render the
+    same objects repeatedly do not re-sign them. Without CloudFront the raw
+    S3 object URL is returned.
+    """
+
+    def __init__(
+        self,
+        bucket_name: str,
+        domain: Optional[str] = None,
+        signer: Optional[CloudFrontSigner] = None,
+        expires_in: int = 3600,
+        refresh_margin: int = 300,
+        cache_size: int = 10000
+    ):
+        self.bucket_name = bucket_name
+        self.domain = domain
+        self.signer = signer
+        self.expires_in = expires_in
+        self.refresh_margin = min(refresh_margin, expires_in // 2)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+
+    @property
+    def signed(self) -> bool:
+        return self.domain is not None and self.signer is not None
+
+    def _base_url(self, object_key: str) -> str:
+        return f"https://{self.domain}/{quote(object_key, safe='/-_.~')}"
+
+    def _cached(self, object_key: str, now: int) -> Optional[str]:
+        entry = self._cache.get(object_key)
+        if entry is None:
+            return None
+        url, expires = entry
+        if expires - now <= self.refresh_margin:
+            del self._cache[object_key]
+            return None
+        self._cache.move_to_end(object_key)
+        return url
+
+    def _store(self, object_key: str, url: str, expires: int) -> None:
+        self._cache[object_key] = (url, expires)
+        self._cache.move_to_end(object_key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def url_for(self, object_key: str, now: Optional[int] = None) -> str:
+        """Delivery URL for a single object"""
+        if self.domain is None:
+            return S3Service.get_object_url(self.bucket_name, object_key)
+        if self.signer is None:
+            return self._base_url(object_key)
+
+        now = now or int(time.time())
+        url = self._cached(object_key, now)
+        if url is None:
+            expires = now + self.expires_in
+            url = self.signer.canned_url(self._base_url(object_key), expires)
+            self._store(object_key, url, expires)
+        return url
+
+    def urls_for(self, object_keys: Iterable[str]) -> Dict[str, str]:
+        """Delivery URLs for many objects, signed with a shared expiry"""
+        now = int(time.time())
+        return {object_key: self.url_for(object_key, now=now) for object_key in object_keys}
+
+    def custom_url_for(
+        self,
+        object_key: str,
+        resource_key: Optional[str] = None,
+        expires_in: Optional[int] = None,
+        ip_address: Optional[str] = None
+    ) -> str:
+        """
+        Delivery URL signed with a custom policy (not cached).
+
+        ``resource_key`` may end in ``*`` to grant access to every object under a
+        prefix with the same signature, e.g. all variants of one image.
+        """
+        if not self.signed:
+            return self.url_for(object_key)
+
+        expires = int(time.time()) + (expires_in or self.expires_in)
+        resource = self._base_url(resource_key.rstrip("*")) + "*" if resource_key else None
+        return self.signer.custom_url(self._base_url(object_key), expires, resource=resource, ip_address=ip_address)
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+
+def _load_private_key() -> Optional[str]:
+    if settings.cloudfront_private_key:
+        return settings.cloudfront_private_key
+    if settings.cloudfront_private_key_path:
+        with open(settings.cloudfront_private_key_path, "r", encoding="utf-8") as key_file:
+            return key_file.read()
+    return None
+
+
+_delivery_services: Dict[str, DeliveryUrlService] = {}
+
+
+def get_delivery_url_service(bucket_name: str) -> DeliveryUrlService:
+    """Get the (process-wide) delivery URL service for a bucket"""
+    service = _delivery_services.get(bucket_name)
+    if service is None:
+        signer = None
+        private_key = _load_private_key()
+        if settings.cloudfront_media_domain and settings.cloudfront_key_pair_id and private_key:
+            signer = CloudFrontSigner(settings.cloudfront_key_pair_id, private_key)
+        elif settings.cloudfront_media_domain:
+            logger.info("CloudFront signing key not configured; issuing unsigned CDN URLs")
+
+        service = DeliveryUrlService(
+            bucket_name,
+            domain=settings.cloudfront_media_domain,
+            signer=signer,
+            expires_in=settings.cloudfront_url_expiry,
+            refresh_margin=settings.cloudfront_url_refresh_margin
+        )
+        _delivery_services[bucket_name] = service
+    return service
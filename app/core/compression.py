@@ -0,0 +1,219 @@
+"""
+Response compression.
+
+``CompressionMiddleware`` (pure ASGI) negotiates ``br`` or ``gzip`` from
+``Accept-Encoding`` and compresses response bodies, skipping:
+
+- bodies under ``minimum_size`` (headers and CPU cost more than they save)
+- content types outside ``COMPRESSIBLE_TYPES`` (images are already compressed)
+- responses that already carry a ``Content-Encoding`` (precompressed static
+  bodies, see ``StaticResponse``), ``Cache-Control: no-transform``, HEAD
+  requests and bodiless statuses
+
+Single-message bodies (every JSON response here) are compressed in one call
+with an exact ``Content-Length``; streamed bodies are compressed incrementally.
+Strong ETags are weakened on compressed responses, as the bytes differ from the
+identity representation. Compression is timed as the ``compress`` phase.
+
+Brotli is optional: without the ``brotli`` package only gzip is offered.
+"""
+
+import gzip
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.timing import span
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/problem+json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+_BODILESS_STATUSES = {204, 304}
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """Encodings this process can produce, most preferred first"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def select_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Best supported encoding the client accepts (highest q, then server
+    preference), or None for identity.
+    """
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+
+    best, best_q = None, 0.0
+    for encoding in supported_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.lower().startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    """Compress a complete body"""
+    with span("compress", encoding):
+        if encoding == "br":
+            return brotli.compress(body, quality=brotli_quality)
+        return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class _StreamCompressor:
+    """Incremental compressor for streamed bodies"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits 16+: gzip container
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk: bytes, final: bool) -> bytes:
+        with span("compress", self.encoding):
+            if self.encoding == "br":
+                data = self._compressor.process(chunk) if chunk else b""
+                return data + (self._compressor.finish() if final else self._compressor.flush())
+            data = self._compressor.compress(chunk)
+            return data + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """Pure ASGI gzip/brotli response compression with a size threshold"""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding"))
+        start_message: Optional[dict] = None
+        stream: Optional[_StreamCompressor] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, stream, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    message["status"] in _BODILESS_STATUSES
+                    or "content-encoding" in headers
+                    or not is_compressible(headers.get("content-type"))
+                    or "no-transform" in headers.get("cache-control", "")
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Held until the first body chunk decides the encoding
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if stream is not None:
+                await send({
+                    "type": "http.response.body",
+                    "body": stream.compress(body, final=not more_body),
+                    "more_body": more_body,
+                })
+                return
+
+            headers = MutableHeaders(scope=start_message)
+            if not more_body and len(body) < self.minimum_size:
+                # Small complete body: not worth it, and the representation does not vary
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            if encoding is None:
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+
+            if not more_body:
+                compressed = compress(body, encoding, self.gzip_level, self.brotli_quality)
+                headers["Content-Length"] = str(len(compressed))
+                await send(start_message)
+                await send({"type": "http.response.body", "body": compressed, "more_body": False})
+                return
+
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            stream = _StreamCompressor(encoding, self.gzip_level, self.brotli_quality)
+            await send(start_message)
+            await send({"type": "http.response.body", "body": stream.compress(body, final=False), "more_body": True})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class PrecompressedBody:
+    """A constant body with its compressed variants built once, at maximum effort"""
+
+    def __init__(self, body: bytes, minimum_size: int = 1024):
+        self.body = body
+        self.variants: Dict[str, bytes] = {}
+        if len(body) >= minimum_size:
+            candidates: List[Tuple[str, bytes]] = [("gzip", gzip.compress(body, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                candidates.append(("br", brotli.compress(body, quality=11)))
+            self.variants = {encoding: data for encoding, data in candidates if len(data) < len(body)}
+
+    def select(self, accept_encoding: Optional[str]) -> Tuple[Optional[str], bytes]:
+        """(encoding, bytes) to send for a request's Accept-Encoding"""
+        if self.variants:
+            encoding = select_encoding(accept_encoding)
+            if encoding in self.variants:
+                return encoding, self.variants[encoding]
+        return None, self.body
@@ -0,0 +1,167 @@
+import asyncio
+import base64
+import json
+import logging
+import re
+from typing import Any, Dict, Optional
+
+from botocore.exceptions import ClientError
+
+from app.config import settings
+from app.core.aws import get_s3_client
+from app.core.presign import get_s3_presigner
+from app.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+SHA256_HEX = re.compile(r"^[0-9a-f]{64}$")
+
+
+class DedupUploadError(Exception):
+    """Raised when a content-addressed upload request cannot be honoured"""
+
+
+class DedupUploadManager:
+    """
+    Content-addressed (deduplicated) uploads.
+
+    Objects are stored under a key derived from their SHA-256 below the
+    uploader's own key prefix, so identical content is only uploaded once per
+    owner and uploads can never overwrite each other. An index in Redis maps
+    each (prefix, hash) to the stored object; S3 remains the source of truth
+    and is consulted on index misses.
+
+    Presigned URLs sign the Content-Length and ``x-amz-checksum-sha256``
+    headers, so S3 rejects any upload whose bytes do not match the declared
+    hash and size.
+    """
+
+    KEY_PREFIX = "content_index:"
+
+    def __init__(self, bucket_name: str):
+        self.bucket_name = bucket_name
+
+    @staticmethod
+    def normalize_hash(sha256: str) -> str:
+        sha256 = sha256.strip().lower()
+        if not SHA256_HEX.match(sha256):
+            raise DedupUploadError("sha256 must be 64 hexadecimal characters")
+        return sha256
+
+    @staticmethod
+    def content_key(sha256: str, extension: str, key_prefix: str = "") -> str:
+        """Hash-derived object key under ``key_prefix``, fanned out by the first byte of the hash"""
+        return f"{key_prefix}{settings.s3_content_key_prefix}{sha256[:2]}/{sha256}.{extension}"
+
+    @staticmethod
+    def checksum_header(sha256: str) -> str:
+        """Base64 digest as expected by the x-amz-checksum-sha256 header"""
+        return base64.b64encode(bytes.fromhex(sha256)).decode("ascii")
+
+    async def _get_indexed(self, sha256: str, key_prefix: str) -> Optional[Dict[str, Any]]:
+        data = await redis_client.get(f"{self.KEY_PREFIX}{key_prefix}{sha256}")
+        return json.loads(data) if data else None
+
+    async def _index(self, sha256: str, key_prefix: str, entry: Dict[str, Any]) -> None:
+        await redis_client.setex(
+            f"{self.KEY_PREFIX}{key_prefix}{sha256}",
+            settings.s3_content_index_ttl,
+            json.dumps(entry)
+        )
+
+    def _head_verified(self, object_key: str, sha256: str) -> Optional[Dict[str, Any]]:
+        """HEAD an object and return it only if S3 recorded the expected checksum"""
+        s3 = get_s3_client()
+        try:
+            response = s3.head_object(Bucket=self.bucket_name, Key=object_key, ChecksumMode="ENABLED")
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+        # Anything under the content prefix not written through this flow is ignored
+        if response.get("ChecksumSHA256") != self.checksum_header(sha256):
+            logger.warning(f"Object {object_key} does not carry the expected checksum; ignoring")
+            return None
+
+        return {
+            "object_key": object_key,
+            "size": response["ContentLength"],
+            "content_type": response.get("ContentType")
+        }
+
+    async def find_existing(
+        self,
+        sha256: str,
+        size: int,
+        extension: str,
+        content_type: str,
+        key_prefix: str = ""
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up an existing object with this content under ``key_prefix``.
+
+        Raises:
+            DedupUploadError: if the hash is known but the declared size differs
+        """
+        entry = await self._get_indexed(sha256, key_prefix)
+        if entry is None or entry.get("content_type") != content_type:
+            entry = await asyncio.to_thread(self._head_verified, self.content_key(sha256, extension, key_prefix), sha256)
+            if entry is None:
+                return None
+            await self._index(sha256, key_prefix, entry)
+
+        if entry["size"] != size:
+            raise DedupUploadError("Size does not match the existing object with this hash")
+        return entry
+
+    async def prepare_upload(
+        self,
+        extension: str,
+        content_type: str,
+        sha256: str,
+        size: int,
+        key_prefix: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Resolve a content-addressed upload under ``key_prefix``.
+
+        Returns:
+            dict with object_key, content_type and exists; when the content is not
+            stored yet also presigned_url and the headers the PUT must be sent with
+        """
+        sha256 = self.normalize_hash(sha256)
+        max_size = settings.s3_max_upload_size_mb * 1024 * 1024
+        if size > max_size:
+            raise DedupUploadError(f"File exceeds maximum size of {settings.s3_max_upload_size_mb}MB")
+
+        existing = await self.find_existing(sha256, size, extension, content_type, key_prefix)
+        if existing:
+            logger.info(f"Deduplicated upload of {sha256} to existing object {existing['object_key']}")
+            return {
+                "object_key": existing["object_key"],
+                "content_type": existing.get("content_type") or content_type,
+                "exists": True
+            }
+
+        object_key = self.content_key(sha256, extension, key_prefix)
+        headers = {
+            "Content-Length": str(size),
+            "x-amz-checksum-sha256": self.checksum_header(sha256)
+        }
+        presigned_url = get_s3_presigner().generate_presigned_url(
+            self.bucket_name,
+            object_key,
+            method="PUT",
+            expires_in=settings.s3_presigned_url_expiry,
+            content_type=content_type,
+            headers=headers
+        )
+
+        return {
+            "object_key": object_key,
+            "content_type": content_type,
+            "exists": False,
+            "presigned_url": presigned_url,
+            "headers": {"Content-Type": content_type, **headers}
+        }
@@ -0,0 +1,178 @@
+"""
+Conditional GET for per-user (or any keyed) resources.
+
+The current ETag of a resource is the ``etag`` field of its cache hash in
+Redis (for users, the user cache ``user:<uuid>``). The ``conditional_get``
+dependency resolves the key cheaply (e.g. from the JWT ``sub`` claim, no
+database) and reads the cached ETag and the hash version in one command; when
+the client's ``If-None-Match`` matches it raises ``NotModifiedError``,
+answered with a bodiless 304 before any later dependency (database session,
+user lookup) runs or anything is serialized.
+
+On a cache miss the endpoint computes the ETag from the row it loaded
+(``make_etag``) and calls ``ConditionalGet.respond``, which stores it (only
+when none was cached, and only if the hash version is unchanged since before
+the row was read) and still answers 304 if it matches.
+
+``invalidate_on_change`` hooks a model's ORM updates and deletes: the cache
+hashes of changed rows are invalidated (version bumped, cached fields dropped)
+once the transaction commits, so a request that read the row before the change
+cannot cache its old ETag afterwards. Changes made with Core
+``UPDATE``/``DELETE`` statements bypass the mapper and must call
+``invalidate_etags`` themselves.
+"""
+
+import asyncio
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Iterable, Optional, Set
+
+from fastapi import Depends, Request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.responses import Response
+
+from app.config import settings
+from app.core.responses import etag_matches
+from app.redis_client import CACHE_VERSION_FIELD, CacheManager
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "etag_invalidations"
+
+# Strong references to fire-and-forget invalidation tasks
+_background_tasks: Set[asyncio.Task] = set()
+
+
+class NotModifiedError(Exception):
+    """The client's cached representation is current; answered with a 304"""
+
+    def __init__(self, etag: str, headers: dict):
+        self.etag = etag
+        self.headers = headers
+        super().__init__(etag)
+
+    def response(self) -> Response:
+        return Response(status_code=304, headers=self.headers)
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the parts identifying a representation (id, updated_at, ...)"""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+ETAG_FIELD = "etag"
+
+
+async def invalidate_etags(keys: Iterable[str]) -> None:
+    """Invalidate the cache hashes (ETag included) of many resources in one round trip"""
+    keys = list(keys)
+    if not keys:
+        return
+    try:
+        await CacheManager.invalidate_cached(keys)
+    except Exception as e:
+        logger.error(f"Failed to invalidate ETags of {len(keys)} resources: {e}")
+
+
+class ConditionalGet:
+    """Per-request conditional GET state handed to the endpoint"""
+
+    def __init__(
+        self,
+        key: Optional[str],
+        if_none_match: Optional[str],
+        ttl: int,
+        cached: Optional[str] = None,
+        version: Optional[str] = None,
+        cache_read: bool = False
+    ):
+        self.key = key
+        self.if_none_match = if_none_match
+        self.ttl = ttl
+        self.cached = cached
+        self.version = version
+        self.cache_read = cache_read
+        self.headers = {"Cache-Control": "private, no-cache"}
+
+    async def respond(self, etag: str, build: Callable[[], Response]) -> Response:
+        """
+        Return ``build()`` with ETag headers, or a 304 (``build`` never called)
+        when the client already has ``etag``. The ETag is cached only when
+        none was, and only if the resource was not invalidated since the
+        dependency read the cache (before the endpoint loaded the row).
+        """
+        headers = {**self.headers, "ETag": etag}
+        if self.key and self.cache_read and self.cached is None:
+            try:
+                await CacheManager.store_cached_field(self.key, ETAG_FIELD, etag, self.version, self.ttl)
+            except Exception as e:
+                logger.error(f"Failed to cache ETag for {self.key}: {e}")
+
+        if etag_matches(self.if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        response = build()
+        response.headers.update(headers)
+        return response
+
+
+def conditional_get(
+    resolve_key: Callable[..., Awaitable[Optional[str]]],
+    ttl: Optional[int] = None
+) -> Callable[..., Awaitable[ConditionalGet]]:
+    """
+    Build a dependency answering 304 from the cached ETag of the key
+    ``resolve_key`` returns (itself a dependency; ``None`` disables the check).
+    Declare it before the dependencies it should spare.
+    """
+    async def dependency(request: Request, key: Optional[str] = Depends(resolve_key)) -> ConditionalGet:
+        conditional = ConditionalGet(key, request.headers.get("if-none-match"), ttl or settings.redis_user_cache_ttl)
+        if key:
+            try:
+                fields = await CacheManager.get_cached_fields(key, ETAG_FIELD)
+            except Exception as e:
+                # Without the version the ETag cannot be stored safely; serve uncached
+                logger.error(f"Failed to read ETag for {key}: {e}")
+                return conditional
+            conditional.cached = fields[ETAG_FIELD]
+            conditional.version = fields[CACHE_VERSION_FIELD]
+            conditional.cache_read = True
+            if conditional.cached and conditional.if_none_match and etag_matches(conditional.if_none_match, conditional.cached):
+                raise NotModifiedError(conditional.cached, {**conditional.headers, "ETag": conditional.cached})
+        return conditional
+
+    return dependency
+
+
+def invalidate_on_change(model: type, key_for: Callable[[Any], str]) -> None:
+    """Invalidate ``key_for(instance)`` after commits that update or delete a ``model`` row"""
+
+    def collect(mapper, connection, target):
+        session = Session.object_session(target)
+        if session is not None:
+            session.info.setdefault(_PENDING_KEY, set()).add(key_for(target))
+
+    event.listen(model, "after_update", collect)
+    event.listen(model, "after_delete", collect)
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_invalidations(session: Session) -> None:
+    keys = session.info.pop(_PENDING_KEY, None)
+    if not keys:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Synchronous use (scripts, migrations): no loop to run the delete on
+        return
+    task = loop.create_task(invalidate_etags(keys))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
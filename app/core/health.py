@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+ProbeCheck = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class HealthProbe:
+    """A named dependency check with its own timeout"""
+
+    def __init__(self, name: str, check: ProbeCheck, timeout: float):
+        self.name = name
+        self.check = check
+        self.timeout = timeout
+
+
+class HealthMonitor:
+    """
+    Cached, concurrent dependency health checks.
+
+    Probes run concurrently, each bounded by its own timeout, and their results
+    are cached. A background refresher keeps the cache warm so health endpoints
+    answer from memory; if the cache is older than ``max_age`` (e.g. the
+    refresher is not running) the stale probes are refreshed on demand, with
+    concurrent callers sharing a single in-flight check per probe.
+
+    Blocking checks (boto3) run in worker threads. A timed-out check is reported
+    as an error immediately; its thread is left to finish in the background.
+    """
+
+    def __init__(self, max_age: float = 30.0, refresh_interval: float = 15.0):
+        self.max_age = max_age
+        self.refresh_interval = refresh_interval
+        self._probes: Dict[str, HealthProbe] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def register(self, name: str, check: ProbeCheck, timeout: Optional[float] = None) -> None:
+        """Register a probe; ``check`` returns a dict with at least a ``status`` key"""
+        self._probes[name] = HealthProbe(name, check, timeout or settings.health_probe_timeout)
+
+    @property
+    def probe_names(self) -> List[str]:
+        return list(self._probes)
+
+    async def _run_probe(self, probe: HealthProbe) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(probe.check(), timeout=probe.timeout)
+        except asyncio.TimeoutError:
+            result = {"status": "error", "error": f"timed out after {probe.timeout}s"}
+        except Exception as e:
+            result = {"status": "error", "error": str(e)}
+
+        result = dict(result)
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        result["checked_at"] = datetime.now(timezone.utc).isoformat()
+
+        if result.get("status") != "healthy" and self._results.get(probe.name, {}).get("status") == "healthy":
+            logger.warning(f"Health probe '{probe.name}' became {result.get('status')}: {result.get('error')}")
+
+        self._results[probe.name] = result
+        self._checked_at[probe.name] = time.monotonic()
+        return result
+
+    async def refresh_probe(self, name: str) -> Dict[str, Any]:
+        """Run one probe now, joining an in-flight run if there is one"""
+        task = self._inflight.get(name)
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._run_probe(self._probes[name]))
+            self._inflight[name] = task
+        return await asyncio.shield(task)
+
+    async def refresh(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Run probes concurrently and return their fresh results"""
+        names = list(names) if names is not None else self.probe_names
+        results = await asyncio.gather(*(self.refresh_probe(name) for name in names))
+        return dict(zip(names, results))
+
+    def is_stale(self, name: str) -> bool:
+        checked_at = self._checked_at.get(name)
+        return checked_at is None or time.monotonic() - checked_at > self.max_age
+
+    def cached_status(self, name: str) -> Optional[str]:
+        """Last known status of a probe without running it (None if never checked)"""
+        result = self._results.get(name)
+        return result.get("status") if result else None
+
+    async def get_results(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Cached probe results, refreshing only the probes that are stale"""
+        names = list(names) if names is not None else self.probe_names
+        stale = [name for name in names if self.is_stale(name)]
+        if stale:
+            await self.refresh(stale)
+        return {name: self._results[name] for name in names}
+
+    async def system_health(self) -> Dict[str, Any]:
+        """Overall health summary built from cached probe results"""
+        services = await self.get_results()
+        unhealthy = [name for name, result in services.items() if result.get("status") != "healthy"]
+        return {
+            "status": "degraded" if unhealthy else "healthy",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "services": services
+        }
+
+    async def run_refresher(self) -> None:
+        """Refresh every probe periodically; intended to run as a background task"""
+        if self.refresh_interval <= 0:
+            return
+
+        try:
+            while True:
+                try:
+                    await self.refresh()
+                except Exception as e:
+                    logger.error(f"Health refresh failed: {e}")
+                await asyncio.sleep(self.refresh_interval)
+        finally:
+            # In-flight probes are shielded from their callers; stop them with the refresher
+            inflight = [task for task in self._inflight.values() if not task.done()]
+            for task in inflight:
+                task.cancel()
+            await asyncio.gather(*inflight, return_exceptions=True)
+
+
+async def _check_database() -> Dict[str, Any]:
+    from app.database import DatabaseManager
+    return (await DatabaseManager.health_check())["database"]
+
+
+async def _check_redis() -> Dict[str, Any]:
+    from app.redis_client import check_redis_health
+    return (await check_redis_health())["redis"]
+
+
+async def _check_ses() -> Dict[str, Any]:
+    from app.core.aws import aws_manager
+    return await asyncio.to_thread(aws_manager.check_ses)
+
+
+async def _check_s3() -> Dict[str, Any]:
+    from app.core.aws import aws_manager
+    return await asyncio.to_thread(aws_manager.check_s3)
+
+
+# Global health monitor instance
+health_monitor = HealthMonitor(
+    max_age=settings.health_cache_max_age,
+    refresh_interval=settings.health_refresh_interval
+)
+health_monitor.register("database", _check_database)
+health_monitor.register("redis", _check_redis)
+health_monitor.register("ses", _check_ses)
+health_monitor.register("s3", _check_s3)
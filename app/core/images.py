@@ -0,0 +1,307 @@
+"""
+Image derivative pipeline for uploaded CMS images.
+
+Generates resized WebP/AVIF variants of uploaded JPG/PNG files and records
+them in a per-image variants manifest. The pipeline only depends on an
+``ObjectStore`` so the same code runs inside the S3-triggered Lambda, the
+local worker, and against a plain directory for local development and tests.
+
+This module deliberately does not import ``app.config`` so it can be packaged
+on its own for Lambda.
+"""
+
+import io
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SOURCE_EXTENSIONS = {"jpg", "jpeg", "png"}
+
+FORMAT_CONTENT_TYPES = {
+    "webp": "image/webp",
+    "avif": "image/avif",
+    "jpeg": "image/jpeg",
+}
+
+# Pillow feature names for each output format
+FORMAT_FEATURES = {
+    "webp": "webp",
+    "avif": "avif",
+    "jpeg": "jpg",
+}
+
+VARIANTS_PREFIX = "variants/"
+MANIFEST_NAME = "manifest.json"
+
+# Redis list the API pushes completed upload keys onto for the local worker
+IMAGE_VARIANTS_QUEUE = "image_variants:queue"
+
+
+class ObjectStore(ABC):
+    """Minimal object storage interface used by the pipeline"""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        ...
+
+    @abstractmethod
+    def put(self, key: str, data: bytes, content_type: str) -> None:
+        ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+
+class S3ObjectStore(ObjectStore):
+    """Object store backed by an S3 bucket"""
+
+    def __init__(self, bucket_name: str, client=None):
+        self.bucket_name = bucket_name
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            import boto3
+            self._client = boto3.client("s3")
+        return self._client
+
+    def get(self, key: str) -> bytes:
+        response = self.client.get_object(Bucket=self.bucket_name, Key=key)
+        return response["Body"].read()
+
+    def put(self, key: str, data: bytes, content_type: str) -> None:
+        self.client.put_object(
+            Bucket=self.bucket_name,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+            CacheControl="public, max-age=31536000, immutable",
+        )
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket_name, Key=key)
+            return True
+        except ClientError:
+            return False
+
+
+class LocalObjectStore(ObjectStore):
+    """Object store backed by a local directory (S3 stand-in for development and tests)"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"Key escapes store root: {key}")
+        return path
+
+    def get(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+    def put(self, key: str, data: bytes, content_type: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+
+def is_source_image(key: str) -> bool:
+    """Whether a key is an uploaded image the pipeline should process"""
+    return not key.startswith(VARIANTS_PREFIX) and key.rsplit(".", 1)[-1].lower() in SOURCE_EXTENSIONS
+
+
+def manifest_key(source_key: str) -> str:
+    """Key of the variants manifest for a source image"""
+    return f"{VARIANTS_PREFIX}{source_key}/{MANIFEST_NAME}"
+
+
+def render_variants(
+    data: bytes,
+    widths: Tuple[int, ...],
+    formats: Tuple[str, ...],
+    quality: int,
+) -> List[Dict[str, Any]]:
+    """
+    Decode an image once and encode every (width, format) variant.
+
+    CPU-bound; runs inside a worker process. Widths larger than the source are
+    skipped (the original width is used instead) so images are never upscaled.
+
+    Returns:
+        list of dicts with width, height, format and the encoded ``data``
+    """
+    from PIL import Image, ImageOps, features
+
+    with Image.open(io.BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source)
+        image.load()
+
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    targets = sorted({min(width, image.width) for width in widths})
+    encodable = [fmt for fmt in formats if fmt in FORMAT_FEATURES and features.check(FORMAT_FEATURES[fmt])]
+
+    variants = []
+    for width in targets:
+        if width == image.width:
+            resized = image
+        else:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+
+        for fmt in encodable:
+            buffer = io.BytesIO()
+            if fmt == "jpeg":
+                resized.convert("RGB").save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+            elif fmt == "webp":
+                resized.save(buffer, "WEBP", quality=quality, method=4)
+            else:
+                resized.save(buffer, "AVIF", quality=quality, speed=6)
+            variants.append({
+                "width": resized.width,
+                "height": resized.height,
+                "format": fmt,
+                "data": buffer.getvalue(),
+            })
+
+    return variants
+
+
+class InlineExecutor(Executor):
+    """
+    Executor that runs work in the calling thread.
+
+    Used on AWS Lambda, where multiprocessing primitives are unavailable
+    because there is no /dev/shm.
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+class ImageVariantPipeline:
+    """
+    Generates image variants for uploaded objects using a process pool.
+
+    Decoding and encoding run in worker processes so the event loop (or the
+    Lambda's main thread) only shuttles bytes to and from the object store.
+    """
+
+    def __init__(
+        self,
+        store: ObjectStore,
+        widths: Iterable[int] = (320, 640, 1280),
+        formats: Iterable[str] = ("webp", "avif"),
+        quality: int = 80,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.store = store
+        self.widths = tuple(widths)
+        self.formats = tuple(fmt.lower() for fmt in formats)
+        self.quality = quality
+        self.max_workers = max_workers
+        self._executor = executor
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers or os.cpu_count())
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Shut down the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _store_variants(self, source_key: str, variants: List[Dict[str, Any]]) -> Dict[str, Any]:
+        stem = source_key.rsplit(".", 1)[0].rsplit("/", 1)[-1]
+        entries = []
+        for variant in variants:
+            key = f"{VARIANTS_PREFIX}{source_key}/{stem}-{variant['width']}w.{variant['format']}"
+            content_type = FORMAT_CONTENT_TYPES[variant["format"]]
+            self.store.put(key, variant["data"], content_type)
+            entries.append({
+                "key": key,
+                "format": variant["format"],
+                "content_type": content_type,
+                "width": variant["width"],
+                "height": variant["height"],
+                "size": len(variant["data"]),
+            })
+
+        manifest = {
+            "source_key": source_key,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "variants": entries,
+        }
+        self.store.put(manifest_key(source_key), json.dumps(manifest).encode("utf-8"), "application/json")
+        return manifest
+
+    def process(self, source_key: str) -> Optional[Dict[str, Any]]:
+        """Generate variants for one object and write its manifest (blocking)"""
+        if not is_source_image(source_key):
+            logger.info(f"Skipping non-image object {source_key}")
+            return None
+
+        data = self.store.get(source_key)
+        future = self.executor.submit(render_variants, data, self.widths, self.formats, self.quality)
+        manifest = self._store_variants(source_key, future.result())
+
+        logger.info(f"Generated {len(manifest['variants'])} variants for {source_key}")
+        return manifest
+
+    def process_many(self, source_keys: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Generate variants for many objects, rendering them concurrently across the pool.
+        A key that cannot be read or rendered is logged and skipped; the rest still complete.
+        """
+        pending = []
+        for source_key in source_keys:
+            if not is_source_image(source_key):
+                continue
+            try:
+                data = self.store.get(source_key)
+                pending.append((
+                    source_key,
+                    self.executor.submit(render_variants, data, self.widths, self.formats, self.quality),
+                ))
+            except Exception as e:
+                logger.error(f"Failed to generate variants for {source_key}: {e}")
+
+        manifests = []
+        for source_key, future in pending:
+            try:
+                manifests.append(self._store_variants(source_key, future.result()))
+            except Exception as e:
+                logger.error(f"Failed to generate variants for {source_key}: {e}")
+        return manifests
+
+    def get_manifest(self, source_key: str) -> Optional[Dict[str, Any]]:
+        """Load the variants manifest for an object, if it has been generated"""
+        key = manifest_key(source_key)
+        if not self.store.exists(key):
+            return None
+        return json.loads(self.store.get(key))
@@ -0,0 +1,222 @@
+"""
+Event-loop stall detection.
+
+``LoopMonitor`` runs a heartbeat task on the event loop and a watchdog thread
+beside it. When the heartbeat is late by more than ``block_threshold_ms`` the
+watchdog captures the loop thread's stack *while it is still blocked*, so the
+report names the synchronous call that held the loop (boto3, Argon2, file
+I/O, ...), not just the fact that it happened. Stalls are logged (rate-limited
+per blocking location) and passed to hooks, which is how metrics see them.
+The heartbeat is the worker's only event-loop lag sampler: every beat's lag is
+passed to lag hooks, which is how readiness sees it.
+
+In debug mode ``detect_blocking_calls`` additionally wraps known-blocking
+functions and warns, once per call site, whenever one is called on the event
+loop thread.
+"""
+
+import asyncio
+import builtins
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Instrumentation wrappers are never the place to blame
+_SKIP_FILES = tuple(os.path.join(_APP_ROOT, "core", name) for name in ("loop_monitor.py", "timing.py"))
+
+StallHook = Callable[[float, str], None]
+LagHook = Callable[[float], None]
+
+
+def _blocking_location(stack: List[traceback.FrameSummary]) -> str:
+    """Innermost application frame of a stack, e.g. ``app/core/auth.py:42 hash_password``"""
+    for frame in reversed(stack):
+        if frame.filename.startswith(_APP_ROOT) and not frame.filename.startswith(_SKIP_FILES):
+            path = os.path.relpath(frame.filename, os.path.dirname(_APP_ROOT))
+            return f"{path}:{frame.lineno} {frame.name}"
+    for frame in reversed(stack):
+        if not frame.filename.startswith(_SKIP_FILES):
+            return f"{os.path.basename(frame.filename)}:{frame.lineno} {frame.name}"
+    return "unknown"
+
+
+class LoopMonitor:
+    """Heartbeat + watchdog thread reporting event-loop stalls with the blocking stack"""
+
+    def __init__(
+        self,
+        block_threshold_ms: float = 100.0,
+        heartbeat_interval_ms: float = 50.0,
+        report_cooldown: float = 60.0
+    ):
+        self.block_threshold = block_threshold_ms / 1000
+        self.heartbeat_interval = heartbeat_interval_ms / 1000
+        self.report_cooldown = report_cooldown
+
+        self.stalls = 0
+        self.max_stall_ms = 0.0
+        self._hooks: List[StallHook] = []
+        self._lag_hooks: List[LagHook] = []
+        self._last_beat = time.perf_counter()
+        self._loop_thread_id: Optional[int] = None
+        self._captured: Optional[List[traceback.FrameSummary]] = None
+        self._last_reported: Dict[str, float] = {}
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def add_stall_hook(self, hook: StallHook) -> None:
+        """Register ``hook(duration_seconds, location)``, called for every stall"""
+        self._hooks.append(hook)
+
+    def add_lag_hook(self, hook: LagHook) -> None:
+        """Register ``hook(lag_seconds)``, called on every heartbeat"""
+        self._lag_hooks.append(hook)
+
+    async def run(self) -> None:
+        """Heartbeat task; starts the watchdog thread for the running loop"""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+        try:
+            while True:
+                expected = time.perf_counter() + self.heartbeat_interval
+                await asyncio.sleep(self.heartbeat_interval)
+                now = time.perf_counter()
+                self._last_beat = now
+                lag = max(0.0, now - expected)
+                for hook in self._lag_hooks:
+                    try:
+                        hook(lag)
+                    except Exception as e:
+                        logger.debug(f"Lag hook failed: {e}")
+                if lag >= self.block_threshold:
+                    self._report(lag)
+        finally:
+            self._stop.set()
+
+    def _watch(self) -> None:
+        """Watchdog thread: snapshot the loop thread's stack while the heartbeat is overdue"""
+        check_interval = min(self.block_threshold, self.heartbeat_interval) / 2
+        while not self._stop.wait(check_interval):
+            overdue = time.perf_counter() - self._last_beat - self.heartbeat_interval
+            if overdue >= self.block_threshold and self._captured is None:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    self._captured = traceback.extract_stack(frame)
+
+    def _report(self, lag: float) -> None:
+        stack, self._captured = self._captured, None
+        location = _blocking_location(stack) if stack else "unknown"
+
+        self.stalls += 1
+        self.max_stall_ms = max(self.max_stall_ms, lag * 1000)
+        for hook in self._hooks:
+            try:
+                hook(lag, location)
+            except Exception as e:
+                logger.debug(f"Stall hook failed: {e}")
+
+        now = time.monotonic()
+        if now - self._last_reported.get(location, 0.0) < self.report_cooldown:
+            return
+        self._last_reported[location] = now
+
+        if stack:
+            logger.warning(
+                f"Event loop blocked for {lag * 1000:.0f}ms at {location}\n"
+                + "".join(traceback.format_list(stack))
+            )
+        else:
+            logger.warning(f"Event loop blocked for {lag * 1000:.0f}ms (stack not captured)")
+
+    def stats(self) -> Dict[str, float]:
+        return {"stalls": self.stalls, "max_stall_ms": round(self.max_stall_ms, 2)}
+
+
+# Known-blocking calls flagged in debug mode: (module, attribute path)
+KNOWN_BLOCKING_CALLS: Tuple[Tuple[str, str], ...] = (
+    ("time", "sleep"),
+    ("builtins", "print"),
+    ("botocore.client", "BaseClient._make_api_call"),
+    ("argon2", "PasswordHasher.hash"),
+    ("argon2", "PasswordHasher.verify"),
+    ("PIL.Image", "open"),
+)
+
+_flagged_sites: Set[Tuple[str, int]] = set()
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _call_site(frame) -> Tuple[str, int]:
+    """Innermost application frame calling into the library (or the direct caller)"""
+    caller = frame
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_ROOT) and not filename.startswith(_SKIP_FILES):
+            return frame.f_code.co_filename, frame.f_lineno
+        frame = frame.f_back
+    return caller.f_code.co_filename, caller.f_lineno
+
+
+def _guard(func: Callable, label: str) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _on_event_loop():
+            site = _call_site(sys._getframe(1))
+            if site not in _flagged_sites:
+                _flagged_sites.add(site)
+                logger.warning(
+                    f"Blocking call {label}() on the event loop at {site[0]}:{site[1]}; "
+                    f"use asyncio.to_thread or an async client"
+                )
+        return func(*args, **kwargs)
+
+    wrapper.__blocking_guard__ = True
+    return wrapper
+
+
+def detect_blocking_calls(calls: Tuple[Tuple[str, str], ...] = KNOWN_BLOCKING_CALLS) -> None:
+    """Wrap known-blocking functions to warn when called from the event loop (debug aid)"""
+    import importlib
+
+    for module_name, path in calls:
+        try:
+            owner = importlib.import_module(module_name)
+        except ImportError:
+            continue
+
+        *parents, attr = path.split(".")
+        for parent in parents:
+            owner = getattr(owner, parent)
+
+        func = getattr(owner, attr)
+        if getattr(func, "__blocking_guard__", False):
+            continue
+        setattr(owner, attr, _guard(func, f"{module_name}.{path}" if owner is not builtins else attr))
+
+
+# Global loop monitor instance
+loop_monitor = LoopMonitor(
+    block_threshold_ms=settings.loop_block_threshold_ms,
+    heartbeat_interval_ms=settings.loop_heartbeat_interval_ms
+)
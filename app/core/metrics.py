@@ -0,0 +1,206 @@
+"""
+Prometheus metrics.
+
+Request counts and latency histograms are labelled by route template (not raw
+path) and status. Dependency latencies come from the span API in
+``app.core.timing`` (db, redis, aws, hash), and gauges for DB connections,
+requests in flight and event-loop lag are sampled from the readiness monitor;
+event-loop stalls are counted by blocking location from the loop monitor.
+
+Under the multi-worker production server every worker writes its own
+memory-mapped metric files in PROMETHEUS_MULTIPROC_DIR and ``/metrics``
+aggregates them at scrape time.
+
+``/metrics`` answers only to clients in METRICS_ALLOWED_NETWORKS (loopback by
+default) or presenting ``Authorization: Bearer <METRICS_TOKEN>``.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import os
+import secrets
+from time import perf_counter_ns
+from typing import Optional
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+
+from app.config import settings
+from app.core.loop_monitor import loop_monitor
+from app.core.timing import add_span_hook
+
+logger = logging.getLogger(__name__)
+
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+DEPENDENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests handled",
+    ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"]
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled",
+    multiprocess_mode="livesum"
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement latency",
+    ["statement"],
+    buckets=DEPENDENCY_BUCKETS
+)
+DB_CONNECTIONS_IN_USE = Gauge(
+    "db_connections_in_use",
+    "Database connections checked out",
+    multiprocess_mode="livesum"
+)
+DB_CONNECT_SECONDS = Gauge(
+    "db_connect_seconds",
+    "Smoothed database connection acquisition time",
+    multiprocess_mode="livemax"
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Upstash Redis command latency",
+    ["command"],
+    buckets=DEPENDENCY_BUCKETS
+)
+AWS_CALL_DURATION = Histogram(
+    "aws_call_duration_seconds",
+    "AWS API call latency",
+    ["operation"],
+    buckets=DEPENDENCY_BUCKETS
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Argon2 hash/verify time",
+    ["operation"],
+    buckets=DEPENDENCY_BUCKETS
+)
+EVENT_LOOP_LAG = Gauge(
+    "event_loop_lag_seconds",
+    "Smoothed event-loop scheduling lag",
+    multiprocess_mode="livemax"
+)
+EVENT_LOOP_STALLS = Counter(
+    "event_loop_stalls_total",
+    "Event-loop stalls above the block threshold, by blocking code location",
+    ["location"]
+)
+EVENT_LOOP_STALL_DURATION = Histogram(
+    "event_loop_stall_seconds",
+    "Duration of event-loop stalls above the block threshold",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+_SPAN_HISTOGRAMS = {
+    "db": DB_QUERY_DURATION,
+    "redis": REDIS_COMMAND_DURATION,
+    "aws": AWS_CALL_DURATION,
+    "hash": PASSWORD_HASH_DURATION,
+}
+
+
+def _observe_span(phase: str, name: Optional[str], duration_ns: int) -> None:
+    histogram = _SPAN_HISTOGRAMS.get(phase)
+    if histogram is not None:
+        histogram.labels(name or "other").observe(duration_ns / 1e9)
+
+
+def _observe_stall(duration: float, location: str) -> None:
+    EVENT_LOOP_STALLS.labels(location).inc()
+    EVENT_LOOP_STALL_DURATION.observe(duration)
+
+
+add_span_hook(_observe_span)
+loop_monitor.add_stall_hook(_observe_stall)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request counts and latency per route template"""
+
+    def __init__(self, app, exclude_paths=("/metrics",)):
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter_ns()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # Route template (e.g. /api/users/{user_id}); unmatched paths share one label
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", "unmatched"), str(status_code))
+            HTTP_REQUESTS.labels(*labels).inc()
+            HTTP_REQUEST_DURATION.labels(*labels).observe((perf_counter_ns() - start) / 1e9)
+
+
+async def run_gauge_sampler(interval: float = 5.0) -> None:
+    """Copy readiness signals into gauges; intended to run as a background task"""
+    from app.core.readiness import readiness_monitor
+
+    while True:
+        DB_CONNECTIONS_IN_USE.set(readiness_monitor.db_connections_in_use)
+        DB_CONNECT_SECONDS.set(readiness_monitor.db_connect_ms / 1000)
+        EVENT_LOOP_LAG.set(readiness_monitor.loop_lag_ms / 1000)
+        await asyncio.sleep(interval)
+
+
+def metrics_access_allowed(client_host: Optional[str], authorization: Optional[str]) -> bool:
+    """Whether a scrape may read /metrics: bearer token match or client in an allowed network"""
+    if settings.metrics_token and authorization:
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer" and secrets.compare_digest(token.strip(), settings.metrics_token):
+            return True
+    if not client_host:
+        return False
+    try:
+        address = ipaddress.ip_address(client_host)
+    except ValueError:
+        return False
+    for network in settings.metrics_allowed_networks:
+        try:
+            if address in ipaddress.ip_network(network, strict=False):
+                return True
+        except ValueError:
+            logger.warning(f"Ignoring invalid METRICS_ALLOWED_NETWORKS entry: {network}")
+    return False
+
+
+def render_metrics() -> bytes:
+    """Exposition of all metrics, aggregated across worker processes when multiprocess mode is on"""
+    if os.environ.get(MULTIPROC_ENV):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
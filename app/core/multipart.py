@@ -0,0 +1,247 @@
+import asyncio
+import json
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.core.aws import get_s3_client
+from app.core.presign import get_s3_presigner
+from app.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# S3 multipart limits
+MIN_PART_SIZE = 5 * MB
+MAX_PART_SIZE = 5 * 1024 * MB
+MAX_PARTS = 10000
+
+
+class MultipartUploadError(Exception):
+    """Raised when a multipart upload request cannot be honoured"""
+
+
+class MultipartUploadManager:
+    """
+    S3 multipart upload orchestration.
+
+    The API creates, completes and aborts uploads; clients PUT the parts
+    directly to S3 (in parallel) using presigned part URLs. Every upload is
+    tracked in Redis so that part URLs are only signed for uploads this service
+    created, and stale incomplete uploads are aborted by ``cleanup_stale_uploads``.
+    """
+
+    KEY_PREFIX = "multipart_upload:"
+
+    def __init__(self, bucket_name: str):
+        self.bucket_name = bucket_name
+
+    @staticmethod
+    def compute_part_size(file_size: int, requested_part_size: Optional[int] = None) -> int:
+        """Pick a part size that respects S3 limits and keeps part count under 10,000"""
+        part_size = requested_part_size or settings.s3_multipart_part_size_mb * MB
+        part_size = max(part_size, MIN_PART_SIZE, math.ceil(file_size / MAX_PARTS))
+        return min(part_size, MAX_PART_SIZE)
+
+    def _tracking_ttl(self) -> int:
+        # Keep tracking data a little longer than the stale threshold so cleanup can see it
+        return (settings.s3_multipart_stale_after_hours + 1) * 3600
+
+    async def _get_tracked(self, upload_id: str, object_key: str) -> Dict[str, Any]:
+        data = await redis_client.get(f"{self.KEY_PREFIX}{upload_id}")
+        if not data:
+            raise MultipartUploadError("Unknown or expired upload")
+
+        tracked = json.loads(data)
+        if tracked.get("object_key") != object_key:
+            raise MultipartUploadError("Object key does not match upload")
+        return tracked
+
+    async def create_upload(
+        self,
+        object_key: str,
+        content_type: str,
+        file_size: int,
+        part_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Start a multipart upload and record it for tracking.
+
+        Returns:
+            dict with upload_id, object_key, part_size and part_count
+        """
+        if file_size > settings.s3_multipart_max_file_size_mb * MB:
+            raise MultipartUploadError(
+                f"File exceeds maximum size of {settings.s3_multipart_max_file_size_mb}MB"
+            )
+
+        part_size = self.compute_part_size(file_size, part_size)
+        part_count = max(1, math.ceil(file_size / part_size))
+
+        s3 = get_s3_client()
+        response = await asyncio.to_thread(
+            s3.create_multipart_upload,
+            Bucket=self.bucket_name,
+            Key=object_key,
+            ContentType=content_type
+        )
+        upload_id = response["UploadId"]
+
+        tracked = {
+            "upload_id": upload_id,
+            "object_key": object_key,
+            "content_type": content_type,
+            "file_size": file_size,
+            "part_size": part_size,
+            "part_count": part_count,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+        await redis_client.setex(
+            f"{self.KEY_PREFIX}{upload_id}",
+            self._tracking_ttl(),
+            json.dumps(tracked)
+        )
+
+        logger.info(f"Created multipart upload {upload_id} for {object_key} ({part_count} parts)")
+        return tracked
+
+    async def presign_parts(
+        self,
+        upload_id: str,
+        object_key: str,
+        part_numbers: List[int]
+    ) -> List[Dict[str, Any]]:
+        """Sign part upload URLs for a tracked upload"""
+        tracked = await self._get_tracked(upload_id, object_key)
+
+        invalid = [n for n in part_numbers if n < 1 or n > tracked["part_count"]]
+        if invalid:
+            raise MultipartUploadError(f"Invalid part numbers: {invalid}")
+
+        presigner = get_s3_presigner()
+        now = datetime.now(timezone.utc)
+        return [
+            {
+                "part_number": part_number,
+                "presigned_url": presigner.generate_presigned_url(
+                    self.bucket_name,
+                    object_key,
+                    method="PUT",
+                    expires_in=settings.s3_presigned_url_expiry,
+                    query_params={"partNumber": str(part_number), "uploadId": upload_id},
+                    now=now
+                )
+            }
+            for part_number in part_numbers
+        ]
+
+    async def complete_upload(
+        self,
+        upload_id: str,
+        object_key: str,
+        parts: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Complete a multipart upload.
+
+        Args:
+            parts: list of {"part_number": int, "etag": str} as returned by S3 for each part
+        """
+        await self._get_tracked(upload_id, object_key)
+
+        s3 = get_s3_client()
+        response = await asyncio.to_thread(
+            s3.complete_multipart_upload,
+            Bucket=self.bucket_name,
+            Key=object_key,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"PartNumber": part["part_number"], "ETag": part["etag"]}
+                    for part in sorted(parts, key=lambda p: p["part_number"])
+                ]
+            }
+        )
+        await redis_client.delete(f"{self.KEY_PREFIX}{upload_id}")
+
+        logger.info(f"Completed multipart upload {upload_id} for {object_key}")
+        return {
+            "object_key": object_key,
+            "location": response.get("Location"),
+            "etag": response.get("ETag")
+        }
+
+    async def abort_upload(self, upload_id: str, object_key: str) -> None:
+        """Abort a multipart upload and discard its uploaded parts"""
+        await self._get_tracked(upload_id, object_key)
+
+        s3 = get_s3_client()
+        await asyncio.to_thread(
+            s3.abort_multipart_upload,
+            Bucket=self.bucket_name,
+            Key=object_key,
+            UploadId=upload_id
+        )
+        await redis_client.delete(f"{self.KEY_PREFIX}{upload_id}")
+
+        logger.info(f"Aborted multipart upload {upload_id} for {object_key}")
+
+    def _list_stale_uploads(self, cutoff: datetime) -> List[Dict[str, Any]]:
+        s3 = get_s3_client()
+        paginator = s3.get_paginator("list_multipart_uploads")
+        stale = []
+        for page in paginator.paginate(Bucket=self.bucket_name):
+            for upload in page.get("Uploads", []):
+                if upload["Initiated"] < cutoff:
+                    stale.append({"upload_id": upload["UploadId"], "object_key": upload["Key"]})
+        return stale
+
+    async def cleanup_stale_uploads(self, max_age_hours: Optional[int] = None) -> int:
+        """
+        Abort incomplete uploads older than ``max_age_hours``.
+
+        S3 is used as the source of truth so uploads whose tracking entry has
+        already expired are cleaned up too.
+
+        Returns:
+            Number of uploads aborted
+        """
+        max_age_hours = max_age_hours or settings.s3_multipart_stale_after_hours
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
+
+        stale = await asyncio.to_thread(self._list_stale_uploads, cutoff)
+
+        s3 = get_s3_client()
+        aborted = 0
+        for upload in stale:
+            try:
+                await asyncio.to_thread(
+                    s3.abort_multipart_upload,
+                    Bucket=self.bucket_name,
+                    Key=upload["object_key"],
+                    UploadId=upload["upload_id"]
+                )
+                await redis_client.delete(f"{self.KEY_PREFIX}{upload['upload_id']}")
+                aborted += 1
+            except Exception as e:
+                logger.error(f"Failed to abort stale multipart upload {upload['upload_id']}: {e}")
+
+        if aborted:
+            logger.info(f"Aborted {aborted} stale multipart uploads")
+        return aborted
+
+    async def run_cleanup_loop(self) -> None:
+        """Periodically abort stale uploads; intended to run as a background task"""
+        interval = settings.s3_multipart_cleanup_interval_minutes * 60
+        if interval <= 0:
+            return
+
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.cleanup_stale_uploads()
+            except Exception as e:
+                logger.error(f"Multipart cleanup failed: {e}")
@@ -0,0 +1,108 @@
+"""
+Keyset pagination and cheap row-count estimates.
+
+Pages are addressed by an opaque cursor holding the sort key of the last row
+returned (sort column value plus ``id`` as the tiebreaker), so fetching page N
+is one index range scan of ``limit`` rows whatever N is, where ``OFFSET``
+reads and discards every earlier row. Cursors also carry the sort they were
+issued for; replaying one against a different sort, or one whose value is not
+of the sort column's type, is rejected.
+
+Totals come from the planner (``pg_class.reltuples`` for the whole table, the
+``EXPLAIN`` row estimate when filtered) instead of ``COUNT(*)``, which scans.
+Small results are counted exactly, since that is cheap and estimates there are
+noisiest.
+"""
+
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, func, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Below this many estimated rows an exact COUNT(*) is cheap enough
+EXACT_COUNT_THRESHOLD = 10000
+
+
+class InvalidCursorError(ValueError):
+    """Cursor is malformed or was issued for a different sort"""
+    pass
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, row_id: int) -> str:
+    """Opaque cursor for the row after which the next page starts"""
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    raw = json.dumps([sort_by, sort_order, value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str, value_type: type) -> Tuple[Any, int]:
+    """(sort value, id) of a cursor issued for this sort, whose column values are ``value_type``"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_order, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursorError("Malformed cursor")
+    if (cursor_sort, cursor_order) != (sort_by, sort_order):
+        raise InvalidCursorError("Cursor was issued for a different sort order")
+    if not isinstance(value, value_type) or not isinstance(row_id, int) or isinstance(row_id, bool):
+        raise InvalidCursorError("Malformed cursor")
+    return value, row_id
+
+
+def keyset_page(stmt: Select, column, id_column, sort_order: str, after: Optional[Tuple[Any, int]], limit: int) -> Select:
+    """
+    Order ``stmt`` by (column, id) and start after the ``after`` key.
+    Fetches ``limit + 1`` rows; the extra row only signals that a next page exists.
+    """
+    key = tuple_(column, id_column)
+    if sort_order == "desc":
+        if after is not None:
+            stmt = stmt.where(key < tuple_(*after))
+        stmt = stmt.order_by(column.desc(), id_column.desc())
+    else:
+        if after is not None:
+            stmt = stmt.where(key > tuple_(*after))
+        stmt = stmt.order_by(column.asc(), id_column.asc())
+    return stmt.limit(limit + 1)
+
+
+async def estimate_count(db: AsyncSession, table_name: str, filtered: Optional[Select] = None) -> Tuple[int, bool]:
+    """
+    (row count, is_estimate) for a table, or for the rows ``filtered`` selects.
+    Estimates come from planner statistics; small counts are made exact.
+    """
+    if filtered is None:
+        result = await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": table_name},
+        )
+        estimate = result.scalar()
+    else:
+        compiled = filtered.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = plan[0]["Plan"]["Plan Rows"]
+
+    # reltuples is -1 (or 0) until the table has been vacuumed/analyzed
+    if estimate is None or estimate < EXACT_COUNT_THRESHOLD:
+        base = filtered if filtered is not None else select(text("1")).select_from(text(table_name))
+        exact = await db.execute(select(func.count()).select_from(base.order_by(None).subquery()))
+        return exact.scalar_one(), False
+    return int(estimate), True
+
+
+def split_page(rows: Sequence[Any], limit: int) -> Tuple[Sequence[Any], bool]:
+    """(rows of this page, has_next) from a ``limit + 1`` fetch"""
+    return rows[:limit], len(rows) > limit
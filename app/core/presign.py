@@ -0,0 +1,243 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+ALGORITHM = "AWS4-HMAC-SHA256"
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+
+
+def _uri_encode(value: str, safe: str = "-_.~") -> str:
+    """URI-encode a value the way SigV4 expects (RFC 3986 unreserved only)"""
+    return quote(value, safe=safe)
+
+
+class S3Presigner:
+    """
+    Local SigV4 query-string signer for S3 presigned URLs.
+
+    Produces the same URLs as boto3's ``generate_presigned_url`` but without
+    building a request object per call: credentials are resolved once and the
+    derived signing key is cached per UTC date, so each signature is a handful
+    of HMAC-SHA256 operations.
+    """
+
+    def __init__(
+        self,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        region: Optional[str] = None,
+        session_token: Optional[str] = None,
+    ):
+        self.access_key_id = access_key_id or settings.aws_access_key_id
+        self.secret_access_key = secret_access_key or settings.aws_secret_access_key
+        self.region = region or settings.aws_region
+        self.session_token = session_token
+        self.service = "s3"
+        self._signing_key: Optional[Tuple[str, bytes]] = None
+
+    def _get_signing_key(self, date_stamp: str) -> bytes:
+        """Derive (or reuse) the SigV4 signing key for a UTC date"""
+        cached = self._signing_key
+        if cached and cached[0] == date_stamp:
+            return cached[1]
+
+        key = ("AWS4" + self.secret_access_key).encode("utf-8")
+        for part in (date_stamp, self.region, self.service, "aws4_request"):
+            key = hmac.new(key, part.encode("utf-8"), hashlib.sha256).digest()
+
+        self._signing_key = (date_stamp, key)
+        return key
+
+    def host_for(self, bucket_name: str) -> str:
+        """Virtual-hosted style S3 host for a bucket"""
+        return f"{bucket_name}.s3.{self.region}.amazonaws.com"
+
+    def generate_presigned_url(
+        self,
+        bucket_name: str,
+        object_key: str,
+        method: str = "PUT",
+        expires_in: int = 3600,
+        content_type: Optional[str] = None,
+        query_params: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        now: Optional[datetime] = None,
+    ) -> str:
+        """
+        Generate a presigned URL for a single S3 object.
+
+        Args:
+            bucket_name: Name of the S3 bucket
+            object_key: Key of the object
+            method: HTTP method the URL is valid for (PUT, GET, ...)
+            expires_in: Time in seconds for the URL to remain valid
+            content_type: If given, the client must send this Content-Type
+            query_params: Extra signed query parameters (e.g. partNumber, uploadId)
+            headers: Extra headers the client must send with exactly these values
+                (e.g. Content-Length, x-amz-checksum-sha256)
+            now: Signing time (defaults to current UTC time)
+
+        Returns:
+            Presigned URL string
+        """
+        now = now or datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date_stamp = amz_date[:8]
+
+        host = self.host_for(bucket_name)
+        canonical_uri = "/" + _uri_encode(object_key, safe="/-_.~")
+        scope = f"{date_stamp}/{self.region}/{self.service}/aws4_request"
+
+        header_values = {"host": host}
+        if content_type:
+            header_values["content-type"] = content_type
+        if headers:
+            header_values.update({name.lower(): str(value).strip() for name, value in headers.items()})
+
+        header_names = sorted(header_values)
+        signed_headers = ";".join(header_names)
+        canonical_headers = "".join(f"{name}:{header_values[name]}\n" for name in header_names)
+
+        query: Dict[str, str] = {
+            "X-Amz-Algorithm": ALGORITHM,
+            "X-Amz-Credential": f"{self.access_key_id}/{scope}",
+            "X-Amz-Date": amz_date,
+            "X-Amz-Expires": str(expires_in),
+            "X-Amz-SignedHeaders": signed_headers,
+        }
+        if self.session_token:
+            query["X-Amz-Security-Token"] = self.session_token
+        if query_params:
+            query.update(query_params)
+
+        canonical_query = "&".join(
+            f"{_uri_encode(k)}={_uri_encode(v)}" for k, v in sorted(query.items())
+        )
+
+        canonical_request = "\n".join((
+            method,
+            canonical_uri,
+            canonical_query,
+            canonical_headers,
+            signed_headers,
+            UNSIGNED_PAYLOAD,
+        ))
+
+        string_to_sign = "\n".join((
+            ALGORITHM,
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+        ))
+
+        signature = hmac.new(
+            self._get_signing_key(date_stamp),
+            string_to_sign.encode("utf-8"),
+            hashlib.sha256,
+        ).hexdigest()
+
+        return f"https://{host}{canonical_uri}?{canonical_query}&X-Amz-Signature={signature}"
+
+    def generate_presigned_urls(
+        self,
+        bucket_name: str,
+        objects: List[Tuple[str, Optional[str]]],
+        method: str = "PUT",
+        expires_in: int = 3600,
+    ) -> List[str]:
+        """
+        Sign many ``(object_key, content_type)`` pairs with a single timestamp.
+
+        All URLs in a batch share the same X-Amz-Date and therefore the same
+        signing key lookup.
+        """
+        now = datetime.now(timezone.utc)
+        return [
+            self.generate_presigned_url(
+                bucket_name,
+                object_key,
+                method=method,
+                expires_in=expires_in,
+                content_type=content_type,
+                now=now,
+            )
+            for object_key, content_type in objects
+        ]
+
+    def generate_presigned_post(
+        self,
+        bucket_name: str,
+        object_key: str,
+        key_prefix: str,
+        content_type: str,
+        max_content_length: int,
+        min_content_length: int = 1,
+        expires_in: int = 3600,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate a presigned POST policy for a browser form upload.
+
+        Unlike a presigned PUT, the policy is enforced by S3 itself: uploads
+        outside ``content-length-range``, with a different Content-Type, or
+        with a key outside ``key_prefix`` are rejected before they are stored.
+
+        Returns:
+            dict with the form ``url`` and the ``fields`` to submit with the file
+        """
+        now = now or datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date_stamp = amz_date[:8]
+        credential = f"{self.access_key_id}/{date_stamp}/{self.region}/{self.service}/aws4_request"
+
+        fields: Dict[str, str] = {
+            "key": object_key,
+            "Content-Type": content_type,
+            "x-amz-algorithm": ALGORITHM,
+            "x-amz-credential": credential,
+            "x-amz-date": amz_date,
+        }
+        if self.session_token:
+            fields["x-amz-security-token"] = self.session_token
+
+        conditions: List[Any] = [
+            {"bucket": bucket_name},
+            ["starts-with", "$key", key_prefix],
+            ["content-length-range", min_content_length, max_content_length],
+        ]
+        conditions.extend({name: value} for name, value in fields.items() if name != "key")
+
+        policy = {
+            "expiration": (now + timedelta(seconds=expires_in)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "conditions": conditions,
+        }
+        encoded_policy = base64.b64encode(
+            json.dumps(policy, separators=(",", ":")).encode("utf-8")
+        ).decode("utf-8")
+
+        fields["policy"] = encoded_policy
+        fields["x-amz-signature"] = hmac.new(
+            self._get_signing_key(date_stamp),
+            encoded_policy.encode("utf-8"),
+            hashlib.sha256,
+        ).hexdigest()
+
+        return {"url": f"https://{self.host_for(bucket_name)}/", "fields": fields}
+
+
+# Global presigner instance
+s3_presigner = S3Presigner()
+
+
+def get_s3_presigner() -> S3Presigner:
+    """Get the shared local S3 presigner"""
+    return s3_presigner
@@ -0,0 +1,274 @@
+"""
+On-demand sampling profiler for live workers.
+
+``SamplingProfiler`` samples the event-loop thread's stack from a helper thread
+(``sys._current_frames``) at a fixed interval for a bounded duration and folds
+the samples into collapsed stacks (``frame;frame;frame count``), the input
+format of flamegraph.pl and speedscope. Overhead is one stack walk per sample;
+nothing is installed in the profiled thread. Idle time spent waiting for I/O
+is dropped unless asked for: under asyncio that is the selector call; under
+uvloop, whose loop is C, it is any sample whose leaf is the frame that entered
+the loop (no Python callback running).
+
+Optionally a ``tracemalloc`` snapshot is taken at the start and end of the
+window and the top allocation growth is reported.
+
+To profile every worker of a server, a request file is dropped into the shared
+``profiler_dir``; each worker's ``ProfileCoordinator.run_watcher`` task picks
+it up, profiles itself and writes its result next to it.
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilerBusyError(Exception):
+    """A profile is already running in this worker"""
+
+
+@functools.lru_cache(maxsize=65536)
+def _frame_label(code) -> str:
+    # Cached per code object: the sys.path scan would otherwise run for every
+    # frame of every sample, holding the GIL the profiled thread needs
+    filename = code.co_filename
+    for prefix in sys.path:
+        if prefix and filename.startswith(prefix + os.sep):
+            filename = filename[len(prefix) + 1:]
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ",")
+
+
+_COROUTINE_FLAGS = inspect.CO_COROUTINE | inspect.CO_ITERABLE_COROUTINE | inspect.CO_ASYNC_GENERATOR | inspect.CO_GENERATOR
+
+
+def _loop_entry_frame():
+    """
+    Frame that entered the running event loop, if the loop is not pure Python
+    (uvloop): the first non-coroutine frame below the running task's coroutines.
+    While the loop waits for I/O this frame is the thread's leaf.
+    """
+    if type(asyncio.get_running_loop()).__module__.split(".")[0] != "uvloop":
+        return None
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_flags & _COROUTINE_FLAGS:
+        frame = frame.f_back
+    return frame
+
+
+def _is_idle(frame, loop_entry=None) -> bool:
+    """Leaf frame is the event loop waiting for I/O"""
+    if loop_entry is not None and frame is loop_entry:
+        return True
+    return frame.f_code.co_name in ("select", "poll") and frame.f_code.co_filename.endswith("selectors.py")
+
+
+class SamplingProfiler:
+    """Samples one thread's (or all threads') stacks into collapsed-stack counts"""
+
+    def __init__(self, interval: float = 0.01, max_depth: int = 128, include_idle: bool = False, loop_entry=None):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.include_idle = include_idle
+        self.loop_entry = loop_entry
+
+    def _fold(self, frame) -> Optional[str]:
+        if not self.include_idle and _is_idle(frame, self.loop_entry):
+            return None
+        labels: List[str] = []
+        while frame is not None and len(labels) < self.max_depth:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+    def run(self, duration: float, thread_id: Optional[int] = None) -> Tuple[Counter, int]:
+        """
+        Sample for ``duration`` seconds (blocking; call from a helper thread).
+        Returns (collapsed stack counts, samples taken). ``thread_id=None``
+        samples every thread except this one.
+        """
+        own_id = threading.get_ident()
+        stacks: Counter = Counter()
+        samples = 0
+        deadline = time.perf_counter() + duration
+
+        while time.perf_counter() < deadline:
+            frames = sys._current_frames()
+            if thread_id is not None:
+                targets = [frames[thread_id]] if thread_id in frames else []
+            else:
+                targets = [frame for ident, frame in frames.items() if ident != own_id]
+
+            for frame in targets:
+                folded = self._fold(frame)
+                if folded:
+                    stacks[folded] += 1
+            samples += 1
+            time.sleep(self.interval)
+
+        return stacks, samples
+
+
+def format_collapsed(stacks: Counter, root: Optional[str] = None) -> str:
+    """Collapsed-stack text (one ``stack count`` line per unique stack)"""
+    prefix = f"{root};" if root else ""
+    return "\n".join(f"{prefix}{stack} {count}" for stack, count in stacks.most_common()) + "\n"
+
+
+def _memory_diff(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int) -> List[Dict[str, Any]]:
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, __file__),
+    ]
+    stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    return [
+        {
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_diff_kb": round(stat.size_diff / 1024, 1),
+            "size_kb": round(stat.size / 1024, 1),
+            "count_diff": stat.count_diff,
+        }
+        for stat in stats[:limit]
+    ]
+
+
+def profile_worker(
+    duration: float,
+    interval: float,
+    thread_id: Optional[int],
+    trace_memory: bool = False,
+    memory_limit: int = 25,
+    loop_entry=None
+) -> Dict[str, Any]:
+    """
+    Profile this process (blocking); returns stacks, sample count and optional memory diff.
+    ``loop_entry`` is the profiled thread's idle leaf under uvloop (see ``_loop_entry_frame``).
+    """
+    started_tracing = False
+    before = None
+    if trace_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(settings.profiler_tracemalloc_frames)
+            started_tracing = True
+        before = tracemalloc.take_snapshot()
+
+    try:
+        stacks, samples = SamplingProfiler(interval=interval, loop_entry=loop_entry).run(duration, thread_id)
+        memory = _memory_diff(before, tracemalloc.take_snapshot(), memory_limit) if trace_memory else None
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    return {
+        "pid": os.getpid(),
+        "duration": duration,
+        "samples": samples,
+        "collapsed": format_collapsed(stacks),
+        "memory": memory,
+    }
+
+
+class ProfileCoordinator:
+    """Runs profiles in this worker, or in every worker sharing ``directory``"""
+
+    REQUEST_SUFFIX = ".request.json"
+
+    def __init__(self, directory: str, poll_interval: float = 1.0):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self._lock = asyncio.Lock()
+        self._seen: set = set()
+
+    async def profile_self(self, duration: float, interval: float, trace_memory: bool = False) -> Dict[str, Any]:
+        """Profile this worker's event-loop thread"""
+        if self._lock.locked():
+            raise ProfilerBusyError("A profile is already running in this worker")
+        async with self._lock:
+            return await asyncio.to_thread(
+                profile_worker, duration, interval, threading.get_ident(), trace_memory, loop_entry=_loop_entry_frame()
+            )
+
+    async def profile_all(self, duration: float, interval: float, trace_memory: bool = False) -> List[Dict[str, Any]]:
+        """Ask every worker (including this one) to profile itself; gathers their results"""
+        os.makedirs(self.directory, exist_ok=True)
+        request_id = uuid.uuid4().hex
+        request = {"id": request_id, "created_at": time.time(), "duration": duration,
+                   "interval": interval, "trace_memory": trace_memory}
+        request_path = os.path.join(self.directory, request_id + self.REQUEST_SUFFIX)
+        with open(request_path, "w") as f:
+            json.dump(request, f)
+
+        # Every watcher notices within one poll interval, then profiles for `duration`
+        await asyncio.sleep(duration + 2 * self.poll_interval + 1.0)
+
+        results = []
+        try:
+            for name in os.listdir(self.directory):
+                if name.startswith(request_id + ".") and name.endswith(".result.json"):
+                    path = os.path.join(self.directory, name)
+                    with open(path) as f:
+                        results.append(json.load(f))
+                    os.remove(path)
+        finally:
+            os.remove(request_path)
+        return sorted(results, key=lambda r: r["pid"])
+
+    def _pending_requests(self) -> List[Dict[str, Any]]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+
+        self._seen &= set(names)
+        pending = []
+        for name in names:
+            if not name.endswith(self.REQUEST_SUFFIX) or name in self._seen:
+                continue
+            self._seen.add(name)
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    request = json.load(f)
+            except (OSError, ValueError):
+                continue
+            # Requests that ended before this worker saw them are stale
+            if time.time() - request["created_at"] < request["duration"]:
+                pending.append(request)
+        return pending
+
+    async def run_watcher(self) -> None:
+        """Pick up all-worker profile requests; intended to run as a background task"""
+        while True:
+            for request in self._pending_requests():
+                try:
+                    result = await self.profile_self(request["duration"], request["interval"], request["trace_memory"])
+                except ProfilerBusyError:
+                    # Report the worker as skipped so the combined profile is not mistaken for complete
+                    result = {"pid": os.getpid(), "busy": True, "duration": request["duration"],
+                              "samples": 0, "collapsed": "", "memory": None}
+                except Exception as e:
+                    logger.error(f"Profile request {request['id']} failed: {e}")
+                    continue
+
+                path = os.path.join(self.directory, f"{request['id']}.{os.getpid()}.result.json")
+                with open(path, "w") as f:
+                    json.dump(result, f)
+            await asyncio.sleep(self.poll_interval)
+
+
+# Global profile coordinator instance
+profile_coordinator = ProfileCoordinator(settings.profiler_dir)
@@ -0,0 +1,177 @@
+import logging
+import time
+from typing import Any, Dict, Optional, Set
+
+from app.config import settings
+from app.core.loop_monitor import loop_monitor
+
+logger = logging.getLogger(__name__)
+
+
+class ReadinessMonitor:
+    """
+    Liveness, startup and load-aware readiness state for this worker.
+
+    Readiness is computed from live in-process signals only (no I/O), so the
+    load balancer can poll it cheaply:
+
+    - event-loop lag, fed by the loop monitor's heartbeat
+    - database connection acquisition time and connections in use
+    - requests in flight (the worker's queue depth)
+    - cached database/Redis probe status from the health monitor
+
+    Each limit has hysteresis: a signal marks the worker overloaded when it
+    reaches its limit and clears only once it falls below
+    ``limit * recover_ratio``, so a node drains under load and rejoins after
+    it has recovered instead of flapping.
+    """
+
+    EWMA_ALPHA = 0.3
+
+    def __init__(
+        self,
+        max_loop_lag_ms: float = 250.0,
+        max_db_connect_ms: float = 1000.0,
+        max_db_connections: int = 50,
+        max_in_flight: int = 200,
+        recover_ratio: float = 0.7
+    ):
+        self.limits = {
+            "loop_lag_ms": max_loop_lag_ms,
+            "db_connect_ms": max_db_connect_ms,
+            "db_connections_in_use": max_db_connections,
+            "requests_in_flight": max_in_flight,
+        }
+        self.recover_ratio = recover_ratio
+
+        self.started = False
+        self.started_at: Optional[float] = None
+        self.loop_lag_ms = 0.0
+        self.db_connect_ms = 0.0
+        self.db_connections_in_use = 0
+        self.requests_in_flight = 0
+        self._overloaded: Set[str] = set()
+
+    def _ewma(self, current: float, sample: float) -> float:
+        return current + self.EWMA_ALPHA * (sample - current)
+
+    def mark_started(self) -> None:
+        """Called once application startup has completed"""
+        self.started = True
+        self.started_at = time.time()
+
+    # Request tracking
+
+    def request_started(self) -> None:
+        self.requests_in_flight += 1
+
+    def request_finished(self) -> None:
+        self.requests_in_flight -= 1
+
+    # Event-loop lag
+
+    def record_loop_lag(self, lag_ms: float) -> None:
+        """Record one event-loop lag sample (from the loop monitor heartbeat)"""
+        self.loop_lag_ms = self._ewma(self.loop_lag_ms, lag_ms)
+
+    # Database connections
+
+    def instrument_engine(self, engine) -> None:
+        """Track connection acquisition time and connections in use for an async engine"""
+        from sqlalchemy import event
+
+        sync_engine = engine.sync_engine
+
+        @event.listens_for(sync_engine, "do_connect")
+        def _before_connect(dialect, conn_rec, cargs, cparams):
+            conn_rec.info["connect_started"] = time.perf_counter()
+
+        @event.listens_for(sync_engine.pool, "connect")
+        def _on_connect(dbapi_connection, conn_rec):
+            started = conn_rec.info.pop("connect_started", None)
+            if started is not None:
+                self.db_connect_ms = self._ewma(self.db_connect_ms, (time.perf_counter() - started) * 1000)
+
+        @event.listens_for(sync_engine.pool, "checkout")
+        def _on_checkout(dbapi_connection, conn_rec, conn_proxy):
+            self.db_connections_in_use += 1
+
+        @event.listens_for(sync_engine.pool, "checkin")
+        def _on_checkin(dbapi_connection, conn_rec):
+            self.db_connections_in_use = max(0, self.db_connections_in_use - 1)
+
+    # Evaluation
+
+    def signals(self) -> Dict[str, float]:
+        return {
+            "loop_lag_ms": round(self.loop_lag_ms, 2),
+            "db_connect_ms": round(self.db_connect_ms, 2),
+            "db_connections_in_use": self.db_connections_in_use,
+            "requests_in_flight": self.requests_in_flight,
+        }
+
+    def _update_overload(self, signals: Dict[str, float]) -> None:
+        for name, limit in self.limits.items():
+            value = signals[name]
+            if value >= limit:
+                if name not in self._overloaded:
+                    logger.warning(f"Readiness: {name}={value} reached limit {limit}; draining")
+                self._overloaded.add(name)
+            elif name in self._overloaded and value < limit * self.recover_ratio:
+                logger.info(f"Readiness: {name}={value} recovered")
+                self._overloaded.discard(name)
+
+    def evaluate(self) -> Dict[str, Any]:
+        """Current readiness verdict with the signals and reasons behind it"""
+        from app.core.health import health_monitor
+
+        signals = self.signals()
+        self._update_overload(signals)
+
+        reasons = [f"{name} over limit" for name in sorted(self._overloaded)]
+        if not self.started:
+            reasons.insert(0, "startup not complete")
+        for dependency in ("database", "redis"):
+            status = health_monitor.cached_status(dependency)
+            if status is not None and status != "healthy":
+                reasons.append(f"{dependency} {status}")
+
+        return {
+            "status": "ready" if not reasons else "not_ready",
+            "ready": not reasons,
+            "reasons": reasons,
+            "signals": signals,
+            "limits": self.limits,
+        }
+
+
+class InFlightRequestMiddleware:
+    """ASGI middleware counting HTTP requests in flight for readiness"""
+
+    def __init__(self, app, monitor: "ReadinessMonitor"):
+        self.app = app
+        self.monitor = monitor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.monitor.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.monitor.request_finished()
+
+
+# Global readiness monitor instance
+readiness_monitor = ReadinessMonitor(
+    max_loop_lag_ms=settings.readiness_max_loop_lag_ms,
+    max_db_connect_ms=settings.readiness_max_db_connect_ms,
+    max_db_connections=settings.readiness_max_db_connections,
+    max_in_flight=settings.readiness_max_in_flight,
+    recover_ratio=settings.readiness_recover_ratio
+)
+
+# One event-loop sampler per worker: readiness reads the stall monitor's heartbeat
+loop_monitor.add_lag_hook(lambda lag: readiness_monitor.record_loop_lag(lag * 1000))
@@ -0,0 +1,106 @@
+"""
+JSON response classes.
+
+``FastJSONResponse`` is the application's default response class: orjson
+instead of the stdlib encoder, with rendering timed as the ``serialize`` phase.
+
+``ModelResponse`` is the fast path for endpoints returning a pydantic model:
+the already-validated model is encoded straight to bytes by a cached
+``TypeAdapter`` (camelCase aliases), skipping FastAPI's response-model
+re-validation, the intermediate dict and ``jsonable_encoder``. Endpoints keep
+``response_model=`` for the OpenAPI schema and ``return ModelResponse(model)``.
+
+``StaticResponse`` holds a constant body rendered once (at import, before
+workers fork) with a strong ETag and ``Cache-Control``; conditional requests
+get a bodiless 304. Large enough bodies are also precompressed once at maximum
+effort, so negotiation never compresses them per request.
+"""
+
+import hashlib
+from functools import lru_cache
+from typing import Any, Optional
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.compression import PrecompressedBody
+from app.core.timing import span
+
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson-rendered JSON response"""
+
+    def render(self, content: Any) -> bytes:
+        with span("serialize", "orjson"):
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(tp: Any) -> TypeAdapter:
+    """TypeAdapter for a type, built once (schema compilation is the expensive part)"""
+    return TypeAdapter(tp)
+
+
+def dump_json(value: Any, tp: Optional[Any] = None) -> bytes:
+    """Encode a validated value (model, list of models, ...) to camelCase JSON bytes"""
+    return get_type_adapter(tp or type(value)).dump_json(value, by_alias=True)
+
+
+class ModelResponse(Response):
+    """JSON response encoding a pydantic model (or ``tp``-typed value) directly to bytes"""
+
+    media_type = "application/json"
+
+    def __init__(self, content: Any, status_code: int = 200, tp: Optional[Any] = None, **kwargs):
+        self.tp = tp
+        super().__init__(content, status_code=status_code, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        with span("serialize", "pydantic"):
+            return dump_json(content, self.tp)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 prescribes for it)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class StaticResponse:
+    """Constant JSON body pre-rendered (and precompressed) to bytes, served with a strong ETag"""
+
+    def __init__(self, content: Any, max_age: int = 300, minimum_size: int = 1024):
+        self.body = orjson.dumps(content)
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self.headers = {
+            "ETag": self.etag,
+            "Cache-Control": f"public, max-age={max_age}",
+        }
+        self.encoded = PrecompressedBody(self.body, minimum_size)
+        if self.encoded.variants:
+            self.headers["Vary"] = "Accept-Encoding"
+
+    def respond(self, request: Request) -> Response:
+        """200 with the pre-rendered body, or 304 when the client already has it"""
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=self.headers)
+
+        encoding, body = self.encoded.select(request.headers.get("accept-encoding"))
+        if encoding is None:
+            return Response(body, media_type="application/json", headers=self.headers)
+        # Encoded bytes differ from the identity body: weak validator
+        headers = {**self.headers, "ETag": "W/" + self.etag, "Content-Encoding": encoding}
+        return Response(body, media_type="application/json", headers=headers)
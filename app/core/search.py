@@ -0,0 +1,125 @@
+"""
+User search over names and email, built for typeahead.
+
+Two stages, cheapest first:
+
+1. "Starts with" matches on "first last", "last first" and the email, each a
+   range scan of a C-collation expression index (``NAME_PREFIX_KEY`` etc.)
+   that returns rows already sorted and stops after ``limit`` rows, however
+   many users share the prefix. One round trip, sub-millisecond.
+2. Only when those do not fill the page: word-prefix matches anywhere in the
+   name or email (``doe jane``, ``example edu``) through the GIN index on the
+   generated ``users.search_vector``, ranked by ``ts_rank`` (name hits,
+   weight A, over email hits, weight B) plus a bonus for words matched in full.
+   Broad words can match most of the table, so at most ``candidate_limit``
+   matches are ranked.
+
+Results are ranked "first last" prefix, then "last first" prefix, then email
+prefix, then stage 2; alphabetical within the prefix tiers.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from sqlalchemy import Select, cast, func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import EMAIL_PREFIX_KEY, NAME_PREFIX_KEY, REVERSED_NAME_PREFIX_KEY, User
+
+MAX_SEARCH_WORDS = 8
+MAX_TERM_LENGTH = 100
+DEFAULT_CANDIDATE_LIMIT = 1000
+
+# Sorts after every character, so [prefix, prefix + _MAX_CHAR) covers all
+# strings starting with prefix (byte order, as the C collation compares)
+_MAX_CHAR = "\U0010ffff"
+
+# Same word boundaries as the search document (to_tsvector + email punctuation)
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def normalize_term(term: str) -> str:
+    """Lower-cased term with whitespace collapsed, as the prefix keys store names"""
+    return " ".join(term.lower().split())[:MAX_TERM_LENGTH]
+
+
+def search_words(term: str) -> List[str]:
+    """Lower-cased words of a search term (alphanumeric only, so safe in a tsquery)"""
+    return _WORD_RE.findall(term.lower())[:MAX_SEARCH_WORDS]
+
+
+def prefix_statement(term: str, limit: int) -> Select:
+    """Users whose name (either order) or email starts with ``term``, best tier first"""
+    prefix = normalize_term(term)
+    branches = []
+    for tier, key in enumerate((NAME_PREFIX_KEY, REVERSED_NAME_PREFIX_KEY, EMAIL_PREFIX_KEY)):
+        branches.append(
+            select(User.id, literal(tier).label("tier"), key.label("key"))
+            .where(key >= prefix, key < prefix + _MAX_CHAR)
+            .order_by(key)
+            .limit(limit)
+            .subquery()
+            .select()
+        )
+    matches = union_all(*branches).subquery()
+    return (
+        select(User)
+        .join(matches, User.id == matches.c.id)
+        .order_by(matches.c.tier, matches.c.key)
+    )
+
+
+def _tsquery(expression: str):
+    return func.to_tsquery(cast(literal("simple"), REGCONFIG), expression)
+
+
+def fulltext_statement(
+    term: str,
+    limit: int,
+    exclude: Optional[List[int]] = None,
+    candidate_limit: int = DEFAULT_CANDIDATE_LIMIT
+) -> Optional[Select]:
+    """Users matching every word of ``term`` as a prefix, best ranked first"""
+    words = search_words(term)
+    if not words:
+        return None
+
+    prefix_query = _tsquery(" & ".join(f"{word}:*" for word in words))
+    exact_query = _tsquery(" | ".join(words))
+
+    candidates = select(User.id, User.search_vector).where(User.search_vector.op("@@")(prefix_query))
+    if exclude:
+        candidates = candidates.where(User.id.notin_(exclude))
+    candidates = candidates.limit(candidate_limit).subquery()
+
+    rank = func.ts_rank(candidates.c.search_vector, prefix_query) + func.ts_rank(candidates.c.search_vector, exact_query)
+    ranked = (
+        select(candidates.c.id, rank.label("rank"))
+        .order_by(rank.desc(), candidates.c.id)
+        .limit(limit)
+        .subquery()
+    )
+    return (
+        select(User)
+        .join(ranked, User.id == ranked.c.id)
+        .order_by(ranked.c.rank.desc(), User.id)
+    )
+
+
+async def search_users(db: AsyncSession, term: str, limit: int = 10) -> List[User]:
+    """Users matching ``term``, best first (one query, two when prefixes do not fill the page)"""
+    if not normalize_term(term):
+        return []
+
+    found: Dict[int, User] = {}
+    for user in (await db.execute(prefix_statement(term, limit))).scalars():
+        found.setdefault(user.id, user)
+        if len(found) == limit:
+            return list(found.values())
+
+    statement = fulltext_statement(term, limit - len(found), exclude=list(found))
+    if statement is not None:
+        for user in (await db.execute(statement)).scalars():
+            found.setdefault(user.id, user)
+    return list(found.values())
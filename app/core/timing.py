@@ -0,0 +1,196 @@
+"""
+Per-request phase timing.
+
+A request-scoped accumulator lives in a context variable; any module can time
+work against it with the span API:
+
+    from app.core.timing import span, timed
+
+    with span("db", "SELECT"):
+        ...
+
+    @timed("hash")
+    def hash_password(...): ...
+
+Phases used across the app are ``db``, ``redis``, ``aws``, ``hash``,
+``serialize`` and ``compress``. ``ServerTimingMiddleware`` (pure ASGI) reports
+the per-phase totals in a ``Server-Timing`` response header. Outside a request
+spans cost two ``perf_counter_ns`` calls and are otherwise discarded.
+
+Other instrumentation (metrics, tracing) can observe every finished span
+through ``add_span_hook``.
+"""
+
+import functools
+import inspect
+import logging
+from contextvars import ContextVar
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Optional
+
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+PHASES = ("db", "redis", "aws", "hash", "serialize", "compress")
+
+# phase -> [total_ns, count] for the current request
+_request_timings: ContextVar[Optional[Dict[str, List[int]]]] = ContextVar("request_timings", default=None)
+
+SpanHook = Callable[[str, Optional[str], int], None]
+_span_hooks: List[SpanHook] = []
+
+
+def add_span_hook(hook: SpanHook) -> None:
+    """Register ``hook(phase, name, duration_ns)``, called for every finished span"""
+    _span_hooks.append(hook)
+
+
+def record(phase: str, duration_ns: int, name: Optional[str] = None) -> None:
+    """Record a finished span against the current request (if any)"""
+    timings = _request_timings.get()
+    if timings is not None:
+        entry = timings.get(phase)
+        if entry is None:
+            timings[phase] = [duration_ns, 1]
+        else:
+            entry[0] += duration_ns
+            entry[1] += 1
+
+    for hook in _span_hooks:
+        try:
+            hook(phase, name, duration_ns)
+        except Exception as e:
+            logger.debug(f"Span hook failed: {e}")
+
+
+class span:
+    """Context manager timing one unit of work in a phase"""
+
+    __slots__ = ("phase", "name", "_start")
+
+    def __init__(self, phase: str, name: Optional[str] = None):
+        self.phase = phase
+        self.name = name
+
+    def __enter__(self) -> "span":
+        self._start = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        record(self.phase, perf_counter_ns() - self._start, self.name)
+
+
+def timed(phase: str, name: Optional[str] = None) -> Callable:
+    """Decorator timing every call of a (sync or async) function as a span"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(phase, span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(phase, span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def current_timings() -> Optional[Dict[str, List[int]]]:
+    """Phase totals of the current request, or None outside a request"""
+    return _request_timings.get()
+
+
+def format_server_timing(timings: Dict[str, List[int]], total_ns: int) -> str:
+    """Server-Timing header value; durations in milliseconds"""
+    parts = [
+        f'{phase};dur={total / 1e6:.3f};desc="{count}x"'
+        for phase, (total, count) in timings.items()
+    ]
+    parts.append(f"total;dur={total_ns / 1e6:.3f}")
+    return ", ".join(parts)
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware timing each request with ``perf_counter_ns``.
+
+    Adds ``Server-Timing`` (per-phase breakdown plus total) and the legacy
+    ``X-Process-Time`` (seconds) headers. Spans finishing after the response
+    has started (streamed bodies) are not included.
+    """
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter_ns()
+        timings: Dict[str, List[int]] = {}
+        token = _request_timings.set(timings)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                total_ns = perf_counter_ns() - start
+                headers = MutableHeaders(scope=message)
+                if self.server_timing:
+                    headers.append("Server-Timing", format_server_timing(timings, total_ns))
+                headers.append("X-Process-Time", str(total_ns / 1e9))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_timings.reset(token)
+
+
+def instrument_engine(engine) -> None:
+    """Time every SQL statement of an (async) SQLAlchemy engine as a ``db`` span"""
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("span_starts", []).append(perf_counter_ns())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("span_starts")
+        if starts:
+            record("db", perf_counter_ns() - starts.pop(), statement.split(None, 1)[0].upper())
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(exception_context):
+        conn = exception_context.connection
+        starts = conn.info.get("span_starts") if conn is not None else None
+        if starts:
+            record("db", perf_counter_ns() - starts.pop(), "error")
+
+
+def instrument_boto3_client(client) -> None:
+    """Time every API call of a boto3 client as an ``aws`` span"""
+    service_name = client.meta.service_model.service_name
+
+    def _before_call(context: Dict[str, Any], model=None, **kwargs) -> None:
+        context["span_name"] = f"{service_name}.{model.name}" if model is not None else service_name
+        context["span_start"] = perf_counter_ns()
+
+    def _after_call(context: Dict[str, Any], **kwargs) -> None:
+        start = context.pop("span_start", None)
+        if start is not None:
+            record("aws", perf_counter_ns() - start, context.get("span_name"))
+
+    client.meta.events.register("before-call.*.*", _before_call)
+    client.meta.events.register("after-call.*.*", _after_call)
+    client.meta.events.register("after-call-error.*.*", _after_call)
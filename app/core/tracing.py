@@ -0,0 +1,309 @@
+"""
+OpenTelemetry tracing (optional; enabled with TRACING_ENABLED).
+
+Every request gets a server span (W3C ``traceparent`` is extracted from the
+request and echoed back as ``traceresponse``). Child spans for SQL statements,
+Upstash Redis commands, AWS calls and Argon2 hashing are built from the span
+API in ``app.core.timing``: each finished span becomes an OpenTelemetry span
+with the same start/end under the current request span.
+
+Sampling:
+
+- head: parent-based ratio sampling (TRACING_SAMPLE_RATIO); an upstream
+  decision in ``traceparent`` is honoured
+- tail: traces not selected at the head are still recorded in memory and kept
+  when the request fails (5xx/exception) or is slower than
+  TRACING_TAIL_LATENCY_MS; the rest are dropped when the request ends
+
+Exporters: ``otlp`` (OTLP/HTTP, e.g. the jaeger service in docker-compose),
+``console`` or ``memory`` (in-process collector stand-in, see
+``get_memory_exporter``).
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from opentelemetry import context as otel_context
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import (
+    Decision,
+    ParentBased,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
+from opentelemetry.trace import SpanKind, Status, StatusCode, TraceFlags
+
+from app.config import settings
+from app.core.timing import add_span_hook
+
+logger = logging.getLogger(__name__)
+
+# Span attributes per timing phase
+_PHASE_ATTRIBUTES = {
+    "db": {"db.system": "postgresql"},
+    "redis": {"db.system": "redis"},
+    "aws": {"rpc.system": "aws-api"},
+    "hash": {"code.namespace": "argon2"},
+    "serialize": {},
+}
+
+_tracer: Optional[trace.Tracer] = None
+_provider: Optional[TracerProvider] = None
+_memory_exporter: Optional[InMemorySpanExporter] = None
+
+
+class HeadTailSampler(Sampler):
+    """
+    Parent-based ratio sampler whose "drop" decisions become RECORD_ONLY, so
+    the tail sampler can still keep those traces after the fact.
+    """
+
+    def __init__(self, ratio: float, record_unsampled: bool = True):
+        self._head = ParentBased(root=TraceIdRatioBased(ratio))
+        self._record_unsampled = record_unsampled
+
+    def should_sample(self, parent_context, trace_id, name, kind=None, attributes=None, links=None, trace_state=None):
+        result = self._head.should_sample(parent_context, trace_id, name, kind, attributes, links, trace_state)
+        if result.decision == Decision.DROP and self._record_unsampled:
+            return SamplingResult(Decision.RECORD_ONLY, result.attributes, result.trace_state)
+        return result
+
+    def get_description(self) -> str:
+        return f"HeadTailSampler{{{self._head.get_description()}}}"
+
+
+class TailSamplingProcessor(SpanProcessor):
+    """
+    Forwards head-sampled spans to ``delegate`` immediately and buffers the
+    spans of unsampled traces until their local root span ends. The trace is
+    then forwarded (re-flagged as sampled) if the root failed or was slow, and
+    dropped otherwise. At most ``max_traces`` traces are buffered.
+    """
+
+    def __init__(self, delegate: SpanProcessor, latency_threshold_ms: float, max_traces: int = 1000):
+        self._delegate = delegate
+        self._threshold_ns = int(latency_threshold_ms * 1e6)
+        self._max_traces = max_traces
+        self._buffers: "OrderedDict[int, List[ReadableSpan]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def on_start(self, span, parent_context=None) -> None:
+        self._delegate.on_start(span, parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if span.context.trace_flags.sampled:
+            self._delegate.on_end(span)
+            return
+
+        trace_id = span.context.trace_id
+        is_local_root = span.parent is None or span.parent.is_remote
+
+        with self._lock:
+            spans = self._buffers.pop(trace_id, [])
+            spans.append(span)
+            if not is_local_root:
+                self._buffers[trace_id] = spans
+                while len(self._buffers) > self._max_traces:
+                    self._buffers.popitem(last=False)
+                return
+
+        if self._keep(span):
+            for buffered in spans:
+                self._delegate.on_end(_as_sampled(buffered))
+
+    def _keep(self, root: ReadableSpan) -> bool:
+        if root.status.status_code == StatusCode.ERROR:
+            return True
+        return (root.end_time - root.start_time) >= self._threshold_ns
+
+    def shutdown(self) -> None:
+        self._delegate.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._delegate.force_flush(timeout_millis)
+
+
+def _as_sampled(span: ReadableSpan) -> ReadableSpan:
+    """Copy of a recorded span flagged as sampled, so exporters accept it"""
+    ctx = span.context
+    sampled_ctx = trace.SpanContext(
+        ctx.trace_id, ctx.span_id, ctx.is_remote, TraceFlags(TraceFlags.SAMPLED), ctx.trace_state
+    )
+    return ReadableSpan(
+        name=span.name,
+        context=sampled_ctx,
+        parent=span.parent,
+        resource=span.resource,
+        attributes=span.attributes,
+        events=span.events,
+        links=span.links,
+        kind=span.kind,
+        status=span.status,
+        start_time=span.start_time,
+        end_time=span.end_time,
+        instrumentation_scope=span.instrumentation_scope,
+    )
+
+
+def _export_span(phase: str, name: Optional[str], duration_ns: int) -> None:
+    """Span hook: turn a finished timing span into a child of the current trace span"""
+    if _tracer is None or not trace.get_current_span().is_recording():
+        return
+
+    end = time.time_ns()
+    kind = SpanKind.INTERNAL if phase in ("hash", "serialize") else SpanKind.CLIENT
+    attributes = dict(_PHASE_ATTRIBUTES.get(phase, {}))
+    if name:
+        attributes["db.operation" if phase in ("db", "redis") else "code.function"] = name
+
+    otel_span = _tracer.start_span(
+        f"{phase} {name}" if name else phase,
+        kind=kind,
+        attributes=attributes,
+        start_time=end - duration_ns
+    )
+    if name == "error":
+        otel_span.set_status(Status(StatusCode.ERROR))
+    otel_span.end(end_time=end)
+
+
+def _inject_request_headers(request, **kwargs) -> None:
+    """boto3 ``before-send`` handler propagating the trace context to AWS"""
+    carrier: Dict[str, str] = {}
+    propagate.inject(carrier)
+    for key, value in carrier.items():
+        request.headers[key] = value
+
+
+def propagate_boto3_client(client) -> None:
+    """Send the W3C trace context with every request of a boto3 client"""
+    client.meta.events.register("before-send.*.*", _inject_request_headers)
+
+
+def _traceresponse(otel_span) -> Optional[str]:
+    ctx = otel_span.get_span_context()
+    if not ctx.is_valid:
+        return None
+    return f"00-{ctx.trace_id:032x}-{ctx.span_id:016x}-{int(ctx.trace_flags):02x}"
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware opening a server span per request"""
+
+    def __init__(self, app, exclude_paths=("/metrics", "/health/live", "/health/ready", "/health/startup")):
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths or _tracer is None:
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        parent = propagate.extract(carrier)
+        method = scope["method"]
+        otel_span = _tracer.start_span(
+            method,
+            context=parent,
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        )
+        token = otel_context.attach(trace.set_span_in_context(otel_span, parent))
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                traceresponse = _traceresponse(otel_span)
+                if traceresponse:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"traceresponse", traceresponse.encode("latin-1")))
+                    message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            otel_span.record_exception(e)
+            raise
+        finally:
+            route = scope.get("route")
+            if route is not None:
+                otel_span.update_name(f"{method} {route.path}")
+                otel_span.set_attribute("http.route", route.path)
+            otel_span.set_attribute("http.response.status_code", status_code)
+            if status_code >= 500:
+                otel_span.set_status(Status(StatusCode.ERROR))
+            otel_span.end()
+            otel_context.detach(token)
+
+
+def _make_exporter():
+    global _memory_exporter
+
+    if settings.tracing_exporter == "memory":
+        _memory_exporter = InMemorySpanExporter()
+        return SimpleSpanProcessor(_memory_exporter)
+    if settings.tracing_exporter == "console":
+        return SimpleSpanProcessor(ConsoleSpanExporter())
+
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    return BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint))
+
+
+def setup_tracing(app) -> None:
+    """Install the tracer provider, request middleware and span hook"""
+    global _tracer, _provider
+
+    tail_sampling = settings.tracing_tail_latency_ms > 0
+    processor = _make_exporter()
+    if tail_sampling:
+        processor = TailSamplingProcessor(
+            processor,
+            latency_threshold_ms=settings.tracing_tail_latency_ms,
+            max_traces=settings.tracing_tail_max_traces
+        )
+
+    _provider = TracerProvider(
+        resource=Resource.create({
+            "service.name": settings.project_name,
+            "service.version": settings.version,
+            "deployment.environment": settings.environment,
+        }),
+        sampler=HeadTailSampler(settings.tracing_sample_ratio, record_unsampled=tail_sampling),
+    )
+    _provider.add_span_processor(processor)
+    trace.set_tracer_provider(_provider)
+    _tracer = _provider.get_tracer("app")
+
+    add_span_hook(_export_span)
+    app.add_middleware(TracingMiddleware)
+
+    from app.core.aws import aws_manager
+    propagate_boto3_client(aws_manager.get_s3_client())
+    propagate_boto3_client(aws_manager.get_ses_client())
+
+    logger.info(
+        f"Tracing enabled: exporter={settings.tracing_exporter}, "
+        f"head ratio={settings.tracing_sample_ratio}, tail latency={settings.tracing_tail_latency_ms}ms"
+    )
+
+
+def shutdown_tracing() -> None:
+    """Flush and stop span export"""
+    if _provider is not None:
+        _provider.shutdown()
+
+
+def get_memory_exporter() -> Optional[InMemorySpanExporter]:
+    """Exporter holding finished spans when TRACING_EXPORTER=memory"""
+    return _memory_exporter
@@ -0,0 +1,413 @@
+"""
+Bulk user import from CSV or NDJSON files.
+
+Replaces one ``AuthManager.create_user`` call per account (a SELECT, a hash,
+an INSERT, a commit and a refresh each) with a batched pipeline:
+
+1. Records are streamed from the file and validated as ``UserImportRow``.
+2. Emails repeated in the file, and emails that already have an account
+   (one ``lower(email) = ANY($1)`` query per batch), are skipped before any
+   hashing. Both checks ignore case.
+3. Passwords are hashed with the application's Argon2 parameters across a
+   process pool; this is where nearly all of the time goes.
+4. The batch is ``COPY``-ed into a temporary staging table and moved into
+   ``users`` with ``INSERT ... ON CONFLICT (email) DO NOTHING``, so an account
+   created concurrently by a signup never fails the batch. One commit per batch.
+
+After each commit the byte offset of the last loaded record is written to a
+progress file; an interrupted import started again with the same progress file
+seeks straight past everything already loaded. Rows are loaded with ``COPY``,
+so ORM events do not fire; new accounts have nothing cached to invalidate and
+``search_vector`` is generated by Postgres.
+"""
+
+import asyncio
+import csv
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy import String, any_, literal, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.auth import password_hasher
+from app.models.user import EMAIL_PREFIX_KEY
+from app.schemas.user import UserImportRow
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = {"csv", "ndjson"}
+
+DEFAULT_BATCH_SIZE = 2000
+
+STAGE_TABLE = "user_import_stage"
+
+# Columns copied per row; the rest of users' NOT NULL columns are constant
+STAGE_COLUMNS = [
+    "uuid", "email", "first_name", "last_name", "hashed_password",
+    "is_active", "is_verified", "email_verified_at", "created_at",
+]
+
+CREATE_STAGE_SQL = text(f"""
+    CREATE TEMP TABLE IF NOT EXISTS {STAGE_TABLE} (
+        uuid uuid NOT NULL,
+        email varchar(255) NOT NULL,
+        first_name varchar(100) NOT NULL,
+        last_name varchar(100) NOT NULL,
+        hashed_password varchar(255) NOT NULL,
+        is_active boolean NOT NULL,
+        is_verified boolean NOT NULL,
+        email_verified_at timestamptz,
+        created_at timestamptz NOT NULL
+    ) ON COMMIT DELETE ROWS
+""")
+
+MOVE_STAGE_SQL = text(f"""
+    INSERT INTO users (uuid, email, first_name, last_name, hashed_password,
+                       is_active, is_verified, is_superuser, email_verified_at,
+                       login_count, created_at, updated_at)
+    SELECT uuid, email, first_name, last_name, hashed_password,
+           is_active, is_verified, false, email_verified_at,
+           0, created_at, created_at
+    FROM {STAGE_TABLE}
+    ON CONFLICT (email) DO NOTHING
+    RETURNING email
+""")
+
+
+
+class InvalidImportFileError(Exception):
+    """Import file (or its progress file) cannot be used"""
+
+
+def detect_format(path: str) -> str:
+    """Import format from the file extension (.csv, or .ndjson / .jsonl)"""
+    extension = path.rsplit(".", 1)[-1].lower()
+    if extension in ("ndjson", "jsonl"):
+        return "ndjson"
+    if extension == "csv":
+        return "csv"
+    raise InvalidImportFileError(f"Cannot tell the format of {path}; pass csv or ndjson explicitly")
+
+
+def email_key(email: str) -> str:
+    """Case-insensitive identity of an email, for duplicate checks"""
+    return email.lower()
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash a chunk of passwords (runs in a pool worker)"""
+    return [password_hasher.hash(password) for password in passwords]
+
+
+class ImportRecord:
+    """One record of an import file"""
+
+    __slots__ = ("line", "end_offset", "next_line", "data", "error")
+
+    def __init__(
+        self,
+        line: int,
+        end_offset: int,
+        next_line: int,
+        data: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ):
+        self.line = line
+        self.end_offset = end_offset
+        self.next_line = next_line
+        self.data = data
+        self.error = error
+
+
+def read_records(path: str, fmt: str, start_offset: int = 0, start_line: int = 1) -> Iterator[ImportRecord]:
+    """
+    Stream records from ``path``, starting at byte ``start_offset`` (a record
+    boundary recorded in a progress file, on line ``start_line``). Each record
+    carries the byte offset and line number just past it, so the import can
+    resume there.
+    """
+    with open(path, "rb") as f:
+        position = 0
+        line = 1
+        header: List[str] = []
+        if fmt == "csv":
+            header_line = f.readline()
+            header = next(csv.reader([header_line.decode("utf-8-sig")]), [])
+            position, line = len(header_line), 2
+            if not header:
+                raise InvalidImportFileError(f"{path} has no CSV header row")
+
+        if start_offset > position:
+            f.seek(start_offset)
+            position, line = start_offset, start_line
+
+        if fmt == "ndjson":
+            for raw in f:
+                position += len(raw)
+                line += 1
+                if not raw.strip():
+                    continue
+                try:
+                    data = orjson.loads(raw)
+                except orjson.JSONDecodeError as e:
+                    yield ImportRecord(line - 1, position, line, error=f"invalid JSON: {e}")
+                    continue
+                if not isinstance(data, dict):
+                    yield ImportRecord(line - 1, position, line, error="expected a JSON object")
+                    continue
+                yield ImportRecord(line - 1, position, line, data)
+            return
+
+        counter = {"position": position, "line": line}
+
+        def lines() -> Iterator[str]:
+            for raw in f:
+                counter["position"] += len(raw)
+                counter["line"] += 1
+                yield raw.decode("utf-8")
+
+        record_line = line
+        for values in csv.reader(lines()):
+            if any(value.strip() for value in values):
+                end = (counter["position"], counter["line"])
+                if len(values) > len(header):
+                    yield ImportRecord(record_line, *end, error=f"expected {len(header)} columns, got {len(values)}")
+                else:
+                    yield ImportRecord(record_line, *end, dict(zip(header, values)))
+            record_line = counter["line"]
+
+
+def validate_record(record: ImportRecord) -> Tuple[Optional[UserImportRow], Optional[str]]:
+    """Validated row, or the reason it was rejected"""
+    if record.error:
+        return None, record.error
+    # Empty CSV cells mean "not given", so optional columns fall back to their defaults
+    data = {key: value for key, value in record.data.items() if key and value not in ("", None)}
+    try:
+        return UserImportRow.model_validate(data), None
+    except ValidationError as e:
+        error = e.errors()[0]
+        field = ".".join(str(part) for part in error["loc"]) or "row"
+        return None, f"{field}: {error['msg']}"
+
+
+class ImportProgress:
+    """Counts and resume position of an import, persisted after every batch"""
+
+    FIELDS = ("offset", "line", "rows", "created", "existing", "duplicates", "invalid")
+
+    def __init__(self, source: str, size: int, **counts: int):
+        self.source = source
+        self.size = size
+        self.offset = counts.get("offset", 0)
+        self.line = counts.get("line", 1)
+        self.rows = counts.get("rows", 0)
+        self.created = counts.get("created", 0)
+        self.existing = counts.get("existing", 0)
+        self.duplicates = counts.get("duplicates", 0)
+        self.invalid = counts.get("invalid", 0)
+        self.completed = False
+
+    @classmethod
+    def load(cls, path: str, source: str, size: int) -> "ImportProgress":
+        """Progress saved for ``source``, or a fresh one when there is none"""
+        if not os.path.exists(path):
+            return cls(source, size)
+        with open(path, "rb") as f:
+            saved = orjson.loads(f.read())
+        if saved.get("source") != source or saved.get("size") != size:
+            raise InvalidImportFileError(
+                f"{path} belongs to {saved.get('source')} ({saved.get('size')} bytes), "
+                f"not {source} ({size} bytes); remove it to start over"
+            )
+        progress = cls(source, size, **{field: saved.get(field, 0) for field in cls.FIELDS})
+        progress.completed = bool(saved.get("completed"))
+        return progress
+
+    def save(self, path: str) -> None:
+        """Write atomically, so an interrupted write never loses the last checkpoint"""
+        data = {"source": self.source, "size": self.size, "completed": self.completed,
+                "updated_at": datetime.now(timezone.utc).isoformat()}
+        data.update({field: getattr(self, field) for field in self.FIELDS})
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        os.replace(temporary, path)
+
+    def summary(self) -> str:
+        return (f"{self.rows:,} rows: {self.created:,} created, {self.existing:,} already registered, "
+                f"{self.duplicates:,} duplicated in file, {self.invalid:,} invalid")
+
+
+class UserImporter:
+    """
+    Imports a CSV or NDJSON file of users in batches over one connection.
+
+    ``conn`` must not be in a transaction; the importer commits after every
+    batch. The worker pool is created on first use and shut down by
+    ``shutdown``.
+    """
+
+    def __init__(
+        self,
+        conn: AsyncConnection,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        rejects_path: Optional[str] = None,
+    ):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.rejects_path = rejects_path
+        self._executor = executor
+        self._seen_emails: set = set()
+        self._stage_created = False
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Shut down the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def _hash_all(self, passwords: List[str]) -> List[str]:
+        # A few chunks per worker keeps every process busy to the end of the batch
+        chunk_size = max(1, -(-len(passwords) // (self.max_workers * 4)))
+        chunks = [passwords[start:start + chunk_size] for start in range(0, len(passwords), chunk_size)]
+        results = await asyncio.gather(*(
+            asyncio.wrap_future(self.executor.submit(hash_passwords, chunk)) for chunk in chunks
+        ))
+        return [hashed for chunk in results for hashed in chunk]
+
+    async def _existing_emails(self, keys: List[str]) -> set:
+        # Matches lower(email) through the email prefix index (ix_users_email_prefix)
+        result = await self.conn.execute(
+            select(EMAIL_PREFIX_KEY).where(EMAIL_PREFIX_KEY == any_(literal(keys, ARRAY(String))))
+        )
+        return set(result.scalars())
+
+    async def _load_batch(self, batch: List[ImportRecord], progress: ImportProgress, rejects) -> None:
+        # Rejects and counts are only recorded once the batch has committed, so a
+        # batch that fails and is retried on resume is never reported twice
+        rejected: List[Tuple[int, Optional[str], str]] = []
+        counts = {"invalid": 0, "duplicates": 0, "existing": 0, "created": 0}
+        seen: set = set()
+
+        rows: List[Tuple[int, UserImportRow]] = []
+        for record in batch:
+            row, error = validate_record(record)
+            if error:
+                counts["invalid"] += 1
+                rejected.append((record.line, (record.data or {}).get("email"), error))
+                continue
+            key = email_key(row.email)
+            if key in self._seen_emails or key in seen:
+                counts["duplicates"] += 1
+                rejected.append((record.line, row.email, "duplicate email in file"))
+            else:
+                seen.add(key)
+                rows.append((record.line, row))
+
+        if rows:
+            existing = await self._existing_emails([email_key(row.email) for _, row in rows])
+            if existing:
+                for line, row in rows:
+                    if email_key(row.email) in existing:
+                        rejected.append((line, row.email, "email already registered"))
+                rows = [(line, row) for line, row in rows if email_key(row.email) not in existing]
+                counts["existing"] += len(existing)
+
+        if rows:
+            hashes = await self._hash_all([row.password for _, row in rows])
+            now = datetime.now(timezone.utc)
+            records = [
+                (uuid.uuid4(), row.email, row.first_name, row.last_name, hashed,
+                 row.is_active, row.is_verified, now if row.is_verified else None, now)
+                for (_, row), hashed in zip(rows, hashes)
+            ]
+            if not self._stage_created:
+                await self.conn.execute(CREATE_STAGE_SQL)
+                self._stage_created = True
+            raw = (await self.conn.get_raw_connection()).driver_connection
+            await raw.copy_records_to_table(STAGE_TABLE, records=records, columns=STAGE_COLUMNS)
+            created = set((await self.conn.execute(MOVE_STAGE_SQL)).scalars())
+            for line, row in rows:
+                if row.email not in created:
+                    # Registered by someone else since the existence check
+                    rejected.append((line, row.email, "email already registered"))
+            counts["created"] += len(created)
+            counts["existing"] += len(rows) - len(created)
+
+        await self.conn.commit()
+
+        self._seen_emails |= seen
+        for field, count in counts.items():
+            setattr(progress, field, getattr(progress, field) + count)
+        progress.rows += len(batch)
+        progress.offset = batch[-1].end_offset
+        progress.line = batch[-1].next_line
+        if rejects is not None and rejected:
+            rejects.write(b"".join(
+                orjson.dumps({"line": line, "email": email, "reason": reason}) + b"\n"
+                for line, email, reason in sorted(rejected, key=lambda entry: entry[0])
+            ))
+            rejects.flush()
+
+    async def run(self, path: str, fmt: Optional[str] = None, progress_path: Optional[str] = None) -> ImportProgress:
+        """Import ``path``, resuming from ``progress_path`` (default ``<path>.progress.json``)"""
+        fmt = fmt or detect_format(path)
+        if fmt not in SUPPORTED_FORMATS:
+            raise InvalidImportFileError(f"Unsupported import format {fmt!r}")
+        source = os.path.abspath(path)
+        size = os.path.getsize(source)
+        progress_path = progress_path or f"{path}.progress.json"
+
+        progress = ImportProgress.load(progress_path, source, size)
+        if progress.completed:
+            logger.info(f"{path} was already imported ({progress.summary()})")
+            return progress
+        if progress.offset:
+            logger.info(f"Resuming {path} at byte {progress.offset:,} (line {progress.line:,})")
+
+        rejects = open(self.rejects_path, "ab") if self.rejects_path else None
+        started = time.perf_counter()
+        started_rows = progress.rows
+        try:
+            batch: List[ImportRecord] = []
+            for record in read_records(source, fmt, progress.offset, progress.line):
+                batch.append(record)
+                if len(batch) < self.batch_size:
+                    continue
+                await self._load_batch(batch, progress, rejects)
+                progress.save(progress_path)
+                batch = []
+
+                rate = (progress.rows - started_rows) / (time.perf_counter() - started)
+                logger.info(f"{progress.offset / max(size, 1):6.1%} {progress.summary()} ({rate:,.0f} rows/s)")
+            if batch:
+                await self._load_batch(batch, progress, rejects)
+            progress.completed = True
+            progress.save(progress_path)
+        except BaseException:
+            await self.conn.rollback()
+            raise
+        finally:
+            if rejects is not None:
+                rejects.close()
+
+        logger.info(f"Imported {path} in {time.perf_counter() - started:.1f}s: {progress.summary()}")
+        return progress
@@ -1,11 +1,20 @@
 import re
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterable, Optional, Type
 from pydantic import BaseModel
 from pydantic.alias_generators import to_camel
 
+# Upper bound on memoized keys per direction; keys from request payloads are
+# untrusted, so the tables stop growing instead of evicting
+KEY_CACHE_SIZE = 4096
 
-def snake_to_camel(snake_str: str) -> str:
-    """Convert snake_case to camelCase"""
+_CAMEL_WORD = re.compile("(.)([A-Z][a-z]+)")
+_CAMEL_BOUNDARY = re.compile("([a-z0-9])([A-Z])")
+
+_camel_keys: Dict[str, str] = {}
+_snake_keys: Dict[str, str] = {}
+
+
+def _snake_to_camel(snake_str: str) -> str:
     if "_" not in snake_str:
         return snake_str
     
@@ -13,53 +22,93 @@ def snake_to_camel(snake_str: str) -> str:
     return components[0] + "".join(word.capitalize() for word in components[1:])
 
 
-def camel_to_snake(camel_str: str) -> str:
-    """Convert camelCase to snake_case"""
+def _camel_to_snake(camel_str: str) -> str:
     # Insert underscore before uppercase letters (except first letter)
-    s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", camel_str)
-    return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
+    s1 = _CAMEL_WORD.sub(r"\1_\2", camel_str)
+    return _CAMEL_BOUNDARY.sub(r"\1_\2", s1).lower()
 
 
-def convert_dict_keys_to_camel(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Convert all dictionary keys from snake_case to camelCase"""
+def snake_to_camel(snake_str: str) -> str:
+    """Convert snake_case to camelCase (memoized)"""
+    result = _camel_keys.get(snake_str)
+    if result is None:
+        result = _snake_to_camel(snake_str)
+        if len(_camel_keys) < KEY_CACHE_SIZE:
+            _camel_keys[snake_str] = result
+    return result
+
+
+def camel_to_snake(camel_str: str) -> str:
+    """Convert camelCase to snake_case (memoized)"""
+    result = _snake_keys.get(camel_str)
+    if result is None:
+        result = _camel_to_snake(camel_str)
+        if len(_snake_keys) < KEY_CACHE_SIZE:
+            _snake_keys[camel_str] = result
+    return result
+
+
+def _convert_keys(data: Dict[str, Any], convert: Callable[[str], str]) -> Dict[str, Any]:
+    """
+    Copy of a nested dict with every key converted. Iterative (explicit stack
+    instead of recursion); dicts nested in dicts or directly in lists are
+    converted, other values are shared, not copied.
+    """
     if not isinstance(data, dict):
         return data
     
-    result = {}
-    for key, value in data.items():
-        camel_key = snake_to_camel(key)
-        if isinstance(value, dict):
-            result[camel_key] = convert_dict_keys_to_camel(value)
-        elif isinstance(value, list):
-            result[camel_key] = [
-                convert_dict_keys_to_camel(item) if isinstance(item, dict) else item
-                for item in value
-            ]
-        else:
-            result[camel_key] = value
+    result: Dict[str, Any] = {}
+    stack = [(data, result)]
+    pop, push = stack.pop, stack.append
+    
+    while stack:
+        source, target = pop()
+        for key, value in source.items():
+            if isinstance(value, dict):
+                child: Dict[str, Any] = {}
+                push((value, child))
+                value = child
+            elif isinstance(value, list):
+                items = []
+                for item in value:
+                    if isinstance(item, dict):
+                        child = {}
+                        push((item, child))
+                        item = child
+                    items.append(item)
+                value = items
+            target[convert(key)] = value
     
     return result
 
 
+def convert_dict_keys_to_camel(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert all dictionary keys from snake_case to camelCase"""
+    return _convert_keys(data, snake_to_camel)
+
+
 def convert_dict_keys_to_snake(data: Dict[str, Any]) -> Dict[str, Any]:
     """Convert all dictionary keys from camelCase to snake_case"""
-    if not isinstance(data, dict):
-        return data
-    
-    result = {}
-    for key, value in data.items():
-        snake_key = camel_to_snake(key)
-        if isinstance(value, dict):
-            result[snake_key] = convert_dict_keys_to_snake(value)
-        elif isinstance(value, list):
-            result[snake_key] = [
-                convert_dict_keys_to_snake(item) if isinstance(item, dict) else item
-                for item in value
-            ]
-        else:
-            result[snake_key] = value
-    
-    return result
+    return _convert_keys(data, camel_to_snake)
+
+
+def _all_subclasses(cls: type) -> Iterable[type]:
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _all_subclasses(subclass)
+
+
+def seed_key_cache(models: Optional[Iterable[Type[BaseModel]]] = None) -> int:
+    """
+    Pre-populate the key conversion tables with the field names of every
+    CamelCaseModel (or of ``models``). Call once the schemas are imported.
+    Returns the number of memoized keys.
+    """
+    for model in models if models is not None else _all_subclasses(CamelCaseModel):
+        for name in model.model_fields:
+            camel = snake_to_camel(name)
+            camel_to_snake(camel)
+    return len(_camel_keys) + len(_snake_keys)
 
 
 class CamelCaseModel(BaseModel):
@@ -1,22 +1,34 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import time
 from typing import Dict, Any, Annotated
 
 # Import configuration and core modules
 from app.config import settings
-from app.database import init_db, close_db
+from app.database import engine, init_db, close_db
 from app.redis_client import close_redis
 
 # Import API routers
-from app.api import auth, email, upload
+from app.api import auth, email, upload, admin, users
 
 # Import health check dependencies
 from app.api.deps import check_system_health
+from app.core.health import health_monitor
+from app.core.readiness import readiness_monitor, InFlightRequestMiddleware
+from app.core.loop_monitor import loop_monitor, detect_blocking_calls
+from app.core.profiler import profile_coordinator
+from app.core.metrics import MetricsMiddleware, metrics_access_allowed, render_metrics, run_gauge_sampler
+from app.core.responses import FastJSONResponse, StaticResponse
+from app.core.etags import NotModifiedError
+from app.core.compression import CompressionMiddleware
+from app.core.utils import seed_key_cache
+from app.core.timing import ServerTimingMiddleware, instrument_engine
 
 # Configure logging
 logging.basicConfig(
@@ -72,11 +84,40 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to start application: {e}")
         raise
     
+    # Background cleanup of stale multipart uploads
+    multipart_cleanup_task = asyncio.create_task(upload.multipart_manager.run_cleanup_loop())
+    
+    # Keep the health cache warm so health endpoints answer from memory
+    health_refresh_task = asyncio.create_task(health_monitor.run_refresher())
+    
+    # Sample event-loop lag (for readiness) and report stalls with the stack of the blocking code
+    loop_monitor_task = asyncio.create_task(loop_monitor.run())
+    
+    # Answer all-worker profile requests from the admin profiler endpoint
+    profile_watch_task = asyncio.create_task(profile_coordinator.run_watcher()) if settings.profiler_enabled else None
+    
+    # Mirror readiness signals (connections, loop lag) into metrics gauges
+    metrics_gauge_task = asyncio.create_task(run_gauge_sampler()) if settings.metrics_enabled else None
+    readiness_monitor.mark_started()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Turtil Backend...")
     
+    background_tasks = [
+        task for task in (multipart_cleanup_task, health_refresh_task, loop_monitor_task, profile_watch_task, metrics_gauge_task)
+        if task is not None
+    ]
+    for task in background_tasks:
+        task.cancel()
+    # Let cancelled tasks finish their cleanup before the database and Redis are closed
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    
+    if settings.tracing_enabled:
+        from app.core.tracing import shutdown_tracing
+        shutdown_tracing()
+    
     try:
         await close_db()
         await close_redis()
@@ -93,6 +134,7 @@ app = FastAPI(
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
     openapi_url="/openapi.json" if settings.debug else None,
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
@@ -112,22 +154,47 @@ app.add_middleware(
 )
 
 
-# Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Add response time header"""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+# Track requests in flight and database connection usage for readiness
+app.add_middleware(InFlightRequestMiddleware, monitor=readiness_monitor)
+readiness_monitor.instrument_engine(engine)
+
+
+# Prometheus request counts and latency per route template
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+
+# gzip/brotli negotiation for larger bodies (inside timing, so it shows as "compress")
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality
+    )
+
+
+# Request timing middleware: Server-Timing breakdown of db/redis/aws/hash/serialize/compress
+app.add_middleware(ServerTimingMiddleware, server_timing=settings.server_timing_header)
+instrument_engine(engine)
+
+
+# Optional OpenTelemetry tracing (outermost, so the request span covers everything)
+if settings.tracing_enabled:
+    from app.core.tracing import setup_tracing
+    setup_tracing(app)
+
+
+# Debug aid: warn when known-blocking calls (boto3, Argon2, print, ...) run on the event loop
+if settings.debug:
+    detect_blocking_calls()
 
 
 # Global exception handler
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Global HTTP exception handler with camelCase response"""
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=exc.status_code,
         content={
             "statusCode": exc.status_code,
@@ -138,12 +205,18 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     )
 
 
+@app.exception_handler(NotModifiedError)
+async def not_modified_handler(request: Request, exc: NotModifiedError):
+    """Conditional GET short-circuit: bodiless 304"""
+    return exc.response()
+
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Global exception handler for unhandled exceptions"""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
     
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
         content={
             "statusCode": 500,
@@ -155,16 +228,18 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 
 # Health check endpoints
+ROOT_RESPONSE = StaticResponse({
+    "message": f"Welcome to {settings.project_name}",
+    "version": settings.version,
+    "environment": settings.environment,
+    "status": "healthy"
+}, max_age=settings.static_response_max_age, minimum_size=settings.compression_minimum_size)
+
+
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Root endpoint"""
-    return {
-        "message": f"Welcome to {settings.project_name}",
-        "version": settings.version,
-        "environment": settings.environment,
-        "status": "healthy",
-        "timestamp": time.time()
-    }
+    return ROOT_RESPONSE.respond(request)
 
 
 @app.get("/health")
@@ -175,7 +250,7 @@ async def health_check():
         return health_status
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=503,
             content={
                 "status": "unhealthy",
@@ -191,36 +266,82 @@ async def simple_health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe: the process is up and its event loop is responding"""
+    return {"status": "alive"}
+
+
+@app.get("/health/startup")
+async def startup_check():
+    """Startup probe: succeeds once startup has verified connections"""
+    if not readiness_monitor.started:
+        return FastJSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "started", "started_at": readiness_monitor.started_at}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """
+    Readiness probe for the load balancer.
+    Returns 503 while this worker is overloaded (event-loop lag, database connection
+    pressure, requests in flight) or its database/Redis probes are failing.
+    """
+    readiness = readiness_monitor.evaluate()
+    if not readiness["ready"]:
+        return FastJSONResponse(status_code=503, content=readiness)
+    return readiness
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus scrape endpoint (aggregated across workers in production; internal clients or token only)"""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    client_host = request.client.host if request.client else None
+    if not metrics_access_allowed(client_host, request.headers.get("authorization")):
+        raise HTTPException(status_code=404, detail="Not Found")
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
+INFO_RESPONSE = StaticResponse({
+    "name": settings.project_name,
+    "version": settings.version,
+    "environment": settings.environment,
+    "debug": settings.debug,
+    "features": {
+        "authentication": True,
+        "email_otp": True,
+        "file_upload": True,
+        "aws_integration": True,
+        "redis_caching": True,
+        "camelcase_api": True
+    },
+    "endpoints": {
+        "auth": "/api/auth",
+        "email": "/api/email", 
+        "upload": "/api/cms-image-upload",
+        "health": "/health",
+        "docs": "/docs" if settings.debug else "disabled"
+    }
+}, max_age=settings.static_response_max_age, minimum_size=settings.compression_minimum_size)
+
+
 @app.get("/info")
-async def app_info():
+async def app_info(request: Request):
     """Application information endpoint"""
-    return {
-        "name": settings.project_name,
-        "version": settings.version,
-        "environment": settings.environment,
-        "debug": settings.debug,
-        "features": {
-            "authentication": True,
-            "email_otp": True,
-            "file_upload": True,
-            "aws_integration": True,
-            "redis_caching": True,
-            "camelcase_api": True
-        },
-        "endpoints": {
-            "auth": "/api/auth",
-            "email": "/api/email", 
-            "upload": "/api/cms-image-upload",
-            "health": "/health",
-            "docs": "/docs" if settings.debug else "disabled"
-        }
-    }
+    return INFO_RESPONSE.respond(request)
 
 
 # Include API routers
 app.include_router(auth.router, prefix="/api")
 app.include_router(email.router, prefix="/api")
 app.include_router(upload.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
+app.include_router(users.router, prefix="/api")
+
+# Warm the camelCase/snake_case key tables with every schema field name
+seed_key_cache()
 
 
 # Rate limiting endpoint (for testing)
@@ -255,6 +376,8 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=settings.debug,
+        loop=settings.server_loop,
+        http=settings.server_http,
         log_level=settings.log_level.lower(),
         access_log=settings.debug
     )
\ No newline at end of file
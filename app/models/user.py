@@ -1,13 +1,30 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Integer
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, Index, Computed, func, literal_column
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import deferred
 from app.models.base import BaseModel
 import uuid
 from datetime import datetime, timezone
 
 
+# Search document: names weighted A, email split into words (local part and
+# domain) weighted B. 'simple' config: no stemming or stop words, so prefix
+# queries match names and email fragments as typed.
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce(first_name, '') || ' ' || coalesce(last_name, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, regexp_replace(coalesce(email, ''), '[@._+-]+', ' ', 'g')), 'B')"
+)
+
+
 class User(BaseModel):
     """User model for authentication and user management"""
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination: one index per sortable column, id as tiebreaker
+        # (email is unique, so its own index already orders (email, id))
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_last_name_id", "last_name", "id"),
+        Index("ix_users_search_vector", "search_vector", postgresql_using="gin"),
+    )
     
     # Use UUID as primary key for better security
     uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, index=True)
@@ -30,6 +47,9 @@ class User(BaseModel):
     last_login_at = Column(DateTime(timezone=True), nullable=True)
     login_count = Column(Integer, default=0, nullable=False)
     
+    # Full-text search document, maintained by Postgres (deferred: never needed in Python)
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)))
+    
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email})>"
     
@@ -48,34 +68,6 @@ class User(BaseModel):
         self.last_login_at = datetime.now(timezone.utc)
         self.login_count += 1
     
-    def to_dict(self, include_sensitive: bool = False) -> dict:
-        """
-        Convert to dictionary with camelCase for API responses.
-        Excludes sensitive information by default.
-        """
-        base_dict = super().to_dict()
-        result = {
-            "id": base_dict["id"],
-            "uuid": str(self.uuid),
-            "email": base_dict["email"],
-            "firstName": base_dict["first_name"],
-            "lastName": base_dict["last_name"],
-            "fullName": self.full_name,
-            "isActive": base_dict["is_active"],
-            "isVerified": base_dict["is_verified"],
-            "isSuperuser": base_dict["is_superuser"],
-            "emailVerifiedAt": base_dict["email_verified_at"],
-            "lastLoginAt": base_dict["last_login_at"],
-            "loginCount": base_dict["login_count"],
-            "createdAt": base_dict["created_at"],
-            "updatedAt": base_dict["updated_at"]
-        }
-        
-        if include_sensitive:
-            result["hashedPassword"] = base_dict["hashed_password"]
-        
-        return result
-    
     def to_token_payload(self) -> dict:
         """Create payload for JWT token"""
         return {
@@ -85,4 +77,22 @@ class User(BaseModel):
             "lastName": self.last_name,
             "isVerified": self.is_verified,
             "isSuperuser": self.is_superuser
-        }
\ No newline at end of file
+        }
+
+
+def prefix_key(expression):
+    """
+    Case-insensitive key in byte order (C collation): a prefix is one range of
+    its index, and the range comes out sorted, so LIMIT stops the scan early.
+    """
+    return func.lower(expression).collate("C")
+
+
+# Typeahead keys; queries must use these same expressions to hit the indexes
+NAME_PREFIX_KEY = prefix_key(User.first_name.concat(literal_column("' '")).concat(User.last_name))
+REVERSED_NAME_PREFIX_KEY = prefix_key(User.last_name.concat(literal_column("' '")).concat(User.first_name))
+EMAIL_PREFIX_KEY = prefix_key(User.email)
+
+Index("ix_users_name_prefix", NAME_PREFIX_KEY)
+Index("ix_users_reversed_name_prefix", REVERSED_NAME_PREFIX_KEY)
+Index("ix_users_email_prefix", EMAIL_PREFIX_KEY)
@@ -1,12 +1,21 @@
 import json
-from typing import Optional, Any, Dict, Union
+from typing import Optional, Any, Dict, List, Union
 from app.config import settings
 import logging
 from upstash_redis.asyncio import Redis
+from app.core.timing import span
 
 logger = logging.getLogger(__name__)
 
 
+class InstrumentedRedis(Redis):
+    """Upstash client timing every command as a ``redis`` span"""
+    
+    async def execute(self, command):
+        with span("redis", str(command[0]).upper()):
+            return await super().execute(command)
+
+
 class UpstashRedisClient:
     """
     Upstash Redis client wrapper using official upstash-redis package.
@@ -16,7 +25,7 @@ class UpstashRedisClient:
     def __init__(self, url: str = None, token: str = None):
         self.url = url or settings.upstash_redis_url
         self.token = token or settings.upstash_redis_token
-        self.client = Redis(url=self.url, token=self.token)
+        self.client = InstrumentedRedis(url=self.url, token=self.token)
     
     async def get(self, key: str) -> Optional[str]:
         """Get a value by key"""
@@ -35,6 +44,20 @@ class UpstashRedisClient:
         result = await self.client.delete(key)
         return result or 0
     
+    async def eval(self, script: str, keys: List[str], args: List[str]) -> Any:
+        """Run a Lua script atomically"""
+        return await self.client.eval(script, keys, args)
+    
+    async def eval_batched(self, script: str, keys: List[str], args: List[str], batch_size: int = 500) -> List[Any]:
+        """Run a multi-key Lua script over any number of keys in one round trip (pipelined EVAL per batch)"""
+        if not keys:
+            return []
+        pipeline = self.client.pipeline()
+        for start in range(0, len(keys), batch_size):
+            pipeline.eval(script, keys[start:start + batch_size], args)
+        with span("redis", "PIPELINE"):
+            return await pipeline.exec()
+    
     async def exists(self, key: str) -> bool:
         """Check if key exists"""
         result = await self.client.exists(key)
@@ -74,6 +97,11 @@ class UpstashRedisClient:
         """Get field from hash"""
         return await self.client.hget(key, field)
     
+    async def hmget(self, key: str, *fields: str) -> List[Optional[str]]:
+        """Get several fields from hash"""
+        result = await self.client.hmget(key, *fields)
+        return result or [None] * len(fields)
+    
     async def hgetall(self, key: str) -> Dict[str, str]:
         """Get all fields from hash"""
         result = await self.client.hgetall(key)
@@ -99,6 +127,15 @@ class UpstashRedisClient:
         result = await self.client.sismember(key, member)
         return result == 1
     
+    async def lpush(self, key: str, *values: str) -> int:
+        """Push values onto the head of a list"""
+        result = await self.client.lpush(key, *values)
+        return result or 0
+    
+    async def rpop(self, key: str) -> Optional[str]:
+        """Pop a value from the tail of a list"""
+        return await self.client.rpop(key)
+    
     async def ping(self) -> bool:
         """Ping Redis server"""
         try:
@@ -117,17 +154,69 @@ class UpstashRedisClient:
 redis_client = UpstashRedisClient()
 
 
+# Cached resources (e.g. the user cache, ``user:<uuid>``) are hashes: one field
+# per cached representation ("data", "etag", ...) plus a "version" that every
+# invalidation bumps. Writes of values computed from a database read name the
+# version seen before that read and are refused if it has changed since, so a
+# request that loaded a row just before an update cannot cache the old state.
+CACHE_VERSION_FIELD = "version"
+
+# Drop every cached field of each key, keeping only the bumped version
+INVALIDATE_SCRIPT = """
+for _, key in ipairs(KEYS) do
+    local version = redis.call('HINCRBY', key, 'version', 1)
+    redis.call('DEL', key)
+    redis.call('HSET', key, 'version', version)
+    redis.call('EXPIRE', key, ARGV[1])
+end
+return #KEYS
+"""
+
+# Set ARGV[2] = ARGV[3] only if the field is missing and the version is still ARGV[1]
+STORE_IF_VERSION_SCRIPT = """
+if (redis.call('HGET', KEYS[1], 'version') or '') ~= ARGV[1] then
+    return 0
+end
+if redis.call('HSETNX', KEYS[1], ARGV[2], ARGV[3]) == 0 then
+    return 0
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+
 # Cache utilities
 class CacheManager:
     """High-level cache management utilities"""
     
+    @staticmethod
+    async def get_cached_fields(key: str, *fields: str) -> Dict[str, Optional[str]]:
+        """Cached fields of a resource, with the version to pass to ``store_cached_field``"""
+        values = await redis_client.hmget(key, *fields, CACHE_VERSION_FIELD)
+        return dict(zip((*fields, CACHE_VERSION_FIELD), values))
+    
+    @staticmethod
+    async def store_cached_field(key: str, field: str, value: str, version: Optional[str], ttl: int = None) -> bool:
+        """Cache a field unless already set or the resource was invalidated since ``version`` was read"""
+        ttl = ttl or settings.redis_user_cache_ttl
+        result = await redis_client.eval(STORE_IF_VERSION_SCRIPT, [key], [version or "", field, value, str(ttl)])
+        return result == 1
+    
+    @staticmethod
+    async def invalidate_cached(keys: List[str], ttl: int = None) -> int:
+        """Invalidate many cached resources in one round trip"""
+        ttl = ttl or settings.redis_user_cache_ttl
+        results = await redis_client.eval_batched(INVALIDATE_SCRIPT, list(keys), [str(ttl)])
+        return sum(result or 0 for result in results)
+    
     @staticmethod
     async def cache_user(user_id: str, user_data: dict, ttl: int = None) -> bool:
         """Cache user data"""
         ttl = ttl or settings.redis_user_cache_ttl
         try:
-            data = json.dumps(user_data)
-            return await redis_client.setex(f"user:{user_id}", ttl, data)
+            key = f"user:{user_id}"
+            await redis_client.hset(key, "data", json.dumps(user_data))
+            return await redis_client.expire(key, ttl)
         except Exception as e:
             logger.error(f"Failed to cache user {user_id}: {e}")
             return False
@@ -136,7 +225,7 @@ class CacheManager:
     async def get_cached_user(user_id: str) -> Optional[dict]:
         """Get cached user data"""
         try:
-            data = await redis_client.get(f"user:{user_id}")
+            data = await redis_client.hget(f"user:{user_id}", "data")
             return json.loads(data) if data else None
         except Exception as e:
             logger.error(f"Failed to get cached user {user_id}: {e}")
@@ -146,8 +235,7 @@ class CacheManager:
     async def invalidate_user_cache(user_id: str) -> bool:
         """Remove user from cache"""
         try:
-            result = await redis_client.delete(f"user:{user_id}")
-            return result > 0
+            return await CacheManager.invalidate_cached([f"user:{user_id}"]) > 0
         except Exception as e:
             logger.error(f"Failed to invalidate user cache {user_id}: {e}")
             return False
@@ -1,9 +1,23 @@
 from pydantic import BaseModel, EmailStr, Field, field_validator
 from typing import Optional
 from datetime import datetime
+from uuid import UUID
 from app.core.utils import CamelCaseModel
 
 
+def check_password_complexity(v: str) -> str:
+    """Password rules for new accounts: 8+ characters with upper, lower and a digit"""
+    if len(v) < 8:
+        raise ValueError('Password must be at least 8 characters long')
+    if not any(c.isupper() for c in v):
+        raise ValueError('Password must contain at least one uppercase letter')
+    if not any(c.islower() for c in v):
+        raise ValueError('Password must contain at least one lowercase letter')
+    if not any(c.isdigit() for c in v):
+        raise ValueError('Password must contain at least one digit')
+    return v
+
+
 # Authentication request schemas
 
 class SignupInitRequest(CamelCaseModel):
@@ -17,15 +31,7 @@ class SignupInitRequest(CamelCaseModel):
     @classmethod
     def validate_password(cls, v):
         """Validate password strength"""
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        if not any(c.isupper() for c in v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        if not any(c.islower() for c in v):
-            raise ValueError('Password must contain at least one lowercase letter')
-        if not any(c.isdigit() for c in v):
-            raise ValueError('Password must contain at least one digit')
-        return v
+        return check_password_complexity(v)
 
 
 class SignupVerifyRequest(CamelCaseModel):
@@ -46,15 +52,7 @@ class UserRegisterRequest(CamelCaseModel):
     @classmethod
     def validate_password(cls, v):
         """Validate password strength"""
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        if not any(c.isupper() for c in v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        if not any(c.islower() for c in v):
-            raise ValueError('Password must contain at least one lowercase letter')
-        if not any(c.isdigit() for c in v):
-            raise ValueError('Password must contain at least one digit')
-        return v
+        return check_password_complexity(v)
 
 
 class UserLoginRequest(CamelCaseModel):
@@ -114,9 +112,14 @@ class TokenResponse(CamelCaseModel):
 
 
 class UserResponse(CamelCaseModel):
-    """User response schema for API responses"""
+    """
+    User response schema for API responses.
+    Validated straight from the ORM object: UserResponse.model_validate(user)
+    """
+    model_config = {**CamelCaseModel.model_config, "from_attributes": True}
+    
     id: int = Field(..., description="User ID")
-    uuid: str = Field(..., description="User UUID")
+    uuid: UUID = Field(..., description="User UUID")
     email: str = Field(..., description="User email")
     first_name: str = Field(..., description="User first name")
     last_name: str = Field(..., description="User last name")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import Dict, List, Optional
 from app.core.utils import CamelCaseModel
 
 
@@ -39,6 +39,7 @@ class PresignedUrlRequest(CamelCaseModel):
 class PresignedUrlBody(CamelCaseModel):
     """Body schema for presigned URL response"""
     presigned_url: str = Field(..., description="Pre-signed URL for upload")
+    object_key: str = Field(..., description="Object key the file will be stored under")
 
 
 class PresignedUrlResponse(CamelCaseModel):
@@ -48,6 +49,221 @@ class PresignedUrlResponse(CamelCaseModel):
     body: Optional[PresignedUrlBody] = Field(None, description="Response body with URL")
 
 
+class PresignedUrlBatchRequest(CamelCaseModel):
+    """Request schema for generating presigned URLs for many files at once"""
+    file_names: List[str] = Field(..., min_length=1, description="Names of the files to upload")
+
+
+class PresignedUrlBatchItem(CamelCaseModel):
+    """Single entry of a batch presigned URL response"""
+    file_name: str = Field(..., description="Name of the file")
+    object_key: Optional[str] = Field(None, description="Object key the file will be stored under")
+    presigned_url: Optional[str] = Field(None, description="Pre-signed URL for upload")
+    content_type: Optional[str] = Field(None, description="Content-Type the upload must be sent with")
+    error: Optional[str] = Field(None, description="Reason the file was rejected")
+
+
+class PresignedUrlBatchBody(CamelCaseModel):
+    """Body schema for batch presigned URL response"""
+    files: List[PresignedUrlBatchItem] = Field(..., description="Per-file presigned URLs")
+    expires_in: int = Field(..., description="URL validity in seconds")
+
+
+class PresignedUrlBatchResponse(CamelCaseModel):
+    """Response schema for batch presigned URL generation"""
+    status_code: int = Field(..., alias="statusCode", description="HTTP status code")
+    message: str = Field(..., description="Response message")
+    body: Optional[PresignedUrlBatchBody] = Field(None, description="Response body with URLs")
+
+
+class PresignedPostRequest(CamelCaseModel):
+    """Request schema for presigned POST policy generation"""
+    file_name: str = Field(..., description="Name of the file to upload")
+
+
+class PresignedPostBody(CamelCaseModel):
+    """Body schema for presigned POST policy response"""
+    url: str = Field(..., description="Form action URL")
+    fields: Dict[str, str] = Field(..., description="Form fields to submit before the file")
+    object_key: str = Field(..., description="Object key the file will be stored under")
+    max_file_size: int = Field(..., description="Maximum accepted file size in bytes")
+    expires_in: int = Field(..., description="Policy validity in seconds")
+
+
+class PresignedPostResponse(CamelCaseModel):
+    """Response schema for presigned POST policy generation"""
+    status_code: int = Field(..., alias="statusCode", description="HTTP status code")
+    message: str = Field(..., description="Response message")
+    body: Optional[PresignedPostBody] = Field(None, description="Response body with form URL and fields")
+
+
+class ContentAddressedUploadRequest(CamelCaseModel):
+    """Request schema for a content-addressed (deduplicated) upload"""
+    file_name: str = Field(..., description="Name of the file to upload (used for its type)")
+    sha256: str = Field(..., pattern=r"^[0-9a-fA-F]{64}$", description="Hex SHA-256 of the file content")
+    size: int = Field(..., gt=0, description="File size in bytes")
+
+
+class ContentAddressedUploadBody(CamelCaseModel):
+    """Body schema for content-addressed upload resolution"""
+    object_key: str = Field(..., description="Hash-derived object key")
+    url: str = Field(..., description="URL of the object once stored")
+    exists: bool = Field(..., description="Whether the content is already stored (no upload needed)")
+    content_type: str = Field(..., description="Content-Type of the object")
+    presigned_url: Optional[str] = Field(None, description="Pre-signed URL for upload, if the content is new")
+    headers: Optional[Dict[str, str]] = Field(None, description="Headers the upload must be sent with")
+    expires_in: Optional[int] = Field(None, description="URL validity in seconds")
+
+
+class ContentAddressedUploadResponse(CamelCaseModel):
+    """Response schema for content-addressed upload resolution"""
+    status_code: int = Field(..., alias="statusCode", description="HTTP status code")
+    message: str = Field(..., description="Response message")
+    body: Optional[ContentAddressedUploadBody] = Field(None, description="Existing object or upload URL")
+
+
+class DeliveryUrlsRequest(CamelCaseModel):
+    """Request schema for delivery URLs of stored objects"""
+    object_keys: List[str] = Field(..., min_length=1, description="Keys of the objects to serve")
+
+
+class DeliveryUrlsBody(CamelCaseModel):
+    """Body schema for delivery URLs"""
+    urls: Dict[str, str] = Field(..., description="Delivery URL per object key")
+    denied_keys: List[str] = Field(default=[], description="Requested keys outside the caller's own prefix")
+    expires_in: Optional[int] = Field(None, description="URL validity in seconds (signed URLs only)")
+
+
+class DeliveryUrlsResponse(CamelCaseModel):
+    """Response schema for delivery URLs"""
+    status_code: int = Field(..., alias="statusCode", description="HTTP status code")
+    message: str = Field(..., description="Response message")
+    body: Optional[DeliveryUrlsBody] = Field(None, description="Delivery URLs")
+
+
+# S3 Multipart Upload Schemas
+
+class MultipartCreateRequest(CamelCaseModel):
+    """Request schema for starting a multipart upload"""
+    file_name: str = Field(..., description="Name of the file to upload")
+    file_size: int = Field(..., gt=0, description="Total file size in bytes")
+    part_size: Optional[int] = Field(None, gt=0, description="Preferred part size in bytes")
+
+
+class MultipartCreateBody(CamelCaseModel):
+    """Body schema for multipart upload creation"""
+    upload_id: str = Field(..., description="S3 multipart upload ID")
+    object_key: str = Field(..., description="Object key being uploaded")
+    content_type: str = Field(..., description="Content-Type of the object")
+    part_size: int = Field(..., description="Part size in bytes (last part may be smaller)")
+    part_count: int = Field(..., description="Number of parts to upload")
+
+
+class MultipartCreateResponse(CamelCaseModel):
+    """Response schema for multipart upload creation"""
+    status_code: int = Field(..., alias="statusCode", description="HTTP status code")
+    message: str = Field(..., description="Response message")
+    body: Optional[MultipartCreateBody] = Field(None, description="Upload details")
+
+
+class MultipartPresignPartsRequest(CamelCaseModel):
+    """Request schema for presigning part upload URLs"""
+    upload_id: str = Field(..., description="S3 multipart upload ID")
+    object_key: str = Field(..., description="Object key being uploaded")
+    part_numbers: List[int] = Field(..., min_length=1, max_length=1000, description="Part numbers to sign (1-based)")
+
+
+class MultipartPartUrl(CamelCaseModel):
+    """Presigned URL for a single part"""
+    part_number: int = Field(..., description="Part number")
+    presigned_url: str = Field(..., description="Pre-signed URL for the part upload")
+
+
+class MultipartPresignPartsBody(CamelCaseModel):
+    """Body schema for part URL presigning"""
+    upload_id: str = Field(..., description="S3 multipart upload ID")
+    parts: List[MultipartPartUrl] = Field(..., description="Part upload URLs")
+    expires_in: int = Field(..., description="URL validity in seconds")
+
+
+class MultipartPresignPartsResponse(CamelCaseModel):
+    """Response schema for part URL presigning"""
+    status_code: int = Field(..., alias="statusCode", description="HTTP status code")
+    message: str = Field(..., description="Response message")
+    body: Optional[MultipartPresignPartsBody] = Field(None, description="Part upload URLs")
+
+
+class MultipartCompletedPart(CamelCaseModel):
+    """A part the client has finished uploading"""
+    part_number: int = Field(..., ge=1, le=10000, description="Part number")
+    etag: str = Field(..., description="ETag returned by S3 for the part")
+
+
+class MultipartCompleteRequest(CamelCaseModel):
+    """Request schema for completing a multipart upload"""
+    upload_id: str = Field(..., description="S3 multipart upload ID")
+    object_key: str = Field(..., description="Object key being uploaded")
+    parts: List[MultipartCompletedPart] = Field(..., min_length=1, description="Uploaded parts")
+
+
+class MultipartCompleteBody(CamelCaseModel):
+    """Body schema for multipart upload completion"""
+    object_key: str = Field(..., description="Object key of the assembled file")
+    location: Optional[str] = Field(None, description="Object URL")
+    etag: Optional[str] = Field(None, description="ETag of the assembled object")
+
+
+class MultipartCompleteResponse(CamelCaseModel):
+    """Response schema for multipart upload completion"""
+    status_code: int = Field(..., alias="statusCode", description="HTTP status code")
+    message: str = Field(..., description="Response message")
+    body: Optional[MultipartCompleteBody] = Field(None, description="Completed object details")
+
+
+class MultipartAbortRequest(CamelCaseModel):
+    """Request schema for aborting a multipart upload"""
+    upload_id: str = Field(..., description="S3 multipart upload ID")
+    object_key: str = Field(..., description="Object key being uploaded")
+
+
+class MultipartAbortResponse(CamelCaseModel):
+    """Response schema for aborting a multipart upload"""
+    status_code: int = Field(..., alias="statusCode", description="HTTP status code")
+    message: str = Field(..., description="Response message")
+
+
+# Image Variant Schemas
+
+class ImageVariantsRequest(CamelCaseModel):
+    """Request schema for queueing variant generation after an upload completes"""
+    object_key: str = Field(..., description="Key of the uploaded image")
+
+
+class ImageVariant(CamelCaseModel):
+    """A generated image variant"""
+    key: str = Field(..., description="Object key of the variant")
+    url: str = Field(..., description="URL of the variant")
+    format: str = Field(..., description="Image format (webp, avif, ...)")
+    content_type: str = Field(..., description="Content-Type of the variant")
+    width: int = Field(..., description="Width in pixels")
+    height: int = Field(..., description="Height in pixels")
+    size: int = Field(..., description="Size in bytes")
+
+
+class ImageVariantsManifest(CamelCaseModel):
+    """Variants manifest for an uploaded image"""
+    source_key: str = Field(..., description="Key of the original upload")
+    generated_at: str = Field(..., description="Timestamp the variants were generated")
+    variants: List[ImageVariant] = Field(..., description="Generated variants")
+
+
+class ImageVariantsResponse(CamelCaseModel):
+    """Response schema for image variant operations"""
+    status_code: int = Field(..., alias="statusCode", description="HTTP status code")
+    message: str = Field(..., description="Response message")
+    body: Optional[ImageVariantsManifest] = Field(None, description="Variants manifest, once generated")
+
+
 # Email configuration and status schemas
 
 class EmailConfigResponse(CamelCaseModel):
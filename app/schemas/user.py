@@ -1,8 +1,8 @@
-from pydantic import BaseModel, EmailStr, Field, validator
+from pydantic import BaseModel, EmailStr, Field, field_validator, validator
 from typing import Optional, List
 from datetime import datetime
 from app.core.utils import CamelCaseModel
-from app.schemas.auth import UserResponse
+from app.schemas.auth import UserResponse, check_password_complexity
 
 
 # User management schemas
@@ -37,26 +37,31 @@ class AdminUserUpdateRequest(CamelCaseModel):
 
 
 class UserListQuery(CamelCaseModel):
-    """Query parameters for user list endpoint"""
-    page: int = Field(default=1, ge=1, description="Page number")
-    size: int = Field(default=10, ge=1, le=100, description="Page size")
-    search: Optional[str] = Field(None, description="Search term for email/name")
+    """Query parameters for user list endpoint (keyset pagination)"""
+    cursor: Optional[str] = Field(None, description="Opaque cursor from the previous page's nextCursor")
+    limit: int = Field(default=20, ge=1, le=100, description="Page size")
     is_active: Optional[bool] = Field(None, description="Filter by active status")
     is_verified: Optional[bool] = Field(None, description="Filter by verification status")
     is_superuser: Optional[bool] = Field(None, description="Filter by superuser status")
-    sort_by: str = Field(default="created_at", description="Sort field")
-    sort_order: str = Field(default="desc", regex="^(asc|desc)$", description="Sort order")
+    sort_by: str = Field(default="created_at", pattern="^(created_at|email|last_name)$", description="Sort field")
+    sort_order: str = Field(default="desc", pattern="^(asc|desc)$", description="Sort order")
 
 
 class UserListResponse(CamelCaseModel):
-    """User list response schema with pagination"""
+    """User list response schema with keyset pagination"""
     users: List[UserResponse] = Field(..., description="List of users")
-    total: int = Field(..., description="Total number of users")
-    page: int = Field(..., description="Current page number")
-    size: int = Field(..., description="Page size")
-    pages: int = Field(..., description="Total number of pages")
+    total: int = Field(..., description="Number of matching users (planner estimate for large results)")
+    total_is_estimate: bool = Field(..., description="Whether total is an estimate rather than an exact count")
+    limit: int = Field(..., description="Page size")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page")
     has_next: bool = Field(..., description="Whether there are more pages")
-    has_prev: bool = Field(..., description="Whether there are previous pages")
+
+
+class UserSearchResponse(CamelCaseModel):
+    """Ranked user search results"""
+    users: List[UserResponse] = Field(..., description="Matching users, best first")
+    query: str = Field(..., description="Search term as received")
+    limit: int = Field(..., description="Maximum number of results")
 
 
 class UserStatsResponse(CamelCaseModel):
@@ -88,8 +93,8 @@ class UserActivityResponse(CamelCaseModel):
 
 class BulkUserActionRequest(CamelCaseModel):
     """Bulk user action request schema"""
-    user_ids: List[int] = Field(..., min_items=1, description="List of user IDs")
-    action: str = Field(..., regex="^(activate|deactivate|verify|unverify|delete)$", description="Action to perform")
+    user_ids: List[int] = Field(..., min_length=1, max_length=10000, description="List of user IDs")
+    action: str = Field(..., pattern="^(activate|deactivate|verify|unverify|delete)$", description="Action to perform")
 
 
 class BulkUserActionResponse(CamelCaseModel):
@@ -97,15 +102,32 @@ class BulkUserActionResponse(CamelCaseModel):
     message: str = Field(..., description="Response message")
     success: bool = Field(..., description="Operation success status")
     affected_users: int = Field(..., description="Number of affected users")
+    unchanged_users: int = Field(default=0, description="Number of users already in the requested state")
     failed_users: List[int] = Field(default=[], description="List of user IDs that failed")
 
 
+class UserImportRow(CamelCaseModel):
+    """One row of a bulk user import file (CSV columns or NDJSON keys, snake_case or camelCase)"""
+    email: EmailStr = Field(..., description="User email address")
+    password: str = Field(..., min_length=8, description="User password")
+    first_name: str = Field(..., min_length=1, max_length=100, description="User first name")
+    last_name: str = Field(..., min_length=1, max_length=100, description="User last name")
+    is_active: bool = Field(default=True, description="User active status")
+    is_verified: bool = Field(default=False, description="Email verification status")
+
+    @field_validator('password')
+    @classmethod
+    def validate_password(cls, v):
+        """Validate password strength (same rules as signup)"""
+        return check_password_complexity(v)
+
+
 # User preferences schemas
 
 class UserPreferencesRequest(CamelCaseModel):
     """User preferences update request schema"""
     email_notifications: bool = Field(default=True, description="Email notification preference")
-    theme: str = Field(default="light", regex="^(light|dark|auto)$", description="UI theme preference")
+    theme: str = Field(default="light", pattern="^(light|dark|auto)$", description="UI theme preference")
     language: str = Field(default="en", description="Language preference")
     timezone: str = Field(default="UTC", description="Timezone preference")
 
@@ -0,0 +1,202 @@
+"""
+Production server: gunicorn master managing uvicorn workers.
+
+- worker count sized from the CPUs available to the process (WEB_CONCURRENCY
+  overrides it)
+- the application is preloaded in the master and the heap is frozen with
+  ``gc.freeze()`` before forking, so workers share those pages copy-on-write
+  instead of the cyclic GC touching (and copying) them
+- workers are recycled after a request budget (with jitter) or when their RSS
+  exceeds a memory limit
+- metrics are written per worker to PROMETHEUS_MULTIPROC_DIR and aggregated
+  by ``/metrics``
+- ``kill -HUP <master>`` replaces workers gracefully; in-flight requests get
+  ``worker_graceful_timeout`` seconds to finish. With preloading the master
+  keeps the loaded code, so deploy new code with a restart (or USR2 + WINCH).
+"""
+
+import gc
+import logging
+import os
+import sys
+from typing import Any, Dict, Optional
+
+from gunicorn.app.base import BaseApplication
+from uvicorn.workers import UvicornWorker
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+METRICS_MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (respects affinity / container cpusets)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def compute_worker_count(
+    cpus: Optional[int] = None,
+    web_concurrency: Optional[int] = None,
+    workers_per_core: Optional[float] = None,
+    max_workers: Optional[int] = None
+) -> int:
+    """Number of worker processes: WEB_CONCURRENCY if set, else CPUs x workers_per_core (capped)"""
+    web_concurrency = web_concurrency if web_concurrency is not None else settings.web_concurrency
+    if web_concurrency:
+        return max(1, web_concurrency)
+
+    cpus = cpus or available_cpus()
+    workers_per_core = workers_per_core if workers_per_core is not None else settings.workers_per_core
+    max_workers = max_workers if max_workers is not None else settings.max_workers
+
+    workers = max(1, int(cpus * workers_per_core))
+    return min(workers, max_workers) if max_workers > 0 else workers
+
+
+def _rss_mb() -> float:
+    """Resident set size of this process in MB"""
+    try:
+        with open("/proc/self/statm", "r") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        import resource
+        # ru_maxrss is the peak (KB on Linux); good enough where /proc is unavailable
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class RecyclingUvicornWorker(UvicornWorker):
+    """
+    Uvicorn worker that shuts itself down gracefully once its RSS exceeds
+    ``worker_max_memory_mb``; the master then starts a fresh worker.
+
+    The event loop and HTTP parser are pinned by the SERVER_LOOP / SERVER_HTTP
+    runtime profile rather than left to uvicorn's "auto" detection.
+    """
+
+    CONFIG_KWARGS = {
+        "loop": settings.server_loop,
+        "http": settings.server_http,
+        "server_header": False,
+        "date_header": False,
+    }
+
+    _recycling = False
+    _server = None
+
+    async def _serve(self) -> None:
+        # Same as UvicornWorker._serve, but keeps a handle on the server for recycling
+        from gunicorn.arbiter import Arbiter
+        from uvicorn.server import Server
+
+        self.config.app = self.wsgi
+        self._server = Server(config=self.config)
+        self._install_sigquit_handler()
+        await self._server.serve(sockets=self.sockets)
+        if not self._server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
+
+    async def callback_notify(self) -> None:
+        await super().callback_notify()
+
+        limit = settings.worker_max_memory_mb
+        if limit <= 0 or self._recycling:
+            return
+
+        rss = _rss_mb()
+        if rss > limit:
+            self._recycling = True
+            self.log.info(f"Worker {self.pid} RSS {rss:.0f}MB exceeds {limit}MB; recycling")
+            # Graceful exit: stop accepting, finish in-flight requests, run lifespan shutdown
+            self._server.should_exit = True
+
+
+def when_ready(server) -> None:
+    """Master hook: freeze the preloaded heap right before workers are forked"""
+    if server.cfg.preload_app:
+        gc.collect()
+        gc.freeze()
+        server.log.info(f"Froze {gc.get_freeze_count()} objects for copy-on-write sharing")
+    server.log.info(f"Starting {server.num_workers} workers")
+
+
+def post_fork(server, worker) -> None:
+    """Worker hook: re-enable the cyclic GC disabled while preloading"""
+    gc.enable()
+
+
+def child_exit(server, worker) -> None:
+    """Master hook: drop a dead worker's live gauges from the metrics aggregate"""
+    if os.environ.get(METRICS_MULTIPROC_ENV):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def prepare_metrics_dir(path: str) -> None:
+    """
+    Point prometheus_client at a clean per-server metrics directory.
+
+    Must run before prometheus_client is first imported (i.e. before the app is
+    loaded) because its value backend is chosen at import time.
+    """
+    os.makedirs(path, exist_ok=True)
+    for name in os.listdir(path):
+        if name.endswith(".db"):
+            os.remove(os.path.join(path, name))
+    os.environ[METRICS_MULTIPROC_ENV] = path
+
+
+class ProductionServer(BaseApplication):
+    """Gunicorn application configured from settings rather than a config file"""
+
+    def __init__(self, app_uri: str = "app.main:app", options: Optional[Dict[str, Any]] = None):
+        self.app_uri = app_uri
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        from gunicorn.util import import_app
+
+        if self.cfg.preload_app:
+            # Avoid GC passes (and the page copies they cause) while the app is imported
+            gc.disable()
+        return import_app(self.app_uri)
+
+
+def production_options(bind: str = "0.0.0.0:8000") -> Dict[str, Any]:
+    """Gunicorn settings for production"""
+    return {
+        "bind": bind,
+        "workers": compute_worker_count(),
+        "worker_class": "app.server.RecyclingUvicornWorker",
+        "preload_app": settings.server_preload,
+        "max_requests": settings.worker_max_requests,
+        "max_requests_jitter": settings.worker_max_requests_jitter,
+        "timeout": settings.worker_timeout,
+        "graceful_timeout": settings.worker_graceful_timeout,
+        "keepalive": settings.server_keepalive,
+        "loglevel": settings.log_level.lower(),
+        "accesslog": None,
+        "when_ready": when_ready,
+        "post_fork": post_fork,
+        "child_exit": child_exit,
+    }
+
+
+def run_production(bind: str = "0.0.0.0:8000", **overrides: Any) -> None:
+    """Run the production server (blocks until the master exits)"""
+    if settings.metrics_enabled:
+        # Per-worker metric files aggregated by /metrics
+        prepare_metrics_dir(settings.metrics_multiproc_dir)
+
+    options = production_options(bind)
+    options.update(overrides)
+    ProductionServer(options=options).run()
@@ -0,0 +1,153 @@
+"""
+Image variant worker.
+
+Runs the image derivative pipeline in one of two modes:
+
+- AWS Lambda, triggered by S3 ``ObjectCreated`` events:
+      handler = app.workers.image_variants.lambda_handler
+
+- Local worker, either for explicit keys or draining the Redis queue the API
+  pushes completed uploads onto:
+      python -m app.workers.image_variants --root ./local-s3 photos/cat.jpg
+      python -m app.workers.image_variants --bucket my-cms-image-upload --queue
+
+The Lambda path only needs ``app.core.images`` (plus Pillow and boto3); it does
+not load application settings and reads the IMAGE_VARIANT_* environment
+variables directly. The local worker takes them from application settings.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote_plus
+
+from app.core.images import (
+    IMAGE_VARIANTS_QUEUE,
+    ImageVariantPipeline,
+    InlineExecutor,
+    LocalObjectStore,
+    ObjectStore,
+    S3ObjectStore,
+    is_source_image,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _env_list(name: str, default: str) -> List[str]:
+    # Accept the JSON list format used by app settings as well as plain comma-separated values
+    value = os.environ.get(name, default).strip()
+    if value.startswith("["):
+        return [str(item) for item in json.loads(value)]
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _pipeline_from_env(store: ObjectStore, **kwargs) -> ImageVariantPipeline:
+    return ImageVariantPipeline(
+        store,
+        widths=[int(width) for width in _env_list("IMAGE_VARIANT_WIDTHS", "320,640,1280")],
+        formats=_env_list("IMAGE_VARIANT_FORMATS", "webp,avif"),
+        quality=int(os.environ.get("IMAGE_VARIANT_QUALITY", "80")),
+        **kwargs,
+    )
+
+
+def _pipeline_from_settings(store: ObjectStore, **kwargs) -> ImageVariantPipeline:
+    # The local worker runs beside the API, so it shares its settings (and .env)
+    from app.config import settings
+
+    return ImageVariantPipeline(
+        store,
+        widths=settings.image_variant_widths,
+        formats=settings.image_variant_formats,
+        quality=settings.image_variant_quality,
+        **kwargs,
+    )
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """Process S3 ObjectCreated records"""
+    processed = []
+    pipelines: Dict[str, ImageVariantPipeline] = {}
+
+    for record in event.get("Records", []):
+        bucket = record["s3"]["bucket"]["name"]
+        key = unquote_plus(record["s3"]["object"]["key"])
+        if not is_source_image(key):
+            continue
+
+        if bucket not in pipelines:
+            # Lambda has no /dev/shm, so render in-process
+            pipelines[bucket] = _pipeline_from_env(S3ObjectStore(bucket), executor=InlineExecutor())
+
+        try:
+            manifest = pipelines[bucket].process(key)
+            if manifest:
+                processed.append(key)
+        except Exception as e:
+            logger.error(f"Failed to generate variants for s3://{bucket}/{key}: {e}")
+            raise
+
+    return {"processed": processed}
+
+
+async def drain_queue(
+    pipeline: ImageVariantPipeline,
+    batch_size: int = 16,
+    poll_interval: float = 2.0,
+    once: bool = False
+) -> None:
+    """Pop uploaded keys off the Redis queue and render them across the process pool"""
+    from app.redis_client import redis_client
+
+    while True:
+        keys = []
+        while len(keys) < batch_size:
+            key = await redis_client.rpop(IMAGE_VARIANTS_QUEUE)
+            if not key:
+                break
+            keys.append(key)
+
+        if keys:
+            try:
+                manifests = await asyncio.to_thread(pipeline.process_many, keys)
+                logger.info(f"Processed {len(manifests)}/{len(keys)} queued images")
+            except Exception as e:
+                logger.error(f"Failed to process queued images {keys}: {e}")
+        elif once:
+            return
+        else:
+            await asyncio.sleep(poll_interval)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate CMS image variants")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--root", help="Local directory acting as the bucket")
+    source.add_argument("--bucket", help="S3 bucket name")
+    parser.add_argument("--queue", action="store_true", help="Drain the Redis upload queue")
+    parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("keys", nargs="*", help="Object keys to process")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    store: ObjectStore = LocalObjectStore(args.root) if args.root else S3ObjectStore(args.bucket)
+    pipeline = _pipeline_from_settings(store, max_workers=args.workers)
+
+    try:
+        if args.keys:
+            for manifest in pipeline.process_many(args.keys):
+                logger.info(f"{manifest['source_key']}: {len(manifest['variants'])} variants")
+        if args.queue:
+            asyncio.run(drain_queue(pipeline, once=args.once))
+    finally:
+        pipeline.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Bulk user import worker.
+
+Creates accounts from a CSV file (header row with email, password, first_name,
+last_name and optionally is_active, is_verified; camelCase headers work too)
+or an NDJSON file with the same keys:
+
+    python -m app.workers.user_import new-institution.csv
+    python -m app.workers.user_import users.ndjson --workers 16 --rejects rejects.ndjson
+
+Progress is checkpointed to ``<file>.progress.json`` after every batch; run
+the same command again to resume an interrupted import. Rejected rows (invalid,
+duplicated in the file, or already registered) are appended to ``--rejects``.
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import List, Optional
+
+from app.core.user_import import DEFAULT_BATCH_SIZE, SUPPORTED_FORMATS, InvalidImportFileError, UserImporter
+
+logger = logging.getLogger(__name__)
+
+
+async def run_import(
+    path: str,
+    fmt: Optional[str] = None,
+    progress_path: Optional[str] = None,
+    rejects_path: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: Optional[int] = None
+) -> None:
+    from app.database import engine
+
+    try:
+        async with engine.connect() as conn:
+            importer = UserImporter(conn, batch_size=batch_size, max_workers=max_workers, rejects_path=rejects_path)
+            try:
+                await importer.run(path, fmt, progress_path)
+            finally:
+                importer.shutdown()
+    finally:
+        await engine.dispose()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Import users from a CSV or NDJSON file")
+    parser.add_argument("path", help="CSV or NDJSON file of users")
+    parser.add_argument("--format", choices=sorted(SUPPORTED_FORMATS), help="File format (default: from the extension)")
+    parser.add_argument("--progress", help="Progress file (default: <path>.progress.json)")
+    parser.add_argument("--rejects", help="Append rejected rows to this NDJSON file")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per batch and commit")
+    parser.add_argument("--workers", type=int, default=None, help="Hashing processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    try:
+        asyncio.run(run_import(args.path, args.format, args.progress, args.rejects, args.batch_size, args.workers))
+    except InvalidImportFileError as e:
+        parser.exit(2, f"error: {e}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Micro-benchmarks for Turtil Backend hot paths.
+
+Run individual benchmarks as modules from the project root, e.g.:
+
+    python -m benchmarks.bench_presign
+"""
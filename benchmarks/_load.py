@@ -0,0 +1,158 @@
+"""
+Minimal HTTP load generator and server process helpers shared by the server benchmarks.
+
+Runs a fixed number of concurrent keep-alive clients for a fixed duration,
+optionally spread over several processes so the generator is not the
+bottleneck, and reports requests/s and latency percentiles.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+
+async def _client_loop(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    deadline: float,
+    latencies: List[float],
+    errors: List[int],
+    headers: Optional[Dict[str, str]],
+    json_body: Optional[dict]
+) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, headers=headers, json=json_body)
+            if response.status_code >= 500:
+                errors.append(response.status_code)
+            else:
+                latencies.append(time.perf_counter() - started)
+        except httpx.HTTPError:
+            errors.append(0)
+
+
+async def _run(
+    method: str,
+    url: str,
+    duration: float,
+    concurrency: int,
+    headers: Optional[Dict[str, str]],
+    json_body: Optional[dict]
+):
+    latencies: List[float] = []
+    errors: List[int] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(
+            _client_loop(client, method, url, deadline, latencies, errors, headers, json_body)
+            for _ in range(concurrency)
+        ))
+    return latencies, len(errors)
+
+
+def _worker(args):
+    return asyncio.run(_run(*args))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def run_load(
+    url: str,
+    duration: float = 10.0,
+    concurrency: int = 64,
+    processes: int = 1,
+    method: str = "GET",
+    headers: Optional[Dict[str, str]] = None,
+    json_body: Optional[dict] = None
+) -> Dict[str, float]:
+    """Drive load against ``url`` and return rps, p50/p99 latency (ms) and error count"""
+    per_process = max(1, concurrency // processes)
+    args = (method, url, duration, per_process, headers, json_body)
+
+    if processes > 1:
+        with multiprocessing.get_context("spawn").Pool(processes) as pool:
+            results = pool.map(_worker, [args] * processes)
+    else:
+        results = [_worker(args)]
+
+    latencies = [latency for result in results for latency in result[0]]
+    errors = sum(result[1] for result in results)
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / duration,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": errors,
+    }
+
+
+def start_server(command: List[str], env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    """Start a server process in its own process group"""
+    return subprocess.Popen(
+        command,
+        env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def wait_until_ready(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"Server at {url} did not become ready within {timeout}s")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=30)
+    except (ProcessLookupError, subprocess.TimeoutExpired):
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+def process_tree_pss_mb(pid: int) -> Optional[float]:
+    """Proportional set size of a process and its children (Linux only)"""
+    if not sys.platform.startswith("linux"):
+        return None
+
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as children:
+            pids += [int(child) for child in children.read().split()]
+    except OSError:
+        return None
+
+    total_kb = 0
+    for child in pids:
+        try:
+            with open(f"/proc/{child}/smaps_rollup") as smaps:
+                for line in smaps:
+                    if line.startswith("Pss:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total_kb / 1024
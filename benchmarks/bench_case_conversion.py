@@ -0,0 +1,128 @@
+"""
+Key-case conversion throughput on large nested payloads.
+
+Compares the previous recursive, regex-per-key implementation with the
+memoized iterative transform in app.core.utils, both directions, and checks
+they produce identical output.
+
+    python -m benchmarks.bench_case_conversion [records] [rounds]
+"""
+
+import re
+import sys
+import time
+from typing import Any, Callable, Dict
+
+from benchmarks import _env  # noqa: F401
+from app.core.utils import (
+    convert_dict_keys_to_camel,
+    convert_dict_keys_to_snake,
+    seed_key_cache,
+)
+import app.schemas.auth  # noqa: F401  (register CamelCaseModel subclasses)
+import app.schemas.email  # noqa: F401
+
+
+# Previous implementation, kept here as the baseline
+
+def baseline_snake_to_camel(snake_str: str) -> str:
+    if "_" not in snake_str:
+        return snake_str
+    components = snake_str.split("_")
+    return components[0] + "".join(word.capitalize() for word in components[1:])
+
+
+def baseline_camel_to_snake(camel_str: str) -> str:
+    s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", camel_str)
+    return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
+
+
+def baseline_convert(data: Dict[str, Any], convert: Callable[[str], str]) -> Dict[str, Any]:
+    if not isinstance(data, dict):
+        return data
+    result = {}
+    for key, value in data.items():
+        new_key = convert(key)
+        if isinstance(value, dict):
+            result[new_key] = baseline_convert(value, convert)
+        elif isinstance(value, list):
+            result[new_key] = [
+                baseline_convert(item, convert) if isinstance(item, dict) else item
+                for item in value
+            ]
+        else:
+            result[new_key] = value
+    return result
+
+
+def snake_payload(records: int) -> Dict[str, Any]:
+    """Paginated user listing with nested profile/upload data"""
+    return {
+        "status_code": 200,
+        "total_count": records,
+        "next_cursor": "eyJpZCI6IDEwMH0",
+        "users": [
+            {
+                "id": i,
+                "first_name": "Jane",
+                "last_name": "Doe",
+                "email_verified_at": "2026-01-01T00:00:00Z",
+                "is_active": True,
+                "login_count": i % 50,
+                "profile_settings": {
+                    "notification_preferences": {"email_enabled": True, "sms_enabled": False},
+                    "display_time_zone": "Asia/Kolkata",
+                },
+                "recent_uploads": [
+                    {"object_key": f"gallery/{i}-{n}.jpg", "content_type": "image/jpeg", "file_size": 1024 * n}
+                    for n in range(3)
+                ],
+                "tags": ["a", "b"],
+            }
+            for i in range(records)
+        ],
+    }
+
+
+def count_keys(data: Any) -> int:
+    if isinstance(data, dict):
+        return len(data) + sum(count_keys(value) for value in data.values())
+    if isinstance(data, list):
+        return sum(count_keys(item) for item in data)
+    return 0
+
+
+def bench(func: Callable[[], Any], rounds: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    print(f"seeded {seed_key_cache()} keys from CamelCaseModel fields")
+
+    snake = snake_payload(records)
+    camel = convert_dict_keys_to_camel(snake)
+    keys = count_keys(snake)
+    print(f"payload: {records} records, {keys} keys\n")
+
+    cases = [
+        ("to camel", lambda: baseline_convert(snake, baseline_snake_to_camel), lambda: convert_dict_keys_to_camel(snake)),
+        ("to snake", lambda: baseline_convert(camel, baseline_camel_to_snake), lambda: convert_dict_keys_to_snake(camel)),
+    ]
+
+    print(f"{'direction':<10} {'baseline keys/s':>16} {'memoized keys/s':>16} {'speedup':>8}")
+    for label, baseline, current in cases:
+        assert baseline() == current(), f"{label}: outputs differ"
+        before = bench(baseline, rounds)
+        after = bench(current, rounds)
+        print(f"{label:<10} {keys / before:>16,.0f} {keys / after:>16,.0f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Response compression: CPU cost and byte savings per encoding and level.
+
+Payloads are rendered the way the API renders them (camelCase JSON via
+ModelResponse): a user listing and a batch presigned URL response (real boto3
+signatures, so mostly high-entropy query strings). For each gzip level and
+brotli quality reports compressed size, ratio, microseconds per response and
+throughput, plus the per-request default the middleware uses.
+
+    python -m benchmarks.bench_compression [records] [rounds]
+"""
+
+import gzip
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks import _env  # noqa: F401
+import boto3
+
+from app.config import settings
+from app.core.compression import brotli
+from app.core.responses import dump_json
+from app.schemas.email import PresignedUrlBatchBody, PresignedUrlBatchItem, PresignedUrlBatchResponse
+
+
+def user_listing(records: int) -> bytes:
+    now = datetime.now(timezone.utc).isoformat()
+    users = [
+        {
+            "id": i,
+            "uuid": f"0b6f7c3e-2f4a-4d7e-9b0e-{i:012x}",
+            "email": f"user{i}@example.com",
+            "firstName": "Jane",
+            "lastName": f"Doe{i}",
+            "fullName": f"Jane Doe{i}",
+            "isActive": True,
+            "isVerified": i % 3 != 0,
+            "isSuperuser": False,
+            "emailVerifiedAt": now,
+            "lastLoginAt": now,
+            "loginCount": i % 50,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        for i in range(records)
+    ]
+    return dump_json({"users": users, "nextCursor": "eyJpZCI6IDEwMH0", "success": True}, dict)
+
+
+def presigned_batch(records: int) -> bytes:
+    s3 = boto3.client(
+        "s3",
+        region_name=settings.aws_region,
+        aws_access_key_id=settings.aws_access_key_id,
+        aws_secret_access_key=settings.aws_secret_access_key,
+    )
+    files = []
+    for i in range(records):
+        key = f"gallery/2026/10/{i:05d}-photo.jpg"
+        url = s3.generate_presigned_url(
+            "put_object",
+            Params={"Bucket": settings.s3_bucket_name, "Key": key, "ContentType": "image/jpeg"},
+            ExpiresIn=3600,
+        )
+        files.append(PresignedUrlBatchItem(file_name=f"{i:05d}-photo.jpg", presigned_url=url, content_type="image/jpeg"))
+    return dump_json(PresignedUrlBatchResponse(
+        statusCode=200,
+        message="Presigned URLs generated",
+        body=PresignedUrlBatchBody(files=files, expires_in=3600),
+    ))
+
+
+def codecs() -> List[Tuple[str, Callable[[bytes], bytes]]]:
+    result = [(f"gzip-{level}", lambda body, level=level: gzip.compress(body, compresslevel=level, mtime=0))
+              for level in (1, 4, 6, 9)]
+    if brotli is not None:
+        result += [(f"br-{quality}", lambda body, quality=quality: brotli.compress(body, quality=quality))
+                   for quality in (1, 4, 6, 9, 11)]
+    return result
+
+
+def bench(func: Callable[[], bytes], rounds: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    payloads: Dict[str, bytes] = {
+        "user listing": user_listing(records),
+        "presigned batch": presigned_batch(min(records, 100)),
+    }
+    defaults = {f"gzip-{settings.compression_gzip_level}", f"br-{settings.compression_brotli_quality}"}
+    if brotli is None:
+        print("brotli not installed: gzip only\n")
+
+    for name, body in payloads.items():
+        print(f"{name}: {len(body):,} bytes")
+        print(f"  {'codec':<9} {'bytes':>9} {'ratio':>7} {'us/resp':>10} {'MB/s':>8}")
+        for label, codec in codecs():
+            compressed = codec(body)
+            seconds = bench(lambda: codec(body), rounds)
+            marker = "  (default)" if label in defaults else ""
+            print(f"  {label:<9} {len(compressed):>9,} {len(body) / len(compressed):>6.1f}x "
+                  f"{seconds * 1e6:>10.1f} {len(body) / seconds / 1e6:>8.1f}{marker}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
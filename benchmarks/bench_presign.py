@@ -0,0 +1,58 @@
+"""
+Presigned URL signing throughput: local SigV4 signer vs boto3.
+
+    python -m benchmarks.bench_presign [iterations]
+"""
+
+import sys
+import time
+
+from benchmarks import _env  # noqa: F401
+from app.core.presign import S3Presigner
+from app.config import settings
+
+BUCKET = "my-cms-image-upload"
+
+
+def bench_local(iterations: int) -> float:
+    presigner = S3Presigner()
+    objects = [(f"gallery/image-{i}.jpg", "image/jpeg") for i in range(iterations)]
+
+    start = time.perf_counter()
+    presigner.generate_presigned_urls(BUCKET, objects, expires_in=3600)
+    return iterations / (time.perf_counter() - start)
+
+
+def bench_boto3(iterations: int) -> float:
+    import boto3
+
+    s3 = boto3.client(
+        "s3",
+        aws_access_key_id=settings.aws_access_key_id,
+        aws_secret_access_key=settings.aws_secret_access_key,
+        region_name=settings.aws_region,
+    )
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        s3.generate_presigned_url(
+            ClientMethod="put_object",
+            Params={"Bucket": BUCKET, "Key": f"gallery/image-{i}.jpg", "ContentType": "image/jpeg"},
+            ExpiresIn=3600,
+            HttpMethod="PUT",
+        )
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    print(f"local signer : {bench_local(iterations):>10.0f} signatures/s")
+    try:
+        print(f"boto3        : {bench_boto3(iterations):>10.0f} signatures/s")
+    except ImportError:
+        print("boto3        : not installed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Runtime profile comparison: event loop (asyncio/uvloop) x HTTP parser (h11/httptools).
+
+Starts the production server once per profile and measures requests/s and
+p99 latency on:
+
+- GET  /health/simple   (framework + server overhead only)
+- GET  /api/auth/me     (JWT decode, Redis lookup, DB read)
+- POST /api/auth/login  (Argon2 verify; needs --email/--password)
+
+/api/auth/me uses the token from logging in with --email/--password, or
+--token. Endpoints without credentials are skipped. Needs the full stack the
+app starts against (PostgreSQL, Redis HTTP), e.g.
+``docker compose up postgres serverless-redis-http`` with a matching .env.
+
+    python -m benchmarks.bench_runtime --email bench@example.com --password Secret123!
+    python -m benchmarks.bench_runtime --profiles uvloop:httptools,asyncio:h11 --workers 2
+"""
+
+import argparse
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks import _env  # noqa: F401
+from benchmarks._load import run_load, start_server, stop_server, wait_until_ready
+
+DEFAULT_PROFILES = "asyncio:h11,asyncio:httptools,uvloop:h11,uvloop:httptools"
+
+
+def login(base_url: str, email: str, password: str) -> str:
+    response = httpx.post(f"{base_url}/api/auth/login", json={"email": email, "password": password}, timeout=30.0)
+    response.raise_for_status()
+    return response.json()["tokens"]["accessToken"]
+
+
+def endpoints(base_url: str, args) -> List[Tuple[str, str, str, Optional[Dict[str, str]], Optional[dict]]]:
+    """(label, method, url, headers, json) for every endpoint that can be exercised"""
+    cases = [("/health/simple", "GET", f"{base_url}/health/simple", None, None)]
+
+    token = args.token
+    if not token and args.email and args.password:
+        token = login(base_url, args.email, args.password)
+    if token:
+        cases.append(("/api/auth/me", "GET", f"{base_url}/api/auth/me", {"Authorization": f"Bearer {token}"}, None))
+    if args.email and args.password:
+        cases.append((
+            "/api/auth/login", "POST", f"{base_url}/api/auth/login", None,
+            {"email": args.email, "password": args.password},
+        ))
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--profiles", default=DEFAULT_PROFILES, help="Comma-separated loop:http pairs")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=2, help="Load generator processes")
+    parser.add_argument("--email", default=None)
+    parser.add_argument("--password", default=None)
+    parser.add_argument("--token", default=None)
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    results = []
+
+    for profile in args.profiles.split(","):
+        loop, http = profile.split(":")
+        server = start_server(
+            [
+                sys.executable, "-c",
+                "from app.server import run_production; "
+                f"run_production(bind='127.0.0.1:{args.port}', workers={args.workers})"
+            ],
+            env={"SERVER_LOOP": loop, "SERVER_HTTP": http},
+        )
+        try:
+            wait_until_ready(base_url + "/health/live")
+            for label, method, url, headers, body in endpoints(base_url, args):
+                result = run_load(url, args.duration, args.concurrency, args.clients, method, headers, body)
+                results.append((profile, label, result))
+                print(f"  {profile:<18} {label:<16} {result['rps']:>9.0f} req/s  p99 {result['p99_ms']:>7.1f} ms")
+        finally:
+            stop_server(server)
+
+    print(f"\n{'profile':<18} {'endpoint':<16} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for profile, label, result in sorted(results, key=lambda r: (r[1], -r[2]["rps"])):
+        print(
+            f"{profile:<18} {label:<16} {result['rps']:>9.0f} {result['p50_ms']:>8.1f} "
+            f"{result['p99_ms']:>8.1f} {result['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
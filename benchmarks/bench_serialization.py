@@ -0,0 +1,123 @@
+"""
+Response serialization cost per response: LoginResponse and AuthResponse.
+
+Compares, for an already-built response model:
+
+- fastapi+json    FastAPI's response_model path (dump to dict, re-validate,
+                  serialize) rendered by the stdlib-json JSONResponse
+- fastapi+orjson  the same path rendered by FastJSONResponse (new default)
+- ModelResponse   cached TypeAdapter encoding the model straight to bytes
+
+and reports microseconds per response plus the peak memory allocated while
+rendering one response (tracemalloc).
+
+    python -m benchmarks.bench_serialization [iterations]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict
+
+from benchmarks import _env  # noqa: F401
+from fastapi.responses import JSONResponse
+from fastapi.routing import _prepare_response_content
+from fastapi.utils import create_model_field
+
+from app.core.responses import FastJSONResponse, ModelResponse
+from app.schemas.auth import AuthResponse, LoginResponse, TokenResponse
+
+
+def sample_user() -> Dict:
+    now = datetime.now(timezone.utc)
+    return {
+        "id": 42,
+        "uuid": "0b6f7c3e-2f4a-4d7e-9b0e-6a1f2d3c4b5a",
+        "email": "jane.doe@example.com",
+        "firstName": "Jane",
+        "lastName": "Doe",
+        "fullName": "Jane Doe",
+        "isActive": True,
+        "isVerified": True,
+        "isSuperuser": False,
+        "emailVerifiedAt": now,
+        "lastLoginAt": now,
+        "loginCount": 17,
+        "createdAt": now,
+        "updatedAt": now,
+    }
+
+
+def sample_models() -> Dict[str, object]:
+    token = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9." + "x" * 180
+    return {
+        "LoginResponse": LoginResponse(
+            message="Login successful",
+            success=True,
+            tokens=TokenResponse(
+                access_token=token, refresh_token=token, token_type="bearer",
+                expires_in=1800, user=sample_user()
+            )
+        ),
+        "AuthResponse": AuthResponse(
+            message="User information retrieved successfully",
+            success=True,
+            user=sample_user()
+        ),
+    }
+
+
+def measure(render: Callable[[], bytes], iterations: int):
+    render()  # warm caches (TypeAdapter build, field schema)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        render()
+    per_response_us = (time.perf_counter() - start) / iterations * 1e6
+
+    # Peak traced memory while rendering one response (transient allocations included)
+    sample = min(iterations, 1000)
+    peaks = 0
+    tracemalloc.start()
+    for _ in range(sample):
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        render()
+        peaks += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return per_response_us, peaks / sample
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    print(f"{'model':<14} {'path':<15} {'us/resp':>9} {'peak B':>8} {'body':>6}")
+    for name, model in sample_models().items():
+        # Synchronous body of fastapi.routing.serialize_response
+        field = create_model_field(name="response", type_=type(model), mode="serialization")
+
+        def fastapi_content(model=model, field=field):
+            value, _ = field.validate(_prepare_response_content(model, exclude_unset=False), {}, loc=("response",))
+            return field.serialize(value, mode="json", by_alias=True)
+
+        paths = {
+            "fastapi+json": lambda: JSONResponse(fastapi_content()).body,
+            "fastapi+orjson": lambda: FastJSONResponse(fastapi_content()).body,
+            "ModelResponse": lambda model=model: ModelResponse(model).body,
+        }
+
+        documents = []
+        for path, render in paths.items():
+            us, peak = measure(render, iterations)
+            body = render()
+            documents.append(json.loads(body))
+            print(f"{name:<14} {path:<15} {us:>9.2f} {peak:>8.0f} {len(body):>6}")
+
+        if any(document != documents[0] for document in documents):
+            print(f"  warning: {name} responses differ between paths")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Typeahead user search latency on a seeded table.
+
+Creates the users table (with its search column and indexes, exactly as the
+models declare them) in a scratch schema of the DATABASE_URL database, seeds
+it with generate_series, then replays typeahead sessions (every prefix of
+"first last", of "last first" and of an email local part) through the search
+the API uses, reporting p50/p95/p99 per term length. Word-anywhere terms
+(email domains, middle fragments), which take the full-text path, are
+reported separately. The scratch schema is dropped
+afterwards unless --keep is given.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_user_search [rows] [sessions] [--keep]
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from benchmarks import _env  # noqa: F401
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import Base, engine
+from app.core.search import search_users
+import app.models.user  # noqa: F401  (register the users table)
+
+SCHEMA = "bench_user_search"
+
+FIRST_NAMES = [
+    "Aarav", "Aditi", "Aisha", "Akash", "Amelia", "Ananya", "Arjun", "Ava", "Benjamin", "Charlotte",
+    "Daniel", "Deepa", "Divya", "Elijah", "Emma", "Ethan", "Fatima", "Gauri", "Harper", "Ishaan",
+    "Isabella", "James", "Jane", "Kabir", "Kavya", "Liam", "Lucas", "Maya", "Meera", "Mia",
+    "Mohammed", "Nikhil", "Noah", "Olivia", "Oliver", "Priya", "Rahul", "Riya", "Rohan", "Sara",
+    "Sofia", "Sneha", "Tanvi", "Theo", "Varun", "Vikram", "William", "Yash", "Zara", "Zoya",
+]
+LAST_NAMES = [
+    "Agarwal", "Anderson", "Bansal", "Brown", "Chopra", "Clark", "Das", "Davis", "Desai", "Doe",
+    "Garcia", "Gupta", "Harris", "Iyer", "Jackson", "Jain", "Johnson", "Joshi", "Kapoor", "Khan",
+    "Kumar", "Lee", "Lewis", "Martin", "Mehta", "Menon", "Miller", "Moore", "Nair", "Patel",
+    "Pillai", "Rao", "Reddy", "Robinson", "Shah", "Sharma", "Singh", "Smith", "Taylor", "Thomas",
+    "Thompson", "Verma", "Walker", "White", "Williams", "Wilson", "Wright", "Yadav", "Young", "Zhang",
+]
+DOMAINS = ["example.com", "mail.example.org", "students.example.edu", "staff.example.edu"]
+
+SEED_SQL = text("""
+    INSERT INTO users (uuid, email, first_name, last_name, hashed_password,
+                       is_active, is_verified, is_superuser, login_count, created_at, updated_at)
+    SELECT gen_random_uuid(),
+           lower(f || '.' || l) || g || '@' || d,
+           f, l, 'x', true, true, false, 0,
+           now() - g * interval '1 second', now()
+    FROM (
+        SELECT g,
+               (CAST(:firsts AS text[]))[1 + floor(random() * CAST(:nf AS int))::int] AS f,
+               (CAST(:lasts AS text[]))[1 + floor(random() * CAST(:nl AS int))::int] AS l,
+               (CAST(:domains AS text[]))[1 + floor(random() * CAST(:nd AS int))::int] AS d
+        FROM generate_series(CAST(:start AS int), CAST(:stop AS int)) AS g
+    ) AS rows
+""")
+
+
+async def seed(rows: int, batch: int = 200000) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        scoped = await conn.execution_options(schema_translate_map={None: SCHEMA})
+        await scoped.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=[Base.metadata.tables["users"]]))
+
+    start = time.perf_counter()
+    for offset in range(0, rows, batch):
+        async with engine.begin() as conn:
+            await conn.execute(text(f"SET LOCAL search_path TO {SCHEMA}"))
+            await conn.execute(text("SELECT setseed(:seed)"), {"seed": (offset / rows) % 1})
+            await conn.execute(SEED_SQL, {
+                "firsts": FIRST_NAMES, "nf": len(FIRST_NAMES),
+                "lasts": LAST_NAMES, "nl": len(LAST_NAMES),
+                "domains": DOMAINS, "nd": len(DOMAINS),
+                "start": offset + 1, "stop": min(offset + batch, rows),
+            })
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text(f"VACUUM ANALYZE {SCHEMA}.users"))
+    print(f"seeded {rows:,} users in {time.perf_counter() - start:.1f}s")
+
+
+def typeahead_terms(sessions: int) -> List[str]:
+    """Every prefix a user types for a sample of names and email fragments"""
+    rng = random.Random(7)
+    terms = []
+    for _ in range(sessions):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        for full in (f"{first} {last}", f"{last} {first}", f"{first.lower()}.{last.lower()}{rng.randint(1, 999)}"):
+            terms.extend(full[:length] for length in range(1, len(full) + 1))
+    return [term for term in terms if term.strip()]
+
+
+def fulltext_terms() -> List[str]:
+    """Terms no name or email starts with: served by the full-text stage"""
+    return ["students", "staff edu", "example org", "doe jan", "sharma 12", "mail", "edu kumar", "org pri"]
+
+
+async def replay(terms: List[str], rounds: int = 1) -> Dict[int, List[float]]:
+    latencies: Dict[int, List[float]] = defaultdict(list)
+    async with engine.connect() as conn:
+        scoped = await conn.execution_options(schema_translate_map={None: SCHEMA})
+        async with AsyncSession(bind=scoped) as db:
+            for term in terms[:50]:  # warm the buffer cache and statement cache
+                await search_users(db, term)
+            for term in terms * rounds:
+                start = time.perf_counter()
+                await search_users(db, term)
+                latencies[len(term)].append((time.perf_counter() - start) * 1000)
+                db.expunge_all()
+    return latencies
+
+
+def percentile(values: List[float], q: float) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1] if len(values) > 1 else values[0]
+
+
+async def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    rows = int(args[0]) if args else 1000000
+    sessions = int(args[1]) if len(args) > 1 else 100
+
+    await seed(rows)
+    try:
+        latencies = await replay(typeahead_terms(sessions))
+        print(f"\n{'term len':>8} {'queries':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        buckets = [(1, 1), (2, 2), (3, 3), (4, 5), (6, 9), (10, 99)]
+        for low, high in buckets:
+            values = [v for length, vs in latencies.items() if low <= length <= high for v in vs]
+            if values:
+                label = f"{low}" if low == high else f"{low}-{high}"
+                print(f"{label:>8} {len(values):>8} {percentile(values, 50):>8.2f} "
+                      f"{percentile(values, 95):>8.2f} {percentile(values, 99):>8.2f}")
+        everything = [v for vs in latencies.values() for v in vs]
+        print(f"{'all':>8} {len(everything):>8} {percentile(everything, 50):>8.2f} "
+              f"{percentile(everything, 95):>8.2f} {percentile(everything, 99):>8.2f}")
+
+        fallback = [v for vs in (await replay(fulltext_terms(), rounds=10)).values() for v in vs]
+        print(f"{'fulltext':>8} {len(fallback):>8} {percentile(fallback, 50):>8.2f} "
+              f"{percentile(fallback, 95):>8.2f} {percentile(fallback, 99):>8.2f}")
+    finally:
+        if "--keep" not in sys.argv:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
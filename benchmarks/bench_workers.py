@@ -0,0 +1,72 @@
+"""
+Production server throughput per worker count (and per core).
+
+Starts the gunicorn/uvicorn production server with each worker count, drives
+load against one endpoint and reports requests/s, requests/s per worker,
+p99 latency and the server's total PSS (shows the copy-on-write saving of
+preloading + gc.freeze when run with and without --no-preload).
+
+Needs the full stack the app starts against (PostgreSQL, Redis HTTP), e.g.
+``docker compose up postgres serverless-redis-http`` with a matching .env.
+
+    python -m benchmarks.bench_workers --workers 1,2,4 --path /health/simple
+    python -m benchmarks.bench_workers --workers 4 --no-preload
+"""
+
+import argparse
+import sys
+
+from benchmarks import _env  # noqa: F401
+from benchmarks._load import (
+    process_tree_pss_mb,
+    run_load,
+    start_server,
+    stop_server,
+    wait_until_ready,
+)
+from app.server import available_cpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", default=None, help="Comma-separated worker counts (default: 1..CPUs)")
+    parser.add_argument("--path", default="/health/simple", help="Endpoint to load")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=128)
+    parser.add_argument("--clients", type=int, default=2, help="Load generator processes")
+    parser.add_argument("--no-preload", action="store_true", help="Disable app preloading")
+    args = parser.parse_args()
+
+    cpus = available_cpus()
+    counts = [int(n) for n in args.workers.split(",")] if args.workers else list(range(1, cpus + 1))
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    print(f"CPUs: {cpus}  endpoint: {args.path}  preload: {not args.no_preload}")
+    print(f"{'workers':>7} {'req/s':>10} {'req/s/worker':>13} {'p99 ms':>8} {'errors':>7} {'PSS MB':>8}")
+
+    for workers in counts:
+        server = start_server(
+            [
+                sys.executable, "-c",
+                "from app.server import run_production; "
+                f"run_production(bind='127.0.0.1:{args.port}', workers={workers})"
+            ],
+            env={"SERVER_PRELOAD": "false" if args.no_preload else "true"},
+        )
+        try:
+            wait_until_ready(base_url + "/health/live")
+            result = run_load(base_url + args.path, args.duration, args.concurrency, args.clients)
+            pss = process_tree_pss_mb(server.pid)
+        finally:
+            stop_server(server)
+
+        print(
+            f"{workers:>7} {result['rps']:>10.0f} {result['rps'] / workers:>13.0f} "
+            f"{result['p99_ms']:>8.1f} {result['errors']:>7} "
+            f"{pss if pss is not None else float('nan'):>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
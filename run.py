@@ -28,22 +28,14 @@ def main():
 🌐 Server: http://0.0.0.0:8000
 📚 API docs: {'http://0.0.0.0:8000/docs' if settings.debug else 'disabled'}
 📡 Health check: http://0.0.0.0:8000/health
+⚙️  Runtime: {settings.server_loop} + {settings.server_http}
     """)
     
     # Configure uvicorn based on environment
     if settings.environment == "production":
-        # Production configuration
-        uvicorn.run(
-            "app.main:app",
-            host="0.0.0.0",
-            port=8000,
-            workers=1,  # Use 1 worker for simplicity; scale with gunicorn if needed
-            reload=False,
-            log_level="info",
-            access_log=False,
-            server_header=False,
-            date_header=False
-        )
+        # Production configuration: gunicorn master with CPU-sized uvicorn workers
+        from app.server import run_production
+        run_production(bind="0.0.0.0:8000")
     else:
         # Development configuration
         uvicorn.run(
@@ -51,6 +43,8 @@ def main():
             host="0.0.0.0",
             port=8000,
             reload=True,
+            loop=settings.server_loop,
+            http=settings.server_http,
             log_level=settings.log_level.lower(),
             access_log=True,
             reload_dirs=[str(project_root / "app")]
@@ -12,3 +12,20 @@ output "bucket_id" {
 output "bucket_arn" {
   value = aws_s3_bucket.these.arn
 }
+
+# Backstop for multipart uploads the API never completed or aborted
+resource "aws_s3_bucket_lifecycle_configuration" "these" {
+  count  = var.abort_incomplete_multipart_upload_days > 0 ? 1 : 0
+  bucket = aws_s3_bucket.these.id
+
+  rule {
+    id     = "abort-incomplete-multipart-uploads"
+    status = "Enabled"
+
+    filter {}
+
+    abort_incomplete_multipart_upload {
+      days_after_initiation = var.abort_incomplete_multipart_upload_days
+    }
+  }
+}
@@ -21,3 +21,9 @@ variable "enable_cloudwatch_logging" {
   default     = false
 }
 
+
+variable "abort_incomplete_multipart_upload_days" {
+  description = "Days after which incomplete multipart uploads are aborted by S3 (0 disables the lifecycle rule)"
+  type        = number
+  default     = 2
+}
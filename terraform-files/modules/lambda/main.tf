@@ -46,6 +46,35 @@ resource "aws_cloudwatch_log_group" "lambda_log_group" {
   retention_in_days = lookup(var.log_retention, terraform.workspace)
 }
 
+# Optional S3 trigger: invoke the function for objects created in a bucket
+# (e.g. image variant generation for CMS uploads)
+resource "aws_lambda_permission" "allow_s3_invoke" {
+  count         = var.s3_trigger_bucket_name != "" ? 1 : 0
+  statement_id  = "AllowExecutionFromS3"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.lambda_function.function_name
+  principal     = "s3.amazonaws.com"
+  source_arn    = "arn:aws:s3:::${var.s3_trigger_bucket_name}"
+}
+
+resource "aws_s3_bucket_notification" "s3_trigger" {
+  count  = var.s3_trigger_bucket_name != "" ? 1 : 0
+  bucket = var.s3_trigger_bucket_name
+
+  # S3 allows one suffix per filter, so one entry per suffix
+  dynamic "lambda_function" {
+    for_each = var.s3_trigger_filter_suffixes
+    content {
+      lambda_function_arn = aws_lambda_function.lambda_function.arn
+      events              = ["s3:ObjectCreated:*"]
+      filter_prefix       = var.s3_trigger_filter_prefix
+      filter_suffix       = lambda_function.value
+    }
+  }
+
+  depends_on = [aws_lambda_permission.allow_s3_invoke]
+}
+
 ### from here error logs start
 #Create CloudWatch Metric Filter for Errors with Lambda function name
 #Create CloudWatch Metric Filter for Errors with Lambda function name
@@ -166,3 +166,22 @@ variable "notification_emails" {
   }
 }
 
+
+
+variable "s3_trigger_bucket_name" {
+  description = "Bucket whose ObjectCreated events invoke the function (empty: no S3 trigger)"
+  type        = string
+  default     = ""
+}
+
+variable "s3_trigger_filter_prefix" {
+  description = "Only objects under this key prefix trigger the function"
+  type        = string
+  default     = ""
+}
+
+variable "s3_trigger_filter_suffixes" {
+  description = "Key suffixes that trigger the function, one notification filter each"
+  type        = list(string)
+  default     = [".jpg", ".jpeg", ".png"]
+}